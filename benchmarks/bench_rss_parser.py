@@ -0,0 +1,116 @@
+"""
+Benchmark - Streaming RSS Parser vs. Legacy Regex Parser
+
+Compares the incremental parser used by news_mcp (fed in network-sized chunks,
+stopping at `max_items`) with the previous regex implementation, which needed
+the whole body and scanned every item.
+
+Usage:
+    python benchmarks/bench_rss_parser.py                      # synthetic 5000-item feed
+    python benchmarks/bench_rss_parser.py --feed recorded.xml  # recorded feed(s)
+    python benchmarks/bench_rss_parser.py --items 20000 --max-items 10 --repeat 20
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp.news_mcp import RSSItemParser  # noqa: E402
+
+CHUNK_SIZE = 16 * 1024
+
+
+def legacy_parse_rss_items(xml_text: str, max_items: int = 5) -> list:
+    """Previous regex-based parser (kept here for comparison)."""
+    items = []
+    item_matches = re.findall(r'<item>(.*?)</item>', xml_text, re.DOTALL)
+    for item_xml in item_matches[:max_items]:
+        title_match = re.search(r'<title><!\[CDATA\[(.*?)\]\]></title>|<title>(.*?)</title>', item_xml)
+        link_match = re.search(r'<link>(.*?)</link>', item_xml)
+        pub_date_match = re.search(r'<pubDate>(.*?)</pubDate>', item_xml)
+        source_match = re.search(r'<source.*?>(.*?)</source>', item_xml)
+        title = ""
+        if title_match:
+            title = title_match.group(1) or title_match.group(2) or ""
+            title = title.replace('&amp;', '&').replace('&quot;', '"').replace('&#39;', "'")
+        if title:
+            items.append({
+                "title": title,
+                "source": source_match.group(1) if source_match else "Google News",
+                "published": pub_date_match.group(1)[:16] if pub_date_match else "N/A",
+                "url": link_match.group(1) if link_match else ""
+            })
+    return items
+
+
+def synthetic_feed(n_items: int) -> bytes:
+    """Build a Google News shaped feed with entity-heavy titles."""
+    items = []
+    for i in range(n_items):
+        items.append(
+            f"<item><title>Story {i}: Markets &amp; tech &#8212; what&#8217;s next? &lt;analysis&gt;</title>"
+            f"<link>https://news.google.com/rss/articles/{'x' * 120}{i}?oc=5</link>"
+            f"<guid isPermaLink=\"false\">{'g' * 60}{i}</guid>"
+            f"<pubDate>Mon, 0{i % 9 + 1} Jan 2024 12:00:00 GMT</pubDate>"
+            f"<description>&lt;a href=\"https://example.com/{i}\"&gt;Story {i}&lt;/a&gt;&amp;nbsp;"
+            f"&lt;font color=\"#6f6f6f\"&gt;Source {i % 50}&lt;/font&gt;</description>"
+            f"<source url=\"https://source{i % 50}.example.com\">Source {i % 50}</source></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+        '<title>Top stories - Google News</title><link>https://news.google.com</link>'
+        + "".join(items) + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def bench_legacy(body: bytes, max_items: int) -> tuple:
+    # The old path needed the whole body decoded before parsing
+    items = legacy_parse_rss_items(body.decode("utf-8"), max_items)
+    return items, len(body)
+
+
+def bench_streaming(body: bytes, max_items: int) -> tuple:
+    parser = RSSItemParser(max_items)
+    consumed = 0
+    for start in range(0, len(body), CHUNK_SIZE):
+        chunk = body[start:start + CHUNK_SIZE]
+        consumed += len(chunk)
+        if parser.feed(chunk):
+            break
+    return parser.items, consumed
+
+
+def run(name: str, body: bytes, max_items: int, repeat: int) -> None:
+    print(f"\n{name}: {len(body) / 1024:,.0f} KiB, max_items={max_items}")
+    for label, fn in (("regex (legacy)", bench_legacy), ("streaming", bench_streaming)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            items, consumed = fn(body, max_items)
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+        print(f"  {label:<15} {elapsed:8.3f} ms/parse  {consumed / 1024:8,.0f} KiB read  {len(items)} items")
+        if items:
+            print(f"  {'':<15} first title: {items[0]['title']!r}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feed", action="append", help="Recorded RSS file (repeatable)")
+    parser.add_argument("--items", type=int, default=5000, help="Items in the synthetic feed")
+    parser.add_argument("--max-items", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.feed:
+        for path in args.feed:
+            run(path, Path(path).read_bytes(), args.max_items, args.repeat)
+    else:
+        run("synthetic feed", synthetic_feed(args.items), args.max_items, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,10 +29,12 @@ def print_banner(skills: list):
 def print_skills(skills: list):
     print("\n📚 Skills:", ", ".join(skills))
     print("\n🔧 MCP Tools (All FREE):")
-    print("   🌤️ Weather: get_current_weather, get_weather_forecast, get_air_quality")
-    print("   📈 Stocks:  get_stock_quote, get_stock_history, get_company_info")
+    print("   🌤️ Weather: get_current_weather, get_weather_forecast, get_air_quality,")
+    print("               get_weather_report, get_weather_for_locations")
+    print("   📈 Stocks:  get_stock_quote, get_stock_quotes, get_stock_history, get_company_info")
     print("   📰 News:    get_top_headlines, search_news, get_news_sources")
-    print("   🗄️ Database: get_all_employees, get_employee_by_id, search_employees, get_department_stats\n")
+    print("   🗄️ Database: get_all_employees, get_employee_by_id, search_employees, get_department_stats,")
+    print("               query_employees\n")
 
 
 def print_examples():
@@ -109,8 +111,20 @@ def main():
                 continue
             
             print("🤔 ", end="", flush=True)
-            response = agent.process_request(user_input, thread_id=thread_id)
-            print(f"\r🤖 {response}\n")
+            streaming = False
+            for event in agent.stream_request(user_input, thread_id=thread_id):
+                if event["type"] == "token":
+                    if not streaming:
+                        print("\r🤖 ", end="")
+                        streaming = True
+                    print(event["content"], end="", flush=True)
+                elif event["type"] == "tool_start":
+                    print(("\n" if streaming else "\r") + f"🔧 {event['name']}...", flush=True)
+                    print("🤔 ", end="", flush=True)
+                    streaming = False
+                elif event["type"] == "error":
+                    print(f"\r❌ {event['content']}", end="")
+            print("\n")
             
         except KeyboardInterrupt:
             print("\n👋 Goodbye!")
@@ -118,6 +132,8 @@ def main():
         except Exception as e:
             print(f"\n❌ Error: {e}")
 
+    agent.close()
+
 
 if __name__ == "__main__":
     main()
@@ -5,16 +5,24 @@ Powered by Claude 3 Haiku (cheapest model) with FREE MCP integrations.
 """
 
 import os
+import time
 import logging
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 from dotenv import load_dotenv
 from pathlib import Path
 
 from langchain_anthropic import ChatAnthropic
+from langchain_core.messages import SystemMessage
 from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
-from .mcp import ALL_MCP_TOOLS
+from .checkpoint import ThreadIndexedMemorySaver, SqliteCheckpointSaver
+from .history import HistoryPolicy
+from .router import SkillRouter
+from .skill_registry import SkillRegistry
+from .prefetch import PrefetchScheduler
+from .mcp import ALL_MCP_TOOLS, close_http_client, aclose_http_client, close_database, close_history_store
+from .tool_node import build_tool_node, DEFAULT_MAX_WORKERS, DEFAULT_TOOL_TIMEOUT
 
 log_dir = Path(__file__).parent.parent / "logs"
 log_dir.mkdir(exist_ok=True)
@@ -37,8 +45,32 @@ class MultiSkillsAgent:
     All MCP tools are FREE (no external API keys needed).
     """
     
-    def __init__(self, skills_dir: Optional[str] = None):
-        """Initialize the agent."""
+    def __init__(
+        self,
+        skills_dir: Optional[str] = None,
+        max_tool_workers: Optional[int] = None,
+        tool_timeout: Optional[float] = None,
+        history_policy: Optional[HistoryPolicy] = None,
+        thread_idle_ttl: Optional[float] = None,
+        checkpointer: Optional[BaseCheckpointSaver] = None,
+        skill_routing: Optional[bool] = None,
+        skill_reload_interval: Optional[float] = None,
+        prefetch: Optional[bool] = None
+    ):
+        """
+        Initialize the agent.
+        
+        Args:
+            skills_dir: Directory containing skill folders (default: src/skills)
+            max_tool_workers: Max concurrent tool calls per turn (env: AGENT_MAX_TOOL_WORKERS)
+            tool_timeout: Per-tool-call timeout in seconds (env: AGENT_TOOL_TIMEOUT)
+            history_policy: Conversation windowing/trimming/summary policy (default: from env)
+            thread_idle_ttl: Seconds before an idle thread is evicted (env: AGENT_THREAD_IDLE_TTL, 0 = never)
+            checkpointer: Conversation store (default: SQLite file from AGENT_CHECKPOINT_DB, else in-memory)
+            skill_routing: Send only the relevant skills/tools per request (env: AGENT_SKILL_ROUTING, default on)
+            skill_reload_interval: Seconds between SKILL.md change checks (env: AGENT_SKILL_RELOAD_INTERVAL, 0 = off)
+            prefetch: Keep popular MCP queries warm in the background (env: AGENT_PREFETCH, default off)
+        """
         self.api_key = os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             logger.warning("ANTHROPIC_API_KEY not found")
@@ -52,50 +84,138 @@ class MultiSkillsAgent:
             api_key=self.api_key
         )
         
-        self.skills = self._discover_skills()
-        self.system_prompt = self._build_system_prompt()
-        self.memory = MemorySaver()
+        self.skill_registry = SkillRegistry(
+            self.skills_dir,
+            reload_interval=(
+                skill_reload_interval if skill_reload_interval is not None
+                else float(os.getenv("AGENT_SKILL_RELOAD_INTERVAL", "2"))
+            )
+        )
+        self._skills_version = None
+        self.skill_routing = (
+            skill_routing if skill_routing is not None
+            else os.getenv("AGENT_SKILL_ROUTING", "true").lower() in ("1", "true", "yes")
+        )
+        self._tools_by_name = {t.name: t for t in ALL_MCP_TOOLS}
+        self._refresh_skills()
+        self.memory = checkpointer or self._create_checkpointer()
+        self.history_policy = history_policy or HistoryPolicy(llm=self.llm)
+        # Persistent stores are shared with other workers, so idle eviction is opt-in there
+        default_idle_ttl = "3600" if isinstance(self.memory, ThreadIndexedMemorySaver) else "0"
+        self.thread_idle_ttl = (
+            thread_idle_ttl if thread_idle_ttl is not None
+            else float(os.getenv("AGENT_THREAD_IDLE_TTL", default_idle_ttl))
+        )
+        self._thread_last_seen = {}
+        self._last_eviction = time.monotonic()
         
-        self.agent_executor = create_react_agent(
-            self.llm,
-            tools=ALL_MCP_TOOLS,
-            checkpointer=self.memory,
-            prompt=self.system_prompt
+        prefetch = (
+            prefetch if prefetch is not None
+            else os.getenv("AGENT_PREFETCH", "false").lower() in ("1", "true", "yes")
         )
+        self.prefetcher = PrefetchScheduler.from_env(ALL_MCP_TOOLS) if prefetch else None
         
-        logger.info(f"Agent initialized: {len(self.skills)} skills, {len(ALL_MCP_TOOLS)} tools")
-    
-    def _discover_skills(self) -> dict:
-        """Discover all skills in the skills directory."""
-        skills = {}
-        if not self.skills_dir.exists():
-            return skills
+        self.tool_node, self._tool_runner = build_tool_node(
+            ALL_MCP_TOOLS,
+            max_workers=max_tool_workers or int(os.getenv("AGENT_MAX_TOOL_WORKERS", DEFAULT_MAX_WORKERS)),
+            timeout=tool_timeout or float(os.getenv("AGENT_TOOL_TIMEOUT", DEFAULT_TOOL_TIMEOUT)),
+            on_call=self.prefetcher.record if self.prefetcher else None
+        )
+        self.agent_executor = self._build_executor()
+        if self.prefetcher:
+            self.prefetcher.start()
         
-        for skill_path in self.skills_dir.iterdir():
-            if skill_path.is_dir() and not skill_path.name.startswith('_'):
-                skill_file = skill_path / "SKILL.md"
-                if skill_file.exists():
-                    try:
-                        content = skill_file.read_text(encoding='utf-8')
-                        skill_name = skill_path.name.replace('_', ' ').title()
-                        skills[skill_name] = content
-                    except Exception as e:
-                        logger.error(f"Failed to load skill {skill_path.name}: {e}")
-        return skills
-    
-    def _build_system_prompt(self) -> str:
-        """Build the system prompt from all skills."""
-        skill_names = list(self.skills.keys())
+        logger.info(f"Agent initialized: {len(self.skill_registry)} skills, {len(ALL_MCP_TOOLS)} tools")
+    
+    @staticmethod
+    def _create_checkpointer() -> BaseCheckpointSaver:
+        """Create the default checkpointer (SQLite when AGENT_CHECKPOINT_DB is set)."""
+        db_path = os.getenv("AGENT_CHECKPOINT_DB")
+        if db_path:
+            return SqliteCheckpointSaver(db_path)
+        return ThreadIndexedMemorySaver()
+    
+    def _build_executor(self):
+        """Compile the ReAct agent graph."""
+        return create_react_agent(
+            self._routed_model if self.skill_routing else self.llm,
+            tools=self.tool_node,
+            checkpointer=self.memory,
+            prompt=self._routed_prompt,
+            pre_model_hook=self.history_policy
+        )
+    
+    @property
+    def system_prompt(self) -> str:
+        """Full system prompt covering every skill."""
+        return self._build_system_prompt()
+    
+    def _refresh_skills(self) -> None:
+        """Pick up added/changed/removed SKILL.md files and drop state derived from them."""
+        self.skill_registry.refresh()
+        if self.skill_registry.version == self._skills_version:
+            return
+        self._skills_version = self.skill_registry.version
+        self.router = SkillRouter(self.skill_registry.all_meta())
+        self._routed_prompts = {}
+        self._routed_models = {}
+        logger.info(f"Skills loaded (version {self._skills_version}): {', '.join(self.skill_registry.names())}")
+    
+    def _routed_prompt(self, state: dict) -> list:
+        """Prompt callable: system prompt with only the routed skills' guidelines (all skills if routing is off)."""
+        self._refresh_skills()
+        if self.skill_routing:
+            skills = self.router.route_messages(state["messages"])
+        else:
+            skills = tuple(self.router.skill_names)
+        if skills not in self._routed_prompts:
+            self._routed_prompts[skills] = SystemMessage(content=self._build_system_prompt(skills))
+        return [self._routed_prompts[skills]] + list(state["messages"])
+    
+    def _routed_model(self, state: dict, runtime):
+        """Model callable: the LLM bound to only the routed skills' tools."""
+        self._refresh_skills()
+        skills = self.router.route_messages(state["messages"])
+        if skills not in self._routed_models:
+            tools = [self._tools_by_name[n] for n in self.router.tools_for(skills) if n in self._tools_by_name]
+            self._routed_models[skills] = self.llm.bind_tools(tools or ALL_MCP_TOOLS)
+            logger.info(f"Routed {', '.join(skills)}: {len(tools or ALL_MCP_TOOLS)} tools bound")
+        return self._routed_models[skills]
+    
+    def _thread_config(self, thread_id: Optional[str]) -> dict:
+        """Build the graph config for a thread and record activity for idle eviction."""
+        thread_id = thread_id or "default"
+        if self.thread_idle_ttl:
+            self._thread_last_seen[thread_id] = time.monotonic()
+            self._evict_idle_threads()
+        return {"configurable": {"thread_id": thread_id}}
+    
+    def _evict_idle_threads(self) -> None:
+        """Delete threads idle longer than thread_idle_ttl (checked at most once a minute)."""
+        now = time.monotonic()
+        if now - self._last_eviction < 60:
+            return
+        self._last_eviction = now
+        for thread_id, last_seen in list(self._thread_last_seen.items()):
+            if now - last_seen > self.thread_idle_ttl:
+                self._thread_last_seen.pop(thread_id, None)
+                self.memory.delete_thread(thread_id)
+                logger.info(f"Evicted idle thread {thread_id}")
+    
+    def _build_system_prompt(self, skill_names: Optional[tuple] = None) -> str:
+        """Build the system prompt from the given skills (default: all skills)."""
+        skill_names = list(skill_names or self.skill_registry.names())
+        tool_lines = "\n".join(
+            f"- {name}: {', '.join(self.router.skill_tools[name])}"
+            for name in skill_names if self.router.skill_tools.get(name)
+        )
         
         prompt = f"""You are a Multi-Skills AI Agent with {len(skill_names)} skills and MCP tools for real-time data.
 
 Skills: {', '.join(skill_names)}
 
 MCP Tools Available:
-- Weather: get_current_weather, get_weather_forecast, get_air_quality
-- Stocks: get_stock_quote, get_stock_history, get_company_info
-- News: get_top_headlines, search_news, get_news_sources
-- Database: get_all_employees, get_employee_by_id, search_employees, get_department_stats
+{tool_lines}
 
 Instructions:
 1. Identify relevant skill for the query
@@ -104,19 +224,20 @@ Instructions:
 4. Follow skill guidelines and guardrails
 
 """
-        for name, content in self.skills.items():
+        for name in skill_names:
+            content = self.skill_registry.body(name)
             prompt += f"\n{'='*40}\nSKILL: {name.upper()}\n{'='*40}\n{content}\n"
         
         return prompt
     
     def get_available_skills(self) -> list:
         """Get list of available skills."""
-        return list(self.skills.keys())
+        self._refresh_skills()
+        return self.skill_registry.names()
     
     def process_request(self, user_message: str, thread_id: Optional[str] = None) -> str:
         """Process a user request."""
-        thread_id = thread_id or "default"
-        config = {"configurable": {"thread_id": thread_id}}
+        config = self._thread_config(thread_id)
         
         try:
             result = self.agent_executor.invoke(
@@ -129,12 +250,121 @@ Instructions:
             logger.error(f"Error: {e}")
             return f"Error: {str(e)}"
     
+    async def aprocess_request(self, user_message: str, thread_id: Optional[str] = None) -> str:
+        """Process a user request asynchronously (tools run as coroutines)."""
+        config = self._thread_config(thread_id)
+        
+        try:
+            result = await self.agent_executor.ainvoke(
+                {"messages": [("user", user_message)]},
+                config=config
+            )
+            messages = result.get("messages", [])
+            return messages[-1].content if messages else "No response"
+        except Exception as e:
+            logger.error(f"Error: {e}")
+            return f"Error: {str(e)}"
+    
+    def stream_request(self, user_message: str, thread_id: Optional[str] = None) -> Iterator[dict]:
+        """
+        Process a user request, yielding events as they happen.
+        
+        Yields dicts with a "type" key:
+            {"type": "token", "content": str}                 - LLM text chunk
+            {"type": "tool_start", "name": str, "args": dict} - tool call requested
+            {"type": "tool_end", "name": str, "content": str} - tool result
+            {"type": "error", "content": str}                 - request failed
+        """
+        config = self._thread_config(thread_id)
+        
+        try:
+            for mode, payload in self.agent_executor.stream(
+                {"messages": [("user", user_message)]},
+                config=config,
+                stream_mode=["messages", "updates"]
+            ):
+                yield from self._stream_events(mode, payload)
+        except Exception as e:
+            logger.error(f"Error: {e}")
+            yield {"type": "error", "content": f"Error: {str(e)}"}
+    
+    async def astream_request(self, user_message: str, thread_id: Optional[str] = None) -> AsyncIterator[dict]:
+        """Async variant of stream_request (same event format)."""
+        config = self._thread_config(thread_id)
+        
+        try:
+            async for mode, payload in self.agent_executor.astream(
+                {"messages": [("user", user_message)]},
+                config=config,
+                stream_mode=["messages", "updates"]
+            ):
+                for event in self._stream_events(mode, payload):
+                    yield event
+        except Exception as e:
+            logger.error(f"Error: {e}")
+            yield {"type": "error", "content": f"Error: {str(e)}"}
+    
+    @staticmethod
+    def _stream_events(mode: str, payload) -> Iterator[dict]:
+        """Translate one LangGraph stream item into agent events."""
+        if mode == "messages":
+            chunk, metadata = payload
+            if metadata.get("langgraph_node") != "agent":
+                return
+            content = chunk.content
+            if isinstance(content, list):
+                content = "".join(
+                    block.get("text", "") for block in content
+                    if isinstance(block, dict) and block.get("type") == "text"
+                )
+            if content:
+                yield {"type": "token", "content": content}
+        elif mode == "updates":
+            for node, update in payload.items():
+                for message in (update or {}).get("messages", []):
+                    if node == "agent":
+                        for call in getattr(message, "tool_calls", None) or []:
+                            yield {"type": "tool_start", "name": call["name"], "args": call["args"]}
+                    elif node == "tools":
+                        yield {"type": "tool_end", "name": message.name, "content": message.content}
+    
     def reset_conversation(self, thread_id: str = "default") -> None:
-        """Reset conversation memory."""
-        self.memory = MemorySaver()
-        self.agent_executor = create_react_agent(
-            self.llm,
-            tools=ALL_MCP_TOOLS,
-            checkpointer=self.memory,
-            prompt=self.system_prompt
-        )
+        """Reset conversation memory for one thread (other threads are untouched)."""
+        self._thread_last_seen.pop(thread_id, None)
+        self.memory.delete_thread(thread_id)
+    
+    def close(self) -> None:
+        """Release shared resources (prefetcher, tool worker pool, pooled HTTP connections, stock history store, database connections, checkpointer)."""
+        if self.prefetcher:
+            self.prefetcher.stop()
+        self._tool_runner.shutdown()
+        close_http_client()
+        close_history_store()
+        close_database()
+        if hasattr(self.memory, "close"):
+            self.memory.close()
+        logger.info("Agent closed")
+    
+    async def aclose(self) -> None:
+        """Release shared resources, including the async HTTP client."""
+        if self.prefetcher:
+            self.prefetcher.stop()
+        self._tool_runner.shutdown()
+        await aclose_http_client()
+        close_history_store()
+        close_database()
+        if hasattr(self.memory, "close"):
+            self.memory.close()
+        logger.info("Agent closed")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
@@ -0,0 +1,333 @@
+"""
+Checkpoint - Conversation Checkpointers for MultiSkillsAgent
+
+Checkpointers:
+- ThreadIndexedMemorySaver: In-process (default). LangGraph's MemorySaver stores
+  every thread's checkpoints, pending writes and channel blobs in flat dictionaries,
+  so deleting one thread scans the keys of all threads. This variant keeps a
+  per-thread key index so deleting a thread only touches that thread's entries.
+- SqliteCheckpointSaver: Local SQLite file in WAL mode. Conversations survive
+  restarts and can be shared by several worker processes on one host.
+"""
+
+import json
+import random
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    CheckpointTuple,
+    WRITES_IDX_MAP,
+    get_checkpoint_id,
+    get_checkpoint_metadata
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+logger = logging.getLogger(__name__)
+
+
+class _ThreadIndexedDict(defaultdict):
+    """defaultdict that indexes its keys by thread_id (the key itself or its first element)."""
+
+    def __init__(self, default_factory=None):
+        super().__init__(default_factory)
+        self.thread_keys = defaultdict(set)
+
+    @staticmethod
+    def _thread_of(key):
+        return key[0] if isinstance(key, tuple) else key
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.thread_keys[self._thread_of(key)].add(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        thread_id = self._thread_of(key)
+        keys = self.thread_keys.get(thread_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.thread_keys[thread_id]
+
+    def pop_thread(self, thread_id: str) -> int:
+        """Remove every key belonging to `thread_id`; returns the number removed."""
+        keys = self.thread_keys.pop(thread_id, ())
+        for key in keys:
+            dict.pop(self, key, None)
+        return len(keys)
+
+    # MemorySaver enters custom factories as context managers
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class ThreadIndexedMemorySaver(MemorySaver):
+    """In-memory checkpointer with O(size of thread) per-thread deletion."""
+
+    def __init__(self, *, serde=None):
+        super().__init__(serde=serde, factory=_ThreadIndexedDict)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints, writes and blobs for one thread."""
+        removed = (
+            self.storage.pop_thread(thread_id)
+            + self.writes.pop_thread(thread_id)
+            + self.blobs.pop_thread(thread_id)
+        )
+        logger.info(f"Deleted thread {thread_id} ({removed} entries)")
+
+    def thread_ids(self) -> list:
+        """List the thread IDs that currently have checkpoints."""
+        # Reads of a missing thread go through defaultdict and leave an empty entry behind
+        return [
+            thread_id for thread_id, namespaces in list(self.storage.items())
+            if any(namespaces.values())
+        ]
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver):
+    """
+    SQLite checkpointer for sharing conversation state across restarts and processes.
+
+    - WAL journal + synchronous=NORMAL: readers never block the writer and commits
+      do not fsync on every write
+    - Primary keys lead with thread_id, so every lookup and per-thread delete is an
+      index range scan
+    - Intermediate writes (put_writes) are committed as soon as they arrive, in one
+      short transaction per task, so other processes see them and a crash
+      mid-superstep can resume from them
+    """
+
+    def __init__(self, path: str, *, serde=None, busy_timeout_ms: int = 5000):
+        super().__init__(serde=serde)
+        self.path = str(Path(path).expanduser())
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                parent_checkpoint_id TEXT,
+                type TEXT,
+                checkpoint BLOB,
+                metadata TEXT,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+            );
+            CREATE TABLE IF NOT EXISTS writes (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                task_path TEXT NOT NULL DEFAULT '',
+                idx INTEGER NOT NULL,
+                channel TEXT NOT NULL,
+                type TEXT,
+                value BLOB,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+            );
+        """)
+        logger.info(f"SQLite checkpointer opened: {self.path}")
+
+    _WRITES_COLUMNS = "(thread_id, checkpoint_ns, checkpoint_id, task_id, task_path, idx, channel, type, value)"
+
+    def _write(self, *statements: tuple, many: tuple = None) -> None:
+        """Run (sql, params) statements, and an optional (sql, rows) executemany, in a single transaction."""
+        with self.lock:
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                for statement, params in statements:
+                    cursor.execute(statement, params)
+                if many is not None:
+                    cursor.executemany(*many)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            finally:
+                cursor.close()
+
+    def _load_tuple(self, row, cursor) -> CheckpointTuple:
+        """Build a CheckpointTuple from a checkpoints row and its pending writes."""
+        thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata = row
+        cursor.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        )
+        pending_writes = [
+            (task_id, channel, self.serde.loads_typed((w_type, value)))
+            for task_id, channel, w_type, value in cursor.fetchall()
+        ]
+        return CheckpointTuple(
+            {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+            self.serde.loads_typed((type_, checkpoint)),
+            json.loads(metadata) if metadata else {},
+            (
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_checkpoint_id}}
+                if parent_checkpoint_id else None
+            ),
+            pending_writes
+        )
+
+    def get_tuple(self, config):
+        """Get a specific checkpoint, or the latest one for the thread."""
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = "thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata"
+        with self.lock:
+            cursor = self.conn.cursor()
+            try:
+                if checkpoint_id := get_checkpoint_id(config):
+                    cursor.execute(
+                        f"SELECT {columns} FROM checkpoints "
+                        "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                        (thread_id, checkpoint_ns, checkpoint_id)
+                    )
+                else:
+                    cursor.execute(
+                        f"SELECT {columns} FROM checkpoints "
+                        "WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1",
+                        (thread_id, checkpoint_ns)
+                    )
+                row = cursor.fetchone()
+                return self._load_tuple(row, cursor) if row else None
+            finally:
+                cursor.close()
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        """List checkpoints (newest first), optionally filtered by thread, metadata and ID."""
+        clauses, params = [], []
+        if config is not None:
+            clauses.append("thread_id = ?")
+            params.append(str(config["configurable"]["thread_id"]))
+            if "checkpoint_ns" in config["configurable"]:
+                clauses.append("checkpoint_ns = ?")
+                params.append(config["configurable"]["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before is not None:
+            clauses.append("checkpoint_id < ?")
+            params.append(get_checkpoint_id(before))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.lock:
+            cursor = self.conn.cursor()
+            try:
+                rows = cursor.execute(
+                    "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata "
+                    f"FROM checkpoints {where} ORDER BY checkpoint_id DESC",
+                    params
+                ).fetchall()
+                results = []
+                for row in rows:
+                    item = self._load_tuple(row, cursor)
+                    if filter and any(item.metadata.get(k) != v for k, v in filter.items()):
+                        continue
+                    results.append(item)
+                    if limit is not None and len(results) >= limit:
+                        break
+            finally:
+                cursor.close()
+        yield from results
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        """Store a checkpoint."""
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, serialized = self.serde.dumps_typed(checkpoint)
+        serialized_metadata = json.dumps(get_checkpoint_metadata(config, metadata), ensure_ascii=False, default=str)
+        self._write((
+            "INSERT OR REPLACE INTO checkpoints "
+            "(thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (thread_id, checkpoint_ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+             type_, serialized, serialized_metadata)
+        ))
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        """Store intermediate writes for a checkpoint in one transaction."""
+        rows = [
+            (
+                str(config["configurable"]["thread_id"]),
+                str(config["configurable"].get("checkpoint_ns", "")),
+                str(config["configurable"]["checkpoint_id"]),
+                task_id,
+                task_path,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self.serde.dumps_typed(value)
+            )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        # Special channels (errors, interrupts) replace earlier writes; regular ones are written once
+        conflict = "REPLACE" if all(channel in WRITES_IDX_MAP for channel, _ in writes) else "IGNORE"
+        self._write(many=(
+            f"INSERT OR {conflict} INTO writes {self._WRITES_COLUMNS} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        ))
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints and writes for one thread."""
+        self._write(
+            ("DELETE FROM checkpoints WHERE thread_id = ?", (str(thread_id),)),
+            ("DELETE FROM writes WHERE thread_id = ?", (str(thread_id),))
+        )
+        logger.info(f"Deleted thread {thread_id}")
+
+    def thread_ids(self) -> list:
+        """List the thread IDs that currently have checkpoints."""
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT DISTINCT thread_id FROM checkpoints")]
+
+    def get_next_version(self, current, channel=None) -> str:
+        """Monotonic string versions (same scheme as LangGraph's SQLite saver)."""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # Async API: SQLite calls are short, so run them in a worker thread
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def close(self) -> None:
+        """Close the database."""
+        with self.lock:
+            self.conn.close()
+        logger.info(f"SQLite checkpointer closed: {self.path}")
@@ -0,0 +1,119 @@
+"""
+History - Bounded Conversation Memory for MultiSkillsAgent
+
+HistoryPolicy runs as the ReAct graph's pre-model hook and rewrites the stored
+thread before every LLM call so history (and token cost) stays bounded:
+
+- Keep only the last `max_turns` turns (a turn starts at each user message)
+- Trim tool outputs from completed turns once the model has already used them
+- Optionally fold dropped turns into a running summary message
+
+Configuration (environment variables, all optional):
+- AGENT_HISTORY_MAX_TURNS: Turns kept verbatim (default: 10, 0 = unlimited)
+- AGENT_TOOL_OUTPUT_MAX_CHARS: Max chars kept per used tool output (default: 1000, 0 = no trim)
+- AGENT_HISTORY_SUMMARIZE: Summarize dropped turns with the LLM (default: "false")
+"""
+
+import os
+import logging
+from typing import Optional
+
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage, RemoveMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+logger = logging.getLogger(__name__)
+
+# Fixed ID of the running summary message kept at the start of a thread
+SUMMARY_MESSAGE_ID = "conversation-summary"
+SUMMARY_PREFIX = "[Summary of earlier conversation]\n"
+
+
+class HistoryPolicy:
+    """Windowing, tool-output trimming and optional summarization of thread history."""
+
+    def __init__(
+        self,
+        max_turns: Optional[int] = None,
+        tool_output_max_chars: Optional[int] = None,
+        summarize: Optional[bool] = None,
+        llm=None
+    ):
+        self.max_turns = max_turns if max_turns is not None else int(os.getenv("AGENT_HISTORY_MAX_TURNS", "10"))
+        self.tool_output_max_chars = (
+            tool_output_max_chars if tool_output_max_chars is not None
+            else int(os.getenv("AGENT_TOOL_OUTPUT_MAX_CHARS", "1000"))
+        )
+        if summarize is None:
+            summarize = os.getenv("AGENT_HISTORY_SUMMARIZE", "false").lower() in ("1", "true", "yes")
+        self.summarize = summarize
+        self.llm = llm
+
+    def __call__(self, state: dict) -> dict:
+        """Pre-model hook: return a state update replacing the thread's messages when it changes."""
+        messages = list(state["messages"])
+        summary, turns = self._split_turns(messages)
+        changed = False
+
+        if self.max_turns and len(turns) > self.max_turns:
+            dropped, turns = turns[:-self.max_turns], turns[-self.max_turns:]
+            if self.summarize and self.llm is not None:
+                summary = self._summarize(summary, dropped)
+            changed = True
+
+        if self.tool_output_max_chars:
+            # Every turn but the last is complete, so its tool outputs have been used
+            for turn in turns[:-1]:
+                for i, message in enumerate(turn):
+                    if isinstance(message, ToolMessage) and self._needs_trim(message):
+                        turn[i] = self._trim(message)
+                        changed = True
+
+        if not changed:
+            return {"llm_input_messages": messages}
+
+        kept = ([summary] if summary is not None else []) + [m for turn in turns for m in turn]
+        logger.info(f"History compacted: {len(messages)} -> {len(kept)} messages")
+        return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *kept]}
+
+    @staticmethod
+    def _split_turns(messages: list) -> tuple:
+        """Split messages into (summary message or None, list of turns)."""
+        summary = None
+        turns = []
+        for message in messages:
+            if message.id == SUMMARY_MESSAGE_ID:
+                summary = message
+            elif isinstance(message, HumanMessage) or not turns:
+                turns.append([message])
+            else:
+                turns[-1].append(message)
+        return summary, turns
+
+    def _needs_trim(self, message: ToolMessage) -> bool:
+        return isinstance(message.content, str) and len(message.content) > self.tool_output_max_chars
+
+    def _trim(self, message: ToolMessage) -> ToolMessage:
+        """Shorten a used tool output, keeping its head."""
+        content = message.content[:self.tool_output_max_chars] + "\n...[trimmed]"
+        return message.model_copy(update={"content": content})
+
+    def _summarize(self, summary, dropped: list) -> HumanMessage:
+        """Fold dropped turns into the running summary using the LLM."""
+        transcript = []
+        if summary is not None:
+            transcript.append(summary.content[len(SUMMARY_PREFIX):])
+        for turn in dropped:
+            for message in turn:
+                if message.type in ("human", "ai") and isinstance(message.content, str) and message.content:
+                    transcript.append(f"{message.type}: {message.content}")
+        try:
+            result = self.llm.invoke([
+                SystemMessage(content="Summarize this conversation in a few sentences. "
+                                      "Keep names, tickers, locations and numbers the user may refer to."),
+                HumanMessage(content="\n".join(transcript))
+            ])
+            text = result.content if isinstance(result.content, str) else str(result.content)
+        except Exception as e:
+            logger.error(f"History summarization failed: {e}")
+            text = "\n".join(transcript)[-2000:]
+        return HumanMessage(content=SUMMARY_PREFIX + text, id=SUMMARY_MESSAGE_ID)
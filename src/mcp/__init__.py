@@ -7,20 +7,38 @@ Available MCPs:
 - weather_mcp: Open-Meteo API (free)
 - stock_mcp: Yahoo Finance (free)
 - news_mcp: Google News RSS (free)
-- database_mcp: In-memory SQLite employee database (local)
+- database_mcp: SQLite employee database (local, in-memory or file-backed)
+
+Shared infrastructure:
+- http_client: Pooled keep-alive HTTP client used by all HTTP-based MCPs
+- cache: Bounded TTL/LRU cache with optional SQLite persistence and request coalescing
 """
 
+from .http_client import (
+    get_http_client,
+    get_async_http_client,
+    close_http_client,
+    aclose_http_client
+)
+
 from .weather_mcp import (
     get_current_weather,
     get_weather_forecast,
     get_air_quality,
+    get_weather_report,
+    get_weather_for_locations,
+    get_geocoding_cache_stats,
+    get_weather_cache_stats,
     WEATHER_TOOLS
 )
 
 from .stock_mcp import (
     get_stock_quote,
+    get_stock_quotes,
     get_stock_history,
     get_company_info,
+    get_stock_cache_stats,
+    close_history_store,
     STOCK_TOOLS
 )
 
@@ -28,6 +46,7 @@ from .news_mcp import (
     get_top_headlines,
     search_news,
     get_news_sources,
+    get_news_cache_stats,
     NEWS_TOOLS
 )
 
@@ -36,28 +55,48 @@ from .database_mcp import (
     get_employee_by_id,
     search_employees,
     get_department_stats,
+    query_employees,
+    get_query_cache_stats,
+    import_employees,
+    close_database,
     DATABASE_TOOLS
 )
 
 ALL_MCP_TOOLS = WEATHER_TOOLS + STOCK_TOOLS + NEWS_TOOLS + DATABASE_TOOLS
 
 __all__ = [
+    'get_http_client',
+    'get_async_http_client',
+    'close_http_client',
+    'aclose_http_client',
     'get_current_weather',
     'get_weather_forecast',
     'get_air_quality',
+    'get_weather_report',
+    'get_weather_for_locations',
+    'get_geocoding_cache_stats',
+    'get_weather_cache_stats',
     'WEATHER_TOOLS',
     'get_stock_quote',
+    'get_stock_quotes',
     'get_stock_history',
     'get_company_info',
+    'get_stock_cache_stats',
+    'close_history_store',
     'STOCK_TOOLS',
     'get_top_headlines',
     'search_news',
     'get_news_sources',
+    'get_news_cache_stats',
     'NEWS_TOOLS',
     'get_all_employees',
     'get_employee_by_id',
     'search_employees',
     'get_department_stats',
+    'query_employees',
+    'get_query_cache_stats',
+    'import_employees',
+    'close_database',
     'DATABASE_TOOLS',
     'ALL_MCP_TOOLS'
 ]
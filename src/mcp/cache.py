@@ -0,0 +1,260 @@
+"""
+Cache - Bounded In-Process TTL/LRU Cache for MCP Modules
+
+This module provides a small thread-safe cache used by the MCPs to avoid
+repeating upstream calls whose results rarely change (e.g. geocoding).
+
+Features:
+- LRU eviction once `maxsize` entries are stored
+- Per-entry time-to-live (TTL)
+- Optional SQLite persistence file so the cache stays warm across restarts
+- Hit/miss/eviction counters via `stats()`
+- `force_refresh()`: make refreshable caches miss so a background refresh refetches
+- RequestCoalescer: concurrent identical lookups share one upstream fetch
+"""
+
+import json
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sentinel for cache misses (None is a valid cached value)
+MISSING = object()
+
+# Set inside force_refresh(): refreshable caches report misses so callers refetch
+_refreshing = contextvars.ContextVar("cache_refreshing", default=False)
+
+
+@contextmanager
+def force_refresh():
+    """Within this block, caches created with `refreshable=True` miss, so the wrapped call refetches and re-stores."""
+    token = _refreshing.set(True)
+    try:
+        yield
+    finally:
+        _refreshing.reset(token)
+
+
+def is_refreshing() -> bool:
+    """Check whether the current call runs inside force_refresh()."""
+    return _refreshing.get()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and optional SQLite persistence.
+
+    Values must be JSON-serializable when `persist_path` is set.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 1024,
+        ttl: float = 3600.0,
+        persist_path: Optional[str] = None,
+        refreshable: bool = False
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.refreshable = refreshable
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._db = None
+        if persist_path:
+            self._open_persistence(persist_path)
+
+    def _open_persistence(self, persist_path: str) -> None:
+        """Open the SQLite persistence file and load unexpired entries."""
+        try:
+            path = Path(persist_path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    cache_name TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (cache_name, key)
+                )
+            """)
+            now = time.time()
+            self._db.execute(
+                "DELETE FROM cache_entries WHERE cache_name = ? AND expires_at <= ?",
+                (self.name, now)
+            )
+            self._db.commit()
+            rows = self._db.execute(
+                "SELECT key, value, expires_at FROM cache_entries "
+                "WHERE cache_name = ? ORDER BY expires_at DESC LIMIT ?",
+                (self.name, self.maxsize)
+            ).fetchall()
+            # Insert oldest first so the freshest entries end up most-recently-used
+            for key, value, expires_at in reversed(rows):
+                self._data[key] = (expires_at, json.loads(value))
+            logger.info(f"Cache '{self.name}' loaded {len(rows)} entries from {path}")
+        except Exception as e:
+            logger.error(f"Cache '{self.name}' persistence disabled: {e}")
+            self._db = None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached value, or `default` if missing or expired (or being force-refreshed)."""
+        if self.refreshable and _refreshing.get():
+            return default
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.time():
+                    self._data.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._data[key]
+            self._misses += 1
+            return default
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Get an unexpired value without counting a hit/miss or refreshing its LRU position."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.time():
+                return entry[1]
+            return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least-recently-used entry when full."""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted_key, _ = self._data.popitem(last=False)
+                self._evictions += 1
+                self._delete_persisted(evicted_key)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO cache_entries (cache_name, key, value, expires_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (self.name, key, json.dumps(value), expires_at)
+                    )
+                    self._db.commit()
+                except Exception as e:
+                    logger.error(f"Cache '{self.name}' persist error: {e}")
+
+    def _delete_persisted(self, key: str) -> None:
+        """Remove an evicted key from the persistence file (lock must be held)."""
+        if self._db is not None:
+            self._db.execute(
+                "DELETE FROM cache_entries WHERE cache_name = ? AND key = ?",
+                (self.name, key)
+            )
+
+    def clear(self) -> None:
+        """Remove all entries (including persisted ones)."""
+        with self._lock:
+            self._data.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache_entries WHERE cache_name = ?", (self.name,))
+                self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and current size."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "persistent": self._db is not None
+            }
+
+    def close(self) -> None:
+        """Close the persistence file, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class RequestCoalescer:
+    """
+    Collapses concurrent calls for the same key into a single in-flight call.
+
+    The first caller for a key runs the loader; callers arriving while it is in
+    flight wait for and share its result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> concurrent.futures.Future
+        self._ainflight = {}  # (event loop id, key) -> asyncio.Future
+        self.coalesced = 0
+
+    def run(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Run `loader()` unless an identical call is already in flight, then share its result."""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            result = loader()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def arun(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of `run` (coalesces callers on the same event loop)."""
+        loop = asyncio.get_running_loop()
+        inflight_key = (id(loop), key)
+        future = self._ainflight.get(inflight_key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        future = self._ainflight[inflight_key] = loop.create_future()
+        try:
+            result = await loader()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            self._ainflight.pop(inflight_key, None)
@@ -1,39 +1,210 @@
 """
-Database MCP - In-Memory Employee Database (No External Dependencies)
+Database MCP - SQLite Employee Database (No External Dependencies)
 
-This module provides MCP tools for querying an in-memory SQLite employee database.
-No external database or API key required.
+This module provides MCP tools for querying a SQLite employee database.
+No external database or API key required. By default it is an in-memory
+database with 15 sample employees; point EMPLOYEE_DB_PATH at a file and
+EMPLOYEE_DB_IMPORT at an HR extract to serve a real workforce.
 
 Tools:
 - get_all_employees: List all employees
 - get_employee_by_id: Get employee by ID
 - search_employees: Search employees by name or department
 - get_department_stats: Get department statistics
+- query_employees: Ad-hoc read-only filter/aggregate query from a structured spec
+
+Async variants run the SQLite query in a worker thread so `tool.ainvoke(...)`
+never blocks the event loop.
+
+Indexing:
+- department, city and (last_name, first_name) have case-insensitive indexes,
+  so exact and prefix lookups are index searches instead of table scans;
+  department/city searches with no prefix match fall back to a substring scan
+- Names and job titles are in an FTS5 full-text index (kept in sync by triggers)
+  used for name/title search; without FTS5 support, name search falls back to
+  indexed prefix matching
+
+Connections: one writer (schema, imports) and one read-only connection per
+thread, so concurrent tool calls query in parallel over a WAL-mode file.
+
+Configuration (environment variables, all optional):
+- EMPLOYEE_DB_PATH: SQLite file (default: ":memory:")
+- EMPLOYEE_DB_IMPORT: CSV (or Parquet, with pyarrow installed) loaded when the database is empty
+- EMPLOYEE_DB_BATCH_SIZE: Rows per import transaction (default: 5000)
+- EMPLOYEE_QUERY_TIME_BUDGET: Seconds a query_employees statement may run (default: 2)
 """
 
+import io
+import os
+import re
+import time
+import csv
 import json
+import base64
+import asyncio
+import hashlib
 import logging
 import sqlite3
+import tempfile
+import functools
+import threading
+import weakref
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
 from langchain_core.tools import tool
 
 logger = logging.getLogger(__name__)
 
-# In-memory SQLite database connection
-_db_connection = None
+EMPLOYEE_DB_PATH = os.getenv("EMPLOYEE_DB_PATH", ":memory:")
+EMPLOYEE_DB_IMPORT = os.getenv("EMPLOYEE_DB_IMPORT") or None
+IMPORT_BATCH_SIZE = int(os.getenv("EMPLOYEE_DB_BATCH_SIZE", "5000"))
+
+# Upper bound on rows returned by one tool call (page size)
+MAX_RESULTS = 100
+# Matching rows counted for total_estimate before reporting "10000+"
+COUNT_ESTIMATE_CAP = 10000
+# query_employees: statement time budget and compiled statement cache size
+QUERY_TIME_BUDGET = float(os.getenv("EMPLOYEE_QUERY_TIME_BUDGET", "2"))
+QUERY_CACHE_SIZE = 256
+
+EMPLOYEE_COLUMNS = (
+    "id", "first_name", "last_name", "email", "department",
+    "job_title", "salary", "hire_date", "phone", "city"
+)
+_INSERT_SQL = f"""
+    INSERT INTO employees ({', '.join(EMPLOYEE_COLUMNS)})
+    VALUES ({', '.join('?' * len(EMPLOYEE_COLUMNS))})
+"""
+
+_fts_enabled = False
+
+# Salary percentiles reported per department (name, fraction)
+SALARY_PERCENTILES = (("p25", 0.25), ("median", 0.5), ("p75", 0.75), ("p90", 0.9))
+
+# department -> ((connection manager id, department version), percentiles)
+_percentile_cache = {}
+_percentile_lock = threading.Lock()
+
+
+class ConnectionManager:
+    """
+    One writer connection plus one read-only connection per thread.
+    
+    The database file is opened in WAL mode, so readers on different threads
+    run in parallel with each other and with the writer. ":memory:" is backed
+    by a private temporary file (deleted on close) so it gets the same
+    concurrency; a shared-cache memory database would serialize readers.
+    """
+    
+    def __init__(self, path: str = ":memory:", import_path: Optional[str] = None):
+        self.path = path
+        if path == ":memory:":
+            fd, temp_path = tempfile.mkstemp(prefix="employees-", suffix=".sqlite3")
+            os.close(fd)
+            file = Path(temp_path)
+            self._cleanup = weakref.finalize(self, _remove_database_files, temp_path)
+        else:
+            file = Path(path).expanduser().resolve()
+            file.parent.mkdir(parents=True, exist_ok=True)
+            self._cleanup = None
+        self._reader_uri = f"{file.as_uri()}?mode=ro"
+        
+        self._writer = sqlite3.connect(str(file), check_same_thread=False)
+        self._writer.row_factory = sqlite3.Row
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._readers = {}  # thread -> its reader connection
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        
+        with self.writer() as conn:
+            _init_database(conn, import_path)
+    
+    def reader(self) -> sqlite3.Connection:
+        """Get the calling thread's read-only connection, opening it on first use."""
+        if self._closed:
+            raise RuntimeError("Employee database is closed")
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._reader_uri, uri=True, check_same_thread=False, cached_statements=QUERY_CACHE_SIZE
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only = ON")
+            self._local.conn = conn
+            with self._readers_lock:
+                # Close readers left behind by threads that have exited
+                for thread in [t for t in self._readers if not t.is_alive()]:
+                    self._readers.pop(thread).close()
+                self._readers[threading.current_thread()] = conn
+        return conn
+    
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Exclusive access to the single writer connection."""
+        with self._write_lock:
+            if self._closed:
+                raise RuntimeError("Employee database is closed")
+            yield self._writer
+    
+    def close(self) -> None:
+        """Close the writer and every live reader connection."""
+        with self._write_lock:
+            self._closed = True
+            with self._readers_lock:
+                for conn in self._readers.values():
+                    conn.close()
+                self._readers.clear()
+            self._writer.close()
+        if self._cleanup is not None:
+            self._cleanup()
+
 
+def _remove_database_files(path: str) -> None:
+    """Delete a temporary database with its WAL and shared-memory files."""
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
 
-def _get_db():
-    """Get or create the in-memory database connection."""
-    global _db_connection
-    if _db_connection is None:
-        _db_connection = sqlite3.connect(":memory:", check_same_thread=False)
-        _db_connection.row_factory = sqlite3.Row
-        _init_database(_db_connection)
-    return _db_connection
 
+_manager = None
+_manager_lock = threading.Lock()
 
-def _init_database(conn):
-    """Initialize the employee database with sample data."""
+
+def _get_manager() -> ConnectionManager:
+    """Get or create the connection manager for EMPLOYEE_DB_PATH."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ConnectionManager(EMPLOYEE_DB_PATH, EMPLOYEE_DB_IMPORT)
+    return _manager
+
+
+def _get_db() -> sqlite3.Connection:
+    """Get the calling thread's read-only database connection."""
+    return _get_manager().reader()
+
+
+def close_database() -> None:
+    """Close all employee database connections (reopened on next use)."""
+    global _manager, _percentile_cache
+    with _manager_lock:
+        if _manager is not None:
+            _manager.close()
+            _manager = None
+    with _percentile_lock:
+        _percentile_cache = {}
+
+
+def _init_database(conn, import_path: Optional[str] = None):
+    """Create the schema and indexes; load sample data (or `import_path`) into an empty database."""
     cursor = conn.cursor()
     
     # Create employee table
@@ -52,7 +223,17 @@ def _init_database(conn):
         )
     """)
     
-    # Insert 15 sample employees
+    if cursor.execute("SELECT 1 FROM employees LIMIT 1").fetchone() is None:
+        if import_path:
+            _import_employees(import_path, conn, IMPORT_BATCH_SIZE)
+        else:
+            _insert_sample_employees(conn)
+    
+    _create_indexes(conn)
+
+
+def _insert_sample_employees(conn):
+    """Insert the 15 built-in sample employees."""
     employees = [
         (1, "John", "Smith", "john.smith@company.com", "Engineering", "Senior Software Engineer", 95000, "2020-03-15", "+1-555-0101", "San Francisco"),
         (2, "Sarah", "Johnson", "sarah.johnson@company.com", "Engineering", "Tech Lead", 120000, "2018-06-20", "+1-555-0102", "San Francisco"),
@@ -71,43 +252,364 @@ def _init_database(conn):
         (15, "Daniel", "White", "daniel.white@company.com", "Engineering", "QA Engineer", 78000, "2020-12-10", "+1-555-0115", "San Francisco"),
     ]
     
-    cursor.executemany("""
-        INSERT INTO employees (id, first_name, last_name, email, department, job_title, salary, hire_date, phone, city)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, employees)
-    
-    conn.commit()
+    with conn:
+        conn.executemany(_INSERT_SQL, employees)
     logger.info("Employee database initialized with 15 records")
 
 
+def _create_indexes(conn):
+    """Create the lookup indexes and the FTS5 name/title index (no-op when they exist)."""
+    global _fts_enabled
+    with conn:
+        conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_employees_department ON employees(department COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_employees_city ON employees(city COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_employees_last_name ON employees(last_name COLLATE NOCASE, first_name COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_employees_first_name ON employees(first_name COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_employees_department_salary ON employees(department, salary);
+        """)
+    _create_summary(conn)
+    try:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'employees_fts'"
+        ).fetchone()
+        if exists is None:
+            with conn:
+                conn.execute("""
+                    CREATE VIRTUAL TABLE employees_fts USING fts5(
+                        first_name, last_name, job_title,
+                        content='employees', content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                    )
+                """)
+                conn.execute("INSERT INTO employees_fts(employees_fts) VALUES ('rebuild')")
+        _create_fts_triggers(conn)
+        _fts_enabled = True
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 not available, name search uses prefix matching: {e}")
+        _fts_enabled = False
+
+
+def _create_fts_triggers(conn):
+    """Keep employees_fts in sync with inserts, updates and deletes on employees."""
+    with conn:
+        conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS employees_fts_insert AFTER INSERT ON employees BEGIN
+                INSERT INTO employees_fts(rowid, first_name, last_name, job_title)
+                VALUES (new.id, new.first_name, new.last_name, new.job_title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS employees_fts_delete AFTER DELETE ON employees BEGIN
+                INSERT INTO employees_fts(employees_fts, rowid, first_name, last_name, job_title)
+                VALUES ('delete', old.id, old.first_name, old.last_name, old.job_title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS employees_fts_update AFTER UPDATE ON employees BEGIN
+                INSERT INTO employees_fts(employees_fts, rowid, first_name, last_name, job_title)
+                VALUES ('delete', old.id, old.first_name, old.last_name, old.job_title);
+                INSERT INTO employees_fts(rowid, first_name, last_name, job_title)
+                VALUES (new.id, new.first_name, new.last_name, new.job_title);
+            END;
+        """)
+
+
+def _create_summary(conn):
+    """Create the department summary table and the data version counter (no-op when they exist)."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'department_summary'"
+    ).fetchone()
+    if exists is not None:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(department_summary)")}
+        if "version" not in columns:
+            # Summary from before per-department versions: recreate it and its triggers
+            with conn:
+                conn.executescript("""
+                    DROP TRIGGER IF EXISTS employees_stats_insert;
+                    DROP TRIGGER IF EXISTS employees_stats_delete;
+                    DROP TRIGGER IF EXISTS employees_stats_update;
+                    DROP TABLE department_summary;
+                """)
+            exists = None
+    with conn:
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS department_summary (
+                department TEXT PRIMARY KEY,
+                employee_count INTEGER NOT NULL,
+                salary_sum REAL NOT NULL,
+                min_salary REAL NOT NULL,
+                max_salary REAL NOT NULL,
+                version INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS db_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO db_meta (key, value) VALUES ('data_version', 0);
+        """)
+    if exists is None:
+        _rebuild_summary(conn)
+    _create_summary_triggers(conn)
+
+
+def _rebuild_summary(conn):
+    """Recompute department_summary from employees (after bulk loads) and bump the data version."""
+    with conn:
+        conn.execute("UPDATE db_meta SET value = value + 1 WHERE key = 'data_version'")
+        conn.execute("DELETE FROM department_summary")
+        conn.execute("""
+            INSERT INTO department_summary (department, employee_count, salary_sum, min_salary, max_salary, version)
+            SELECT department, COUNT(*), SUM(salary), MIN(salary), MAX(salary), (SELECT value FROM db_meta WHERE key = 'data_version')
+            FROM employees GROUP BY department
+        """)
+
+
+def _create_summary_triggers(conn):
+    """
+    Maintain department_summary row by row and bump data_version on every change.
+    
+    Count and sum are adjusted in place; min/max after a removal are re-read with
+    one seek on the (department, salary) index. Each changed department's `version`
+    is set to the new data_version, so cached percentiles of other departments stay valid.
+    """
+    with conn:
+        conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS employees_stats_insert AFTER INSERT ON employees BEGIN
+                UPDATE db_meta SET value = value + 1 WHERE key = 'data_version';
+                INSERT INTO department_summary (department, employee_count, salary_sum, min_salary, max_salary, version)
+                VALUES (new.department, 1, new.salary, new.salary, new.salary, (SELECT value FROM db_meta WHERE key = 'data_version'))
+                ON CONFLICT(department) DO UPDATE SET
+                    employee_count = employee_count + 1,
+                    salary_sum = salary_sum + excluded.salary_sum,
+                    min_salary = MIN(min_salary, excluded.min_salary),
+                    max_salary = MAX(max_salary, excluded.max_salary),
+                    version = excluded.version;
+            END;
+            CREATE TRIGGER IF NOT EXISTS employees_stats_delete AFTER DELETE ON employees BEGIN
+                UPDATE db_meta SET value = value + 1 WHERE key = 'data_version';
+                DELETE FROM department_summary WHERE department = old.department AND employee_count <= 1;
+                UPDATE department_summary SET
+                    employee_count = employee_count - 1,
+                    salary_sum = salary_sum - old.salary,
+                    min_salary = (SELECT MIN(salary) FROM employees WHERE department = old.department),
+                    max_salary = (SELECT MAX(salary) FROM employees WHERE department = old.department),
+                    version = (SELECT value FROM db_meta WHERE key = 'data_version')
+                WHERE department = old.department;
+            END;
+            CREATE TRIGGER IF NOT EXISTS employees_stats_update AFTER UPDATE OF department, salary ON employees BEGIN
+                UPDATE db_meta SET value = value + 1 WHERE key = 'data_version';
+                DELETE FROM department_summary WHERE department = old.department AND employee_count <= 1;
+                UPDATE department_summary SET
+                    employee_count = employee_count - 1,
+                    salary_sum = salary_sum - old.salary,
+                    min_salary = (SELECT MIN(salary) FROM employees WHERE department = old.department),
+                    max_salary = (SELECT MAX(salary) FROM employees WHERE department = old.department),
+                    version = (SELECT value FROM db_meta WHERE key = 'data_version')
+                WHERE department = old.department;
+                INSERT INTO department_summary (department, employee_count, salary_sum, min_salary, max_salary, version)
+                VALUES (new.department, 1, new.salary, new.salary, new.salary, (SELECT value FROM db_meta WHERE key = 'data_version'))
+                ON CONFLICT(department) DO UPDATE SET
+                    employee_count = employee_count + 1,
+                    salary_sum = salary_sum + excluded.salary_sum,
+                    min_salary = MIN(min_salary, excluded.min_salary),
+                    max_salary = MAX(max_salary, excluded.max_salary),
+                    version = excluded.version;
+            END;
+        """)
+
+
+def _read_records(path: str) -> Iterator[dict]:
+    """Stream records from a CSV file (header row = column names) or a Parquet file."""
+    if path.lower().endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet import requires the optional 'pyarrow' package")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=IMPORT_BATCH_SIZE):
+            yield from batch.to_pylist()
+        return
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from csv.DictReader(f)
+
+
+def _record_to_row(record: dict) -> Optional[tuple]:
+    """Convert an imported record to an insert tuple (None when required fields are missing)."""
+    values = {k.strip().lower(): v for k, v in record.items() if k}
+    row = []
+    for column in EMPLOYEE_COLUMNS:
+        value = values.get(column)
+        if isinstance(value, str):
+            value = value.strip() or None
+        row.append(value)
+    try:
+        row[0] = int(row[0]) if row[0] is not None else None
+        row[6] = float(row[6])
+    except (TypeError, ValueError):
+        return None
+    if any(row[i] is None for i in (1, 2, 3, 4, 5, 7)):
+        return None
+    return tuple(row)
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def import_employees(path: str, batch_size: int = IMPORT_BATCH_SIZE) -> int:
+    """
+    Bulk-load employees from a CSV (or Parquet) file through the writer connection.
+    
+    Rows are inserted with executemany, one transaction per `batch_size` rows;
+    the full-text index and department summary are rebuilt once at the end
+    instead of per row.
+    Records without the required fields are skipped. Returns the number of rows imported.
+    """
+    with _get_manager().writer() as conn:
+        return _import_employees(path, conn, batch_size)
+
+
+def _import_employees(path: str, conn: sqlite3.Connection, batch_size: int) -> int:
+    imported = skipped = 0
+    
+    with conn:
+        conn.executescript("""
+            DROP TRIGGER IF EXISTS employees_fts_insert;
+            DROP TRIGGER IF EXISTS employees_fts_delete;
+            DROP TRIGGER IF EXISTS employees_fts_update;
+            DROP TRIGGER IF EXISTS employees_stats_insert;
+            DROP TRIGGER IF EXISTS employees_stats_delete;
+            DROP TRIGGER IF EXISTS employees_stats_update;
+        """)
+    try:
+        rows = (_record_to_row(record) for record in _read_records(path))
+        for batch in _batches(rows, batch_size):
+            valid = [row for row in batch if row is not None]
+            skipped += len(batch) - len(valid)
+            with conn:
+                conn.executemany(_INSERT_SQL, valid)
+            imported += len(valid)
+    finally:
+        has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'employees_fts'"
+        ).fetchone()
+        if has_fts:
+            with conn:
+                conn.execute("INSERT INTO employees_fts(employees_fts) VALUES ('rebuild')")
+            _create_fts_triggers(conn)
+        has_summary = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'department_summary'"
+        ).fetchone()
+        if has_summary:
+            _rebuild_summary(conn)
+            _create_summary_triggers(conn)
+    
+    if skipped:
+        logger.warning(f"Employee import skipped {skipped} incomplete records")
+    logger.info(f"Imported {imported} employees from {path}")
+    return imported
+
+
 def _row_to_dict(row):
     """Convert a sqlite3.Row to a dictionary."""
     return dict(row)
 
 
+def _encode_page_token(fingerprint: str, state: dict) -> str:
+    """Opaque continuation token: the keyset position of the last returned row."""
+    payload = json.dumps({"q": fingerprint, **state}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_page_token(token: str, fingerprint: str) -> dict:
+    """Decode a page token; raises ValueError if it is malformed or from another query."""
+    if not token:
+        return {}
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except Exception:
+        raise ValueError("Invalid page_token")
+    if not isinstance(state, dict) or state.pop("q", None) != fingerprint:
+        raise ValueError("page_token does not belong to this query")
+    return state
+
+
+def _fingerprint(*parts) -> str:
+    """Short hash identifying a query, so tokens cannot be replayed against another one."""
+    return hashlib.blake2b(json.dumps(parts).encode(), digest_size=6).hexdigest()
+
+
+def _estimate_count(conn, where: str, params) -> object:
+    """Count matching rows, stopping at COUNT_ESTIMATE_CAP ("10000+" beyond it)."""
+    count = conn.execute(
+        f"SELECT COUNT(*) FROM (SELECT 1 FROM {where} LIMIT {COUNT_ESTIMATE_CAP + 1})", params
+    ).fetchone()[0]
+    return f"{COUNT_ESTIMATE_CAP}+" if count > COUNT_ESTIMATE_CAP else count
+
+
+def _page_json(header: dict, rows: Iterable, page_size: int, next_token: Callable) -> str:
+    """
+    Serialize one page of employees row by row straight from the cursor.
+    
+    At most `page_size + 1` rows are read; the extra row only signals that a
+    next page exists. The output matches json.dumps(..., indent=2).
+    """
+    out = io.StringIO()
+    out.write("{\n")
+    for key, value in header.items():
+        out.write(f'  {json.dumps(key)}: {json.dumps(value, indent=2).replace(chr(10), chr(10) + "  ")},\n')
+    out.write('  "employees": [')
+    
+    count = 0
+    last = None
+    has_more = False
+    for row in rows:
+        if count == page_size:
+            has_more = True
+            break
+        out.write(",\n    " if count else "\n    ")
+        out.write(json.dumps(_row_to_dict(row), indent=2).replace("\n", "\n    "))
+        last = row
+        count += 1
+    
+    out.write("\n  ]" if count else "]")
+    out.write(f',\n  "results_count": {count}')
+    out.write(f',\n  "next_page_token": {json.dumps(next_token(last) if has_more else None)}\n}}')
+    return out.getvalue()
+
+
+def _page_size(page_size: int) -> int:
+    return max(1, min(page_size, MAX_RESULTS))
+
+
 @tool
-def get_all_employees(limit: int = 10) -> str:
+def get_all_employees(page_size: int = 10, page_token: str = "") -> str:
     """
-    Get all employees from the database.
+    List employees ordered by ID, one page at a time.
     
     Args:
-        limit: Maximum number of employees to return (1-15, default: 10)
+        page_size: Employees per page (1-100, default: 10)
+        page_token: next_page_token from the previous page (omit for the first page)
     
     Returns:
-        List of all employees with their details
+        One page of employees, a total count estimate and the next page token (null on the last page)
     """
     try:
         conn = _get_db()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM employees LIMIT ?", (min(limit, 15),))
-        rows = cursor.fetchall()
-        
-        employees = [_row_to_dict(row) for row in rows]
+        page_size = _page_size(page_size)
+        fingerprint = _fingerprint("all")
+        state = _decode_page_token(page_token, fingerprint)
+        total = state.get("total") if state else _estimate_count(conn, "employees", ())
         
-        return json.dumps({
-            "total_count": len(employees),
-            "employees": employees
-        }, indent=2)
+        rows = conn.execute(
+            "SELECT * FROM employees WHERE id > ? ORDER BY id LIMIT ?",
+            (state.get("id", -1), page_size + 1)
+        )
+        return _page_json(
+            {"total_estimate": total, "page_size": page_size},
+            rows, page_size,
+            lambda last: _encode_page_token(fingerprint, {"id": last["id"], "total": total})
+        )
+    except ValueError as e:
+        return f"Error: {str(e)}"
     except Exception as e:
         logger.error(f"Database error: {e}")
         return f"Error: {str(e)}"
@@ -119,7 +621,7 @@ def get_employee_by_id(employee_id: int) -> str:
     Get a specific employee by their ID.
     
     Args:
-        employee_id: The employee's ID number (1-15)
+        employee_id: The employee's ID number
     
     Returns:
         Employee details if found
@@ -145,89 +647,237 @@ def get_employee_by_id(employee_id: int) -> str:
         return f"Error: {str(e)}"
 
 
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards (used with ESCAPE '\\')."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _prefix_pattern(query: str) -> str:
+    """LIKE pattern matching values that start with `query` (wildcards in the query are escaped)."""
+    return f"{_escape_like(query.strip())}%"
+
+
+def _fts_query(query: str, columns: str) -> Optional[str]:
+    """FTS5 query matching every word of `query` as a prefix within `columns`."""
+    words = query.replace('"', " ").split()
+    if not words:
+        return None
+    # The column filter binds to one phrase, so group the words to apply it to all of them
+    return "{" + columns + "} : (" + " ".join(f'"{word}"*' for word in words) + ")"
+
+
+def _fold(text: str) -> str:
+    """Fold ASCII letters to lowercase, like SQLite's NOCASE collation."""
+    return "".join(ch.lower() if "A" <= ch <= "Z" else ch for ch in text)
+
+
+def _prefix_bounds(query: str) -> tuple:
+    """[low, high) NOCASE range of values starting with `query` (high is None when unbounded)."""
+    low = _fold(query.strip())
+    if not low or ord(low[-1]) >= 0x10FFFF:
+        return low, None
+    return low, low[:-1] + chr(ord(low[-1]) + 1)
+
+
+def _value_rows(
+    conn,
+    field: str,
+    low: str,
+    high: Optional[str],
+    state: dict,
+    limit: int,
+    pattern: Optional[str] = None
+) -> Iterator:
+    """
+    Rows whose `field` is in [low, high) (and LIKE `pattern`, if given), ordered by (field NOCASE, id).
+    
+    The keyset (last value, last id) is resumed with two index seeks: the rest of the
+    last value's rows by id, then the following values - SQLite cannot seek a
+    (value, id) row-value comparison through a NOCASE index directly.
+    """
+    upper = f" AND {field} < :high COLLATE NOCASE" if high is not None else ""
+    if pattern is not None:
+        upper += f" AND {field} LIKE :pattern ESCAPE '\\'"
+    if state:
+        yield from conn.execute(
+            f"SELECT * FROM employees WHERE {field} = :value COLLATE NOCASE AND id > :id ORDER BY id LIMIT :limit",
+            {"value": state["value"], "id": state["id"], "limit": limit}
+        )
+        lower = f"{field} > :value COLLATE NOCASE"
+    else:
+        lower = f"{field} >= :low COLLATE NOCASE"
+    yield from conn.execute(
+        f"SELECT * FROM employees WHERE {lower}{upper} ORDER BY {field} COLLATE NOCASE, id LIMIT :limit",
+        {"value": state.get("value"), "low": low, "high": high, "pattern": pattern, "limit": limit}
+    )
+
+
 @tool
-def search_employees(query: str, search_by: str = "name") -> str:
+def search_employees(query: str, search_by: str = "name", page_size: int = 20, page_token: str = "") -> str:
     """
-    Search employees by name or department.
+    Search employees by name, job title, department or city, one page at a time.
     
     Args:
-        query: Search term (e.g., "John", "Engineering", "San Francisco")
-        search_by: Field to search - "name", "department", or "city" (default: "name")
+        query: Search term (e.g., "John", "Engineer", "Engineering", "San Francisco")
+        search_by: Field to search - "name", "title", "department", or "city" (default: "name")
+        page_size: Employees per page (1-100, default: 20)
+        page_token: next_page_token from the previous page (omit for the first page)
     
     Returns:
-        List of matching employees
+        One page of matching employees, a total count estimate and the next page token
     """
     try:
         conn = _get_db()
-        cursor = conn.cursor()
-        search_term = f"%{query}%"
+        field = search_by.lower()
+        page_size = _page_size(page_size)
+        fingerprint = _fingerprint("search", query, field)
+        state = _decode_page_token(page_token, fingerprint)
         
-        if search_by.lower() == "department":
-            cursor.execute(
-                "SELECT * FROM employees WHERE department LIKE ?",
-                (search_term,)
-            )
-        elif search_by.lower() == "city":
-            cursor.execute(
-                "SELECT * FROM employees WHERE city LIKE ?",
-                (search_term,)
-            )
+        substring = state.get("substring", False)
+        if field in ("department", "city"):
+            # Index range scan: values starting with the query, case-insensitive
+            low, high = _prefix_bounds(query)
+            where = f"employees WHERE {field} >= ? COLLATE NOCASE" + (f" AND {field} < ? COLLATE NOCASE" if high else "")
+            total = state.get("total") if state else _estimate_count(conn, where, (low, high) if high else (low,))
+            pattern = f"%{_escape_like(query.strip())}%"
+            if total == 0 and not state:
+                # No value starts with the query: fall back to a substring match ("York" -> "New York")
+                substring = True
+                total = _estimate_count(conn, f"employees WHERE {field} LIKE ? ESCAPE '\\'", (pattern,))
+            if substring:
+                rows = _value_rows(conn, field, "", None, state, page_size + 1, pattern=pattern)
+            else:
+                rows = _value_rows(conn, field, low, high, state, page_size + 1)
         else:
-            cursor.execute(
-                "SELECT * FROM employees WHERE first_name LIKE ? OR last_name LIKE ?",
-                (search_term, search_term)
-            )
+            columns = "job_title" if field == "title" else "first_name last_name"
+            match = _fts_query(query, columns)
+            if match is None:
+                return "Error: Empty search query"
+            if _fts_enabled:
+                where = "employees_fts WHERE employees_fts MATCH :match"
+                rows_sql = (
+                    "SELECT e.* FROM employees_fts JOIN employees e ON e.id = employees_fts.rowid "
+                    "WHERE employees_fts MATCH :match AND employees_fts.rowid > :id "
+                    "ORDER BY employees_fts.rowid LIMIT :limit"
+                )
+            else:
+                conditions = (
+                    "job_title LIKE :match ESCAPE '\\'" if field == "title"
+                    else "(first_name LIKE :match ESCAPE '\\' OR last_name LIKE :match ESCAPE '\\')"
+                )
+                match = _prefix_pattern(query)
+                where = f"employees WHERE {conditions}"
+                rows_sql = f"SELECT * FROM employees WHERE {conditions} AND id > :id ORDER BY id LIMIT :limit"
+            total = state.get("total") if state else _estimate_count(conn, where, {"match": match})
+            rows = conn.execute(rows_sql, {"match": match, "id": state.get("id", -1), "limit": page_size + 1})
         
-        rows = cursor.fetchall()
-        employees = [_row_to_dict(row) for row in rows]
+        def next_token(last) -> str:
+            position = {"id": last["id"], "total": total}
+            if field in ("department", "city"):
+                position["value"] = last[field]
+                if substring:
+                    position["substring"] = True
+            return _encode_page_token(fingerprint, position)
         
-        return json.dumps({
-            "query": query,
-            "search_by": search_by,
-            "results_count": len(employees),
-            "employees": employees
-        }, indent=2)
+        return _page_json(
+            {"query": query, "search_by": search_by, "total_estimate": total},
+            rows, page_size, next_token
+        )
+    except ValueError as e:
+        return f"Error: {str(e)}"
     except Exception as e:
         logger.error(f"Database error: {e}")
         return f"Error: {str(e)}"
 
 
+def _department_percentiles(conn, department: str, count: int) -> dict:
+    """
+    Linearly interpolated salary percentiles for one department.
+    
+    All SALARY_PERCENTILES come from a single ordered walk of the (department, salary)
+    index that stops after the highest one, so it reads up to ~90% of the department's
+    rows - O(department size), done again only after that department changes
+    (see _salary_percentiles).
+    """
+    positions = [(name, (count - 1) * fraction) for name, fraction in SALARY_PERCENTILES]
+    wanted = {offset for _, position in positions for offset in (int(position), int(position) + 1)}
+    rows = conn.execute(
+        "SELECT salary FROM employees WHERE department = ? ORDER BY salary LIMIT ?",
+        (department, max(wanted) + 1)
+    )
+    values = {i: row[0] for i, row in enumerate(rows) if i in wanted}
+    
+    percentiles = {}
+    for name, position in positions:
+        offset = int(position)
+        low = values[offset]
+        high = values.get(offset + 1, low)
+        percentiles[f"{name}_salary"] = round(low + (high - low) * (position - offset), 2)
+    return percentiles
+
+
+def _salary_percentiles(conn, departments: list) -> dict:
+    """Per-department salary percentiles, recomputed only for departments whose version changed."""
+    global _percentile_cache
+    manager = id(_manager)
+    with _percentile_lock:
+        cached = _percentile_cache
+    
+    percentiles = {}
+    for row in departments:
+        key = (manager, row["version"])
+        entry = cached.get(row["department"])
+        if entry is not None and entry[0] == key:
+            percentiles[row["department"]] = entry[1]
+        else:
+            percentiles[row["department"]] = _department_percentiles(conn, row["department"], row["employee_count"])
+    
+    with _percentile_lock:
+        # Departments that no longer exist drop out of the cache
+        _percentile_cache = {
+            row["department"]: ((manager, row["version"]), percentiles[row["department"]])
+            for row in departments
+        }
+    return percentiles
+
+
 @tool
 def get_department_stats() -> str:
     """
     Get statistics about employees by department.
     
     Returns:
-        Department-wise employee count, average salary, and total headcount
+        Department-wise employee count, average/min/max/median and p25/p75/p90 salary, and total headcount
     """
     try:
         conn = _get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                department,
-                COUNT(*) as employee_count,
-                ROUND(AVG(salary), 2) as avg_salary,
-                ROUND(MIN(salary), 2) as min_salary,
-                ROUND(MAX(salary), 2) as max_salary
-            FROM employees
-            GROUP BY department
-            ORDER BY employee_count DESC
-        """)
-        
-        rows = cursor.fetchall()
-        departments = [_row_to_dict(row) for row in rows]
+        # One read snapshot, so the summary and the salaries behind the percentiles agree
+        conn.execute("BEGIN")
+        try:
+            rows = conn.execute("""
+                SELECT department, employee_count, salary_sum, min_salary, max_salary, version
+                FROM department_summary
+                ORDER BY employee_count DESC, department
+            """).fetchall()
+            percentiles = _salary_percentiles(conn, rows)
+        finally:
+            conn.rollback()
         
-        cursor.execute("SELECT COUNT(*) as total FROM employees")
-        total = cursor.fetchone()["total"]
+        departments = [{
+            "department": row["department"],
+            "employee_count": row["employee_count"],
+            "avg_salary": round(row["salary_sum"] / row["employee_count"], 2),
+            "min_salary": round(row["min_salary"], 2),
+            "max_salary": round(row["max_salary"], 2),
+            **percentiles[row["department"]]
+        } for row in rows]
         
-        cursor.execute("SELECT ROUND(AVG(salary), 2) as avg FROM employees")
-        company_avg = cursor.fetchone()["avg"]
+        total = sum(row["employee_count"] for row in rows)
+        salary_sum = sum(row["salary_sum"] for row in rows)
         
         return json.dumps({
             "total_employees": total,
-            "company_avg_salary": company_avg,
+            "company_avg_salary": round(salary_sum / total, 2) if total else None,
             "departments": departments
         }, indent=2)
     except Exception as e:
@@ -235,9 +885,261 @@ def get_department_stats() -> str:
         return f"Error: {str(e)}"
 
 
+_AGGREGATE_RE = re.compile(r"^(count|sum|avg|min|max)\s*\(\s*(\*|\w+)\s*\)$")
+_TEXT_COLUMNS = frozenset(EMPLOYEE_COLUMNS) - {"id", "salary"}
+_COMPARISONS = {"=": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+_FILTER_OPS = set(_COMPARISONS) | {"in", "not_in", "between", "contains", "starts_with", "is_null", "not_null"}
+
+
+def _parse_field(spec: str) -> tuple:
+    """Parse a column or aggregate spec into (normalized spec, SQL expression, label, is_aggregate)."""
+    text = " ".join(str(spec).lower().split())
+    match = _AGGREGATE_RE.match(text)
+    if match:
+        func, column = match.groups()
+        if column != "*" and column not in EMPLOYEE_COLUMNS:
+            raise ValueError(f"Unknown column '{column}'")
+        if column == "*" and func != "count":
+            raise ValueError(f"{func}(*) is not supported")
+        expr = f"{func.upper()}({column})"
+        if func == "avg":
+            expr = f"ROUND({expr}, 2)"
+        label = func if column == "*" else f"{func}_{column}"
+        return f"{func}({column})", expr, label, True
+    if text not in EMPLOYEE_COLUMNS:
+        raise ValueError(f"Unknown field '{spec}'. Use a column ({', '.join(EMPLOYEE_COLUMNS)}) or count/sum/avg/min/max(column)")
+    return text, text, text, False
+
+
+def _padded(values: list) -> list:
+    """Pad an IN list to the next power of two (repeating the last value) to bound statement shapes."""
+    size = 1
+    while size < len(values):
+        size *= 2
+    return values + [values[-1]] * (size - len(values))
+
+
+def _query_shape(fields, filters, group_by, order_by) -> tuple:
+    """Validate a query spec; returns (hashable statement shape, bound parameters)."""
+    fields = tuple(_parse_field(f)[0] for f in fields or [])
+    group_by = tuple(_parse_field(g)[0] for g in group_by or [])
+    
+    shape_filters = []
+    params = []
+    for item in filters or []:
+        if not isinstance(item, dict) or "field" not in item:
+            raise ValueError("Each filter needs 'field', 'op' and (usually) 'value'")
+        field = _parse_field(item["field"])[0]
+        op = str(item.get("op", "=")).lower().replace(" ", "_")
+        op = {"==": "=", "<>": "!=", "eq": "=", "ne": "!="}.get(op, op)
+        if op not in _FILTER_OPS:
+            raise ValueError(f"Unsupported op '{op}'. Use one of: {', '.join(sorted(_FILTER_OPS))}")
+        value = item.get("value")
+        if op in ("in", "not_in"):
+            values = value if isinstance(value, list) else [value]
+            if not values:
+                raise ValueError(f"'{op}' needs a non-empty list value")
+            values = _padded(values)
+            shape_filters.append((field, op, len(values)))
+            params.extend(values)
+        elif op == "between":
+            if not isinstance(value, list) or len(value) != 2:
+                raise ValueError("'between' needs a [low, high] value")
+            shape_filters.append((field, op, 2))
+            params.extend(value)
+        elif op in ("is_null", "not_null"):
+            shape_filters.append((field, op, 0))
+        else:
+            if value is None or isinstance(value, (list, dict)):
+                raise ValueError(f"'{op}' needs a single value")
+            if op in ("contains", "starts_with"):
+                value = f"%{_escape_like(str(value))}%" if op == "contains" else f"{_escape_like(str(value))}%"
+            shape_filters.append((field, op, 1))
+            params.append(value)
+    
+    order = []
+    for item in order_by or []:
+        parts = str(item).strip().rsplit(" ", 1)
+        direction = "asc"
+        if len(parts) == 2 and parts[1].lower() in ("asc", "desc"):
+            item, direction = parts[0], parts[1].lower()
+        elif str(item).startswith("-"):
+            item, direction = str(item)[1:], "desc"
+        order.append((_parse_field(item)[0], direction))
+    
+    return (fields, tuple(shape_filters), group_by, tuple(order)), params
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _compile_query(shape: tuple) -> tuple:
+    """
+    Compile a validated query shape into (SQL, column labels).
+    
+    The SQL text only depends on the shape, so each reader connection's
+    statement cache reuses the prepared statement for every call of that shape.
+    """
+    fields, filters, group_by, order = shape
+    parsed = [_parse_field(f) for f in fields]
+    if not parsed:
+        parsed = [_parse_field(g) for g in group_by] + [_parse_field("count(*)")] if group_by else [
+            _parse_field(c) for c in EMPLOYEE_COLUMNS
+        ]
+    has_aggregate = any(p[3] for p in parsed)
+    if has_aggregate or group_by:
+        loose = [p[0] for p in parsed if not p[3] and p[0] not in group_by]
+        if loose:
+            raise ValueError(f"Fields {loose} must be aggregated or listed in group_by")
+    
+    where, having = [], []
+    for field, op, arity in filters:
+        _, expr, _, is_aggregate = _parse_field(field)
+        if is_aggregate and not group_by and not has_aggregate:
+            raise ValueError(f"Filter on {field} needs an aggregate query")
+        # Text equality is case-insensitive (and served by the NOCASE indexes)
+        collate = " COLLATE NOCASE" if field in _TEXT_COLUMNS and op in ("=", "!=", "in", "not_in") else ""
+        if op in _COMPARISONS:
+            clause = f"{expr} {_COMPARISONS[op]} ?{collate}"
+        elif op in ("in", "not_in"):
+            clause = f"{expr}{collate} {'NOT IN' if op == 'not_in' else 'IN'} ({', '.join('?' * arity)})"
+        elif op == "between":
+            clause = f"{expr} BETWEEN ? AND ?"
+        elif op in ("contains", "starts_with"):
+            clause = f"{expr} LIKE ? ESCAPE '\\'"
+        else:
+            clause = f"{expr} IS {'NOT ' if op == 'not_null' else ''}NULL"
+        (having if is_aggregate else where).append(clause)
+    
+    for field, _ in order:
+        is_aggregate = _parse_field(field)[3]
+        if is_aggregate and not group_by and not has_aggregate:
+            raise ValueError(f"Order by {field} needs an aggregate query")
+        if not is_aggregate and (group_by or has_aggregate) and field not in group_by:
+            raise ValueError(f"Order by {field} must be aggregated or listed in group_by")
+    
+    sql = f"SELECT {', '.join(f'{p[1]} AS {p[2]}' for p in parsed)} FROM employees"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if group_by:
+        sql += " GROUP BY " + ", ".join(group_by)
+    if having:
+        sql += " HAVING " + " AND ".join(having)
+    if order:
+        sql += " ORDER BY " + ", ".join(f"{_parse_field(f)[1]} {d.upper()}" for f, d in order)
+    sql += " LIMIT ?"
+    return sql, tuple(p[2] for p in parsed)
+
+
+def get_query_cache_stats() -> dict:
+    """Get hit/miss counters for the compiled query_employees statements."""
+    info = _compile_query.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
+
+
+@tool
+def query_employees(
+    fields: Optional[list[str]] = None,
+    filters: Optional[list[dict]] = None,
+    group_by: Optional[list[str]] = None,
+    order_by: Optional[list[str]] = None,
+    limit: int = 20
+) -> str:
+    """
+    Run an ad-hoc read-only query on the employees table in ONE call (filters, aggregates,
+    grouping, sorting). Prefer this over listing employees and computing in the answer.
+    
+    Columns: id, first_name, last_name, email, department, job_title, salary, hire_date (YYYY-MM-DD), phone, city
+    
+    Args:
+        fields: Columns and/or aggregates: count(*), sum/avg/min/max(column), count(column)
+            (default: all columns, or group_by columns + count(*) when grouping)
+        filters: Conditions ANDed together, each {"field": ..., "op": ..., "value": ...}.
+            op: =, !=, <, <=, >, >=, in, not_in, between ([low, high]), contains, starts_with, is_null, not_null.
+            Text = / in / contains are case-insensitive. Aggregate fields (e.g. "count(*)") filter groups.
+        group_by: Columns to group by (e.g. ["department"])
+        order_by: Fields or aggregates with optional direction (e.g. ["avg(salary) desc", "department"])
+        limit: Maximum rows to return (1-100, default: 20)
+    
+    Example: average salary of engineers hired after 2020 in Seattle ->
+        fields=["avg(salary)", "count(*)"], filters=[{"field": "department", "op": "=", "value": "Engineering"},
+        {"field": "hire_date", "op": ">", "value": "2020-12-31"}, {"field": "city", "op": "=", "value": "Seattle"}]
+    
+    Returns:
+        Result rows, column labels and whether rows were cut off at the limit
+    """
+    try:
+        shape, params = _query_shape(fields, filters, group_by, order_by)
+        sql, columns = _compile_query(shape)
+        limit = _page_size(limit)
+        
+        conn = _get_db()
+        deadline = time.monotonic() + QUERY_TIME_BUDGET
+        # Abort the statement once the budget is spent (checked every ~10k VM steps)
+        conn.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+        try:
+            rows = conn.execute(sql, (*params, limit + 1)).fetchall()
+        except sqlite3.OperationalError as e:
+            if "interrupt" in str(e):
+                return f"Error: Query exceeded the {QUERY_TIME_BUDGET:g}s time budget; add filters or aggregate"
+            raise
+        finally:
+            conn.set_progress_handler(None, 0)
+        
+        return json.dumps({
+            "columns": list(columns),
+            "row_count": min(len(rows), limit),
+            "truncated": len(rows) > limit,
+            "rows": [_row_to_dict(row) for row in rows[:limit]]
+        }, indent=2)
+    except ValueError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Database query error: {e}")
+        return f"Error: {str(e)}"
+
+
+async def _aget_all_employees(page_size: int = 10, page_token: str = "") -> str:
+    """Async variant of get_all_employees."""
+    return await asyncio.to_thread(get_all_employees.func, page_size, page_token)
+
+
+async def _aget_employee_by_id(employee_id: int) -> str:
+    """Async variant of get_employee_by_id."""
+    return await asyncio.to_thread(get_employee_by_id.func, employee_id)
+
+
+async def _asearch_employees(query: str, search_by: str = "name", page_size: int = 20, page_token: str = "") -> str:
+    """Async variant of search_employees."""
+    return await asyncio.to_thread(search_employees.func, query, search_by, page_size, page_token)
+
+
+async def _aget_department_stats() -> str:
+    """Async variant of get_department_stats."""
+    return await asyncio.to_thread(get_department_stats.func)
+
+
+async def _aquery_employees(
+    fields: Optional[list[str]] = None,
+    filters: Optional[list[dict]] = None,
+    group_by: Optional[list[str]] = None,
+    order_by: Optional[list[str]] = None,
+    limit: int = 20
+) -> str:
+    """Async variant of query_employees."""
+    return await asyncio.to_thread(query_employees.func, fields, filters, group_by, order_by, limit)
+
+
+# Register async implementations as tool coroutines
+get_all_employees.coroutine = _aget_all_employees
+get_employee_by_id.coroutine = _aget_employee_by_id
+search_employees.coroutine = _asearch_employees
+get_department_stats.coroutine = _aget_department_stats
+query_employees.coroutine = _aquery_employees
+
+
 DATABASE_TOOLS = [
     get_all_employees,
     get_employee_by_id,
     search_employees,
-    get_department_stats
+    get_department_stats,
+    query_employees
 ]
@@ -0,0 +1,213 @@
+"""
+HTTP Client - Shared Pooled httpx Client for All MCP Modules
+
+This module owns the single httpx.Client used by the weather, stock and news MCPs,
+plus an httpx.AsyncClient for their async tool variants. Reusing one client keeps
+TCP/TLS connections alive between tool calls instead of paying a fresh handshake
+on every request. `http_stream`/`ahttp_stream` expose the body incrementally so
+callers can stop reading early.
+
+Configuration (environment variables, all optional):
+- MCP_HTTP_TIMEOUT: Total request timeout in seconds (default: 10)
+- MCP_HTTP_CONNECT_TIMEOUT: Connect timeout in seconds (default: 5)
+- MCP_HTTP_MAX_CONNECTIONS: Max pooled connections overall (default: 100)
+- MCP_HTTP_MAX_KEEPALIVE: Max idle keep-alive connections (default: 20)
+- MCP_HTTP_MAX_PER_HOST: Max concurrent connections per upstream host (default: 10)
+- MCP_HTTP_KEEPALIVE_EXPIRY: Seconds an idle connection is kept open (default: 30)
+- MCP_HTTP2: Enable HTTP/2 when the `h2` package is installed (default: "true")
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Shared client (created lazily on first use)
+_http_client = None
+_client_lock = threading.Lock()
+
+# Per-host concurrency limits (host -> semaphore)
+_host_semaphores = {}
+
+# Shared async client (bound to the event loop it was created on)
+_async_client = None
+_async_client_loop = None
+_async_host_semaphores = {}
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment."""
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an int setting from the environment."""
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+def _http2_available() -> bool:
+    """Check whether HTTP/2 is requested and the optional `h2` package is installed."""
+    if os.getenv("MCP_HTTP2", "true").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_timeout() -> httpx.Timeout:
+    """Get the shared timeout settings for MCP requests."""
+    return httpx.Timeout(
+        _env_float("MCP_HTTP_TIMEOUT", 10.0),
+        connect=_env_float("MCP_HTTP_CONNECT_TIMEOUT", 5.0)
+    )
+
+
+def get_limits() -> httpx.Limits:
+    """Get the shared connection pool limits for MCP requests."""
+    return httpx.Limits(
+        max_connections=_env_int("MCP_HTTP_MAX_CONNECTIONS", 100),
+        max_keepalive_connections=_env_int("MCP_HTTP_MAX_KEEPALIVE", 20),
+        keepalive_expiry=_env_float("MCP_HTTP_KEEPALIVE_EXPIRY", 30.0)
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """Get or create the shared pooled HTTP client."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        with _client_lock:
+            if _http_client is None or _http_client.is_closed:
+                http2 = _http2_available()
+                transport = httpx.HTTPTransport(
+                    http2=http2,
+                    limits=get_limits(),
+                    retries=1
+                )
+                _http_client = httpx.Client(
+                    transport=transport,
+                    timeout=get_timeout(),
+                    follow_redirects=True
+                )
+                logger.info(f"Shared HTTP client created (http2={http2})")
+    return _http_client
+
+
+def _host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """Get the semaphore limiting concurrent requests to one upstream host."""
+    host = httpx.URL(url).host
+    if host not in _host_semaphores:
+        with _client_lock:
+            if host not in _host_semaphores:
+                _host_semaphores[host] = threading.BoundedSemaphore(_env_int("MCP_HTTP_MAX_PER_HOST", 10))
+    return _host_semaphores[host]
+
+
+def http_get(url: str, **kwargs) -> httpx.Response:
+    """
+    Send a GET request through the shared client.
+
+    Accepts the same keyword arguments as httpx.Client.get (params, headers, timeout, ...).
+    """
+    with _host_semaphore(url):
+        return get_http_client().get(url, **kwargs)
+
+
+@contextmanager
+def http_stream(url: str, **kwargs) -> Iterator[httpx.Response]:
+    """
+    Stream a GET response through the shared client (read it with `iter_bytes()`).
+
+    Leaving the block early closes the response without downloading the rest of the body.
+    """
+    with _host_semaphore(url):
+        with get_http_client().stream("GET", url, **kwargs) as response:
+            yield response
+
+
+def close_http_client() -> None:
+    """Close the shared HTTP client and release pooled connections."""
+    global _http_client
+    with _client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            logger.info("Shared HTTP client closed")
+        _http_client = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get or create the shared pooled async HTTP client for the running event loop."""
+    global _async_client, _async_client_loop, _async_host_semaphores
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client.is_closed or _async_client_loop is not loop:
+        if _async_client is not None and not _async_client.is_closed:
+            logger.warning("Event loop changed; creating a new async HTTP client")
+        http2 = _http2_available()
+        transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=get_limits(),
+            retries=1
+        )
+        _async_client = httpx.AsyncClient(
+            transport=transport,
+            timeout=get_timeout(),
+            follow_redirects=True
+        )
+        _async_client_loop = loop
+        _async_host_semaphores = {}
+        logger.info(f"Shared async HTTP client created (http2={http2})")
+    return _async_client
+
+
+async def ahttp_get(url: str, **kwargs) -> httpx.Response:
+    """
+    Send a GET request through the shared async client.
+
+    Accepts the same keyword arguments as httpx.AsyncClient.get (params, headers, timeout, ...).
+    """
+    client = get_async_http_client()
+    async with _async_host_semaphore(url):
+        return await client.get(url, **kwargs)
+
+
+@asynccontextmanager
+async def ahttp_stream(url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+    """Async variant of http_stream (read the body with `aiter_bytes()`)."""
+    client = get_async_http_client()
+    async with _async_host_semaphore(url):
+        async with client.stream("GET", url, **kwargs) as response:
+            yield response
+
+
+def _async_host_semaphore(url: str) -> asyncio.Semaphore:
+    """Get the semaphore limiting concurrent async requests to one upstream host."""
+    host = httpx.URL(url).host
+    if host not in _async_host_semaphores:
+        _async_host_semaphores[host] = asyncio.Semaphore(_env_int("MCP_HTTP_MAX_PER_HOST", 10))
+    return _async_host_semaphores[host]
+
+
+async def aclose_http_client() -> None:
+    """Close the shared sync and async HTTP clients."""
+    global _async_client, _async_client_loop
+    if _async_client is not None:
+        await _async_client.aclose()
+        logger.info("Shared async HTTP client closed")
+    _async_client = None
+    _async_client_loop = None
+    close_http_client()
@@ -0,0 +1,221 @@
+"""
+News Index - Cross-Feed Deduplication and Ranking of Recent Articles
+
+Keeps an in-memory index of recently seen articles so the same story
+syndicated by several sources (or returned by both headlines and search) is
+shown to the model once.
+
+- Titles are normalized (source suffix, case, punctuation, stopwords) into
+  word sets and fingerprinted with MinHash
+- Candidate stories are found through MinHash LSH band tables, so a lookup
+  touches only likely matches; a candidate is a near-duplicate when the word
+  sets' Jaccard similarity is >= `threshold` (or one title contains the other)
+- Each story cluster remembers every source that reported it across calls
+- Results are ranked by recency, number of reporting sources and source
+  diversity (repeat sources are penalized)
+- Memory is bounded: at most `maxsize` clusters, evicted LRU and after `ttl`
+  seconds without being seen
+"""
+
+import re
+import math
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 16
+ROWS_PER_BAND = 2
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD_RE = re.compile(r"[^\W_]+")
+_STOPWORDS = frozenset(
+    "a an the of in on at to for with and or by from as is are was were be been its it this that "
+    "after over amid into about than how what why who says said".split()
+)
+
+
+def _permutation(i: int) -> tuple:
+    digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "big") % _MERSENNE_PRIME | 1, int.from_bytes(digest[8:], "big") % _MERSENNE_PRIME
+
+
+# (a, b) of the hash permutations h -> (a*h + b) mod p
+_PERMUTATIONS = [_permutation(i) for i in range(NUM_PERM)]
+
+
+def normalize_title(title: str, source: Optional[str] = None) -> frozenset:
+    """Word set of a title without its trailing " - Source", case, punctuation and stopwords."""
+    if source and title.endswith(f" - {source}"):
+        title = title[:-len(source) - 3]
+    words = _WORD_RE.findall(title.lower())
+    return frozenset(w for w in words if w not in _STOPWORDS) or frozenset(words)
+
+
+def minhash(tokens: frozenset) -> tuple:
+    """MinHash signature (NUM_PERM values) of a word set."""
+    hashes = [int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "big") for t in tokens] or [0]
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def _bands(signature: tuple) -> list:
+    return [(i, signature[i:i + ROWS_PER_BAND]) for i in range(0, NUM_PERM, ROWS_PER_BAND)]
+
+
+def similarity(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity of two word sets; 1.0 when a title of 4+ words is contained in the other."""
+    if not a or not b:
+        return 1.0 if a == b else 0.0
+    overlap = len(a & b)
+    if overlap == min(len(a), len(b)) >= 4:
+        return 1.0
+    return overlap / len(a | b)
+
+
+class _Story:
+    """One cluster of near-duplicate articles."""
+
+    __slots__ = ("story_id", "tokens", "signature", "sources", "last_seen")
+
+    def __init__(self, story_id: int, tokens: frozenset, signature: tuple):
+        self.story_id = story_id
+        self.tokens = tokens
+        self.signature = signature
+        self.sources = []
+        self.last_seen = time.time()
+
+
+class NewsIndex:
+    """Bounded index of recent stories used to collapse and rank feed items."""
+
+    def __init__(
+        self,
+        maxsize: int = 2000,
+        ttl: float = 48 * 3600,
+        threshold: float = 0.6,
+        half_life_hours: float = 6.0
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self.half_life_hours = half_life_hours
+        self._stories = OrderedDict()  # story id -> _Story (LRU order)
+        self._bands = {}  # (band index, band values) -> set of story ids
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._collapsed = 0
+
+    def rank(self, items: list, limit: int) -> list:
+        """
+        Collapse near-duplicate items and return the top `limit` by recency and diversity.
+
+        Items are not modified; collapsed stories get an `also_reported_by` list.
+        """
+        now = time.time()
+        groups = OrderedDict()  # story id -> (story, [items])
+        with self._lock:
+            self._evict(now)
+            for item in items:
+                story = self._story_for(item, now)
+                groups.setdefault(story.story_id, (story, []))[1].append(item)
+            self._collapsed += len(items) - len(groups)
+            candidates = []
+            for position, (story, group) in enumerate(groups.values()):
+                best = max(group, key=self._timestamp)
+                candidates.append((self._score(best, len(story.sources), position, now), best, list(story.sources)))
+        return self._diversify(candidates, limit)
+
+    def _story_for(self, item: dict, now: float) -> _Story:
+        """Find the story cluster an item belongs to, creating it if new."""
+        source = item.get("source", "")
+        tokens = normalize_title(item.get("title", ""), source)
+        signature = minhash(tokens)
+        story = self._nearest(tokens, signature)
+        if story is None:
+            self._next_id += 1
+            story = _Story(self._next_id, tokens, signature)
+            self._stories[story.story_id] = story
+            for band in _bands(signature):
+                self._bands.setdefault(band, set()).add(story.story_id)
+            while len(self._stories) > self.maxsize:
+                self._remove(next(iter(self._stories)))
+        story.last_seen = now
+        self._stories.move_to_end(story.story_id)
+        if source and source not in story.sources:
+            story.sources.append(source)
+        return story
+
+    def _nearest(self, tokens: frozenset, signature: tuple) -> Optional[_Story]:
+        """Get the most similar stored story at or above the threshold, via the band tables."""
+        candidates = set()
+        for band in _bands(signature):
+            candidates.update(self._bands.get(band, ()))
+        best, best_similarity = None, self.threshold
+        for story_id in candidates:
+            story = self._stories[story_id]
+            score = similarity(tokens, story.tokens)
+            if score >= best_similarity:
+                best, best_similarity = story, score
+        return best
+
+    def _remove(self, story_id: int) -> None:
+        story = self._stories.pop(story_id, None)
+        if story is None:
+            return
+        for band in _bands(story.signature):
+            members = self._bands.get(band)
+            if members is not None:
+                members.discard(story_id)
+                if not members:
+                    del self._bands[band]
+
+    def _evict(self, now: float) -> None:
+        """Drop stories not seen for `ttl` seconds (oldest first)."""
+        while self._stories:
+            story_id, story = next(iter(self._stories.items()))
+            if now - story.last_seen <= self.ttl:
+                break
+            self._remove(story_id)
+
+    @staticmethod
+    def _timestamp(item: dict) -> float:
+        """Publication time of a formatted item ("YYYY-MM-DD HH:MM", UTC), 0 if unknown."""
+        try:
+            return datetime.strptime(item.get("published", ""), "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            return 0.0
+
+    def _score(self, item: dict, source_count: int, position: int, now: float) -> float:
+        """Recency decay, boosted by how many sources carry the story, with a mild feed-order prior."""
+        published = self._timestamp(item)
+        age_hours = max(0.0, (now - published) / 3600) if published else 24.0
+        recency = 0.5 ** (age_hours / self.half_life_hours)
+        coverage = 1 + 0.25 * math.log2(max(source_count, 1))
+        return recency * coverage / (1 + 0.05 * position)
+
+    @staticmethod
+    def _diversify(candidates: list, limit: int) -> list:
+        """Greedy pick by score, halving a candidate's score for each story already taken from its source."""
+        picked = []
+        source_counts = {}
+        remaining = list(candidates)
+        while remaining and len(picked) < limit:
+            best = max(remaining, key=lambda c: c[0] * 0.5 ** source_counts.get(c[1].get("source"), 0))
+            remaining.remove(best)
+            _, item, sources = best
+            source_counts[item.get("source")] = source_counts.get(item.get("source"), 0) + 1
+            others = [s for s in sources if s != item.get("source")]
+            picked.append({**item, "also_reported_by": others[:5]} if others else item)
+        return picked
+
+    def stats(self) -> dict:
+        """Get the number of indexed stories and collapsed duplicates."""
+        with self._lock:
+            return {"stories": len(self._stories), "maxsize": self.maxsize, "collapsed": self._collapsed}
+
+    def __len__(self) -> int:
+        return len(self._stories)
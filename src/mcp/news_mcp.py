@@ -9,17 +9,34 @@ Tools:
 - search_news: Search for news articles by keyword/topic
 - get_news_sources: Get list of news source recommendations
 
+Every tool also has an async implementation (httpx.AsyncClient) registered as
+its coroutine, so `tool.ainvoke(...)` never blocks the event loop.
+
+Feeds are parsed incrementally while the body streams in; reading stops as soon
+as enough items have been parsed. Parsed feeds are cached per (url, params):
+repeats within a short hard TTL are served locally, later ones are revalidated
+with a conditional GET (ETag / Last-Modified), and a 304 reuses the cached parse.
+
+Near-duplicate stories (the same story syndicated by several sources, across
+feeds and calls) are collapsed by a MinHash index and the remaining articles
+are ranked by recency and source diversity.
+
 Note: Uses Google News RSS feeds - completely free, no API key needed.
 """
 
+import os
 import json
+import time
 import logging
-import httpx
-import re
 import urllib.parse
 from datetime import datetime
+from xml.etree import ElementTree
 from langchain_core.tools import tool
 
+from .cache import TTLCache, RequestCoalescer
+from .news_index import NewsIndex
+from .http_client import http_stream, ahttp_stream
+
 logger = logging.getLogger(__name__)
 
 # User-Agent header
@@ -42,48 +59,247 @@ TOPIC_CODES = {
     "nation": "CAAqIggKIhxDQkFTRHdvSkwyMHZNRGxqTjNjd0VnSmxiaWdBUAE",
 }
 
+# Items parsed (and cached) per feed, leaving room for collapsed duplicates
+FEED_MAX_ITEMS = 20
+
+# Articles returned per tool call
+MAX_RESULTS = 10
 
-def _parse_rss_items(xml_text: str, max_items: int = 5) -> list:
-    """Parse RSS XML and extract news items."""
-    items = []
-    
-    # Find all items in RSS
-    item_matches = re.findall(r'<item>(.*?)</item>', xml_text, re.DOTALL)
-    
-    for item_xml in item_matches[:max_items]:
-        title_match = re.search(r'<title><!\[CDATA\[(.*?)\]\]></title>|<title>(.*?)</title>', item_xml)
-        link_match = re.search(r'<link>(.*?)</link>', item_xml)
-        pub_date_match = re.search(r'<pubDate>(.*?)</pubDate>', item_xml)
-        source_match = re.search(r'<source.*?>(.*?)</source>', item_xml)
-        
-        title = ""
-        if title_match:
-            title = title_match.group(1) or title_match.group(2) or ""
-            # Clean up HTML entities
-            title = title.replace('&amp;', '&').replace('&quot;', '"').replace('&#39;', "'")
-        
-        link = link_match.group(1) if link_match else ""
-        pub_date = pub_date_match.group(1) if pub_date_match else ""
-        source = source_match.group(1) if source_match else "Google News"
-        
-        if title:
-            # Format the publication date
-            try:
-                dt = datetime.strptime(pub_date, "%a, %d %b %Y %H:%M:%S %Z")
-                formatted_date = dt.strftime("%Y-%m-%d %H:%M")
-            except:
-                formatted_date = pub_date[:16] if pub_date else "N/A"
-            
-            items.append({
-                "title": title,
-                "source": source,
-                "published": formatted_date,
-                "url": link
-            })
+# Feed cache: served without any request for FRESH_TTL seconds, then revalidated
+# with a conditional GET while the entry lives (CACHE_TTL)
+FEED_FRESH_TTL = float(os.getenv("NEWS_FEED_FRESH_TTL", "60"))
+_feed_cache = TTLCache(
+    "news_feeds",
+    maxsize=int(os.getenv("NEWS_FEED_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("NEWS_FEED_CACHE_TTL", "3600"))
+)
+_coalescer = RequestCoalescer()
+# Fresh entries served locally, feed requests sent (full or conditional), and 304s among them
+_fresh_hits = 0
+_feed_misses = 0
+_not_modified = 0
+
+# Recently seen stories, shared by all feeds
+_news_index = NewsIndex(
+    maxsize=int(os.getenv("NEWS_INDEX_SIZE", "2000")),
+    ttl=float(os.getenv("NEWS_INDEX_TTL", str(48 * 3600)))
+)
+
+
+class RSSItemParser:
+    """Incremental RSS parser: feed bytes as they arrive, stop once enough items are parsed."""
+    
+    def __init__(self, max_items: int = 5):
+        self.max_items = max_items
+        self.items = []
+        self._parser = ElementTree.XMLPullParser(events=("end",))
+    
+    @property
+    def done(self) -> bool:
+        return len(self.items) >= self.max_items
     
+    def feed(self, chunk) -> bool:
+        """Parse a chunk of the feed; returns True once `max_items` items are collected."""
+        self._parser.feed(chunk)
+        return self._read_items()
+    
+    def close(self) -> None:
+        """End of input; raises ElementTree.ParseError if the document was cut off."""
+        self._parser.close()
+        self._read_items()
+    
+    def _read_items(self) -> bool:
+        for _, elem in self._parser.read_events():
+            if elem.tag == "item":
+                item = _rss_item(elem)
+                # Drop the parsed subtree so memory stays flat on large feeds
+                elem.clear()
+                if item:
+                    self.items.append(item)
+                    if self.done:
+                        return True
+        return False
+
+
+def _rss_item(elem) -> dict:
+    """Extract one news item from an <item> element (entities are decoded by the XML parser)."""
+    title = (elem.findtext("title") or "").strip()
+    if not title:
+        return {}
+    pub_date = (elem.findtext("pubDate") or "").strip()
+    
+    # Format the publication date
+    try:
+        dt = datetime.strptime(pub_date, "%a, %d %b %Y %H:%M:%S %Z")
+        formatted_date = dt.strftime("%Y-%m-%d %H:%M")
+    except ValueError:
+        formatted_date = pub_date[:16] if pub_date else "N/A"
+    
+    return {
+        "title": title,
+        "source": (elem.findtext("source") or "").strip() or "Google News",
+        "published": formatted_date,
+        "url": (elem.findtext("link") or "").strip()
+    }
+
+
+def _parse_rss_items(xml_text, max_items: int = 5) -> list:
+    """Parse RSS XML (str or bytes) and extract up to `max_items` news items."""
+    parser = RSSItemParser(max_items)
+    try:
+        if not parser.feed(xml_text):
+            parser.close()
+    except ElementTree.ParseError as e:
+        logger.warning(f"RSS parse error after {len(parser.items)} items: {e}")
+    return parser.items
+
+
+def _feed_key(url: str, params: dict) -> str:
+    return f"{url}?{urllib.parse.urlencode(sorted(params.items()))}"
+
+
+def _cached_feed(key: str):
+    """Get a cached feed entry that can be served without revalidating, or None."""
+    global _fresh_hits, _feed_misses
+    entry = _feed_cache.peek(key)
+    if entry is not None and entry["fresh_until"] > time.time():
+        _fresh_hits += 1
+        return _feed_cache.get(key)
+    _feed_misses += 1
+    return None
+
+
+def _conditional_headers(entry) -> dict:
+    """Request headers, with validators from a cached entry (if any)."""
+    headers = dict(HEADERS)
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _store_feed(key: str, response, items: list = None, entry: dict = None, complete: bool = True) -> list:
+    """Cache freshly parsed items (or refresh `entry` after a 304) and return the items."""
+    global _not_modified
+    if items is None:
+        # 304 Not Modified: keep the cached parse and validators
+        _not_modified += 1
+        items = entry["items"]
+    elif not items or not complete:
+        # Caching an empty or truncated parse with its validators would pin it behind 304s
+        logger.warning(f"Not caching feed {key}: {len(items)} items, complete={complete}")
+        return items
+    else:
+        entry = {
+            "items": items,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        }
+    entry["fresh_until"] = time.time() + FEED_FRESH_TTL
+    _feed_cache.set(key, entry)
     return items
 
 
+def _fetch_rss_items(url: str, params: dict) -> tuple:
+    """Get a feed's items (cached, revalidated or streamed); returns (status_code, items)."""
+    key = _feed_key(url, params)
+    entry = _cached_feed(key)
+    if entry is not None:
+        return 200, entry["items"]
+    return _coalescer.run(key, lambda: _download_rss_items(key, url, params))
+
+
+def _download_rss_items(key: str, url: str, params: dict) -> tuple:
+    """Stream a feed and parse it until FEED_MAX_ITEMS items are found."""
+    parser = RSSItemParser(FEED_MAX_ITEMS)
+    entry = _feed_cache.peek(key)
+    with http_stream(url, params=params, headers=_conditional_headers(entry)) as response:
+        if response.status_code == 304 and entry is not None:
+            return 200, _store_feed(key, response, entry=entry)
+        if response.status_code != 200:
+            return response.status_code, []
+        complete = True
+        try:
+            for chunk in response.iter_bytes():
+                if parser.feed(chunk):
+                    break
+            else:
+                # The whole body arrived: a document cut off between elements fails here
+                parser.close()
+        except ElementTree.ParseError as e:
+            logger.warning(f"RSS parse error after {len(parser.items)} items: {e}")
+            complete = False
+    return 200, _store_feed(key, response, parser.items, complete=complete)
+
+
+async def _afetch_rss_items(url: str, params: dict) -> tuple:
+    """Async variant of _fetch_rss_items."""
+    key = _feed_key(url, params)
+    entry = _cached_feed(key)
+    if entry is not None:
+        return 200, entry["items"]
+    return await _coalescer.arun(key, lambda: _adownload_rss_items(key, url, params))
+
+
+async def _adownload_rss_items(key: str, url: str, params: dict) -> tuple:
+    """Async variant of _download_rss_items."""
+    parser = RSSItemParser(FEED_MAX_ITEMS)
+    entry = _feed_cache.peek(key)
+    async with ahttp_stream(url, params=params, headers=_conditional_headers(entry)) as response:
+        if response.status_code == 304 and entry is not None:
+            return 200, _store_feed(key, response, entry=entry)
+        if response.status_code != 200:
+            return response.status_code, []
+        complete = True
+        try:
+            async for chunk in response.aiter_bytes():
+                if parser.feed(chunk):
+                    break
+            else:
+                parser.close()
+        except ElementTree.ParseError as e:
+            logger.warning(f"RSS parse error after {len(parser.items)} items: {e}")
+            complete = False
+    return 200, _store_feed(key, response, parser.items, complete=complete)
+
+
+def _refresh_feed(url: str, params: dict) -> int:
+    """Revalidate one feed in the cache (no ranking or indexing); returns the HTTP status."""
+    key = _feed_key(url, params)
+    status, _ = _coalescer.run(key, lambda: _download_rss_items(key, url, params))
+    return status
+
+
+# Background refreshers for the feed behind each news tool call, keyed by tool name
+FEED_REFRESHERS = {
+    "get_top_headlines": lambda args: _refresh_feed(
+        *_headlines_request(args.get("category", "general"), args.get("country", "US"))
+    ),
+    "search_news": lambda args: _refresh_feed(*_search_request(args["query"])),
+}
+
+
+def get_news_cache_stats() -> dict:
+    """Get hit/miss counters for the news feed cache."""
+    stats = _feed_cache.stats()
+    # A stale entry that had to be revalidated is a miss, even when the answer was a 304
+    lookups = _fresh_hits + _feed_misses
+    stats["hits"] = _fresh_hits
+    stats["misses"] = _feed_misses
+    stats["hit_rate"] = round(_fresh_hits / lookups, 4) if lookups else 0.0
+    stats["not_modified"] = _not_modified
+    stats["coalesced"] = _coalescer.coalesced
+    stats["index"] = _news_index.stats()
+    return stats
+
+
+def _rank(items: list, max_results: int) -> list:
+    """Collapse near-duplicates and keep the top 1..MAX_RESULTS articles."""
+    return _news_index.rank(items, max(1, min(max_results, MAX_RESULTS)))
+
+
 @tool
 def get_top_headlines(
     category: str = "general",
@@ -103,39 +319,61 @@ def get_top_headlines(
         Top news headlines with titles, sources, and publication times
     """
     try:
-        category_lower = category.lower()
-        
-        # Build URL based on category
-        if category_lower == "general" or category_lower not in TOPIC_CODES:
-            # For general news, use the base RSS feed
-            url = GOOGLE_NEWS_RSS_BASE
-        else:
-            # Use the topic code for specific categories
-            topic_code = TOPIC_CODES[category_lower]
-            url = f"{GOOGLE_NEWS_RSS_BASE}/topics/{topic_code}"
-        
-        # Add language/country parameters
-        params = {"hl": "en", "gl": country.upper(), "ceid": f"{country.upper()}:en"}
-        
-        response = httpx.get(url, params=params, headers=HEADERS, timeout=10.0, follow_redirects=True)
-        
-        if response.status_code == 200:
-            items = _parse_rss_items(response.text, min(max_results, 10))
-            
-            return json.dumps({
-                "category": category,
-                "country": country.upper(),
-                "source": "Google News RSS (Free, No API Key)",
-                "article_count": len(items),
-                "articles": items
-            }, indent=2)
-        else:
-            return f"Error: Unable to fetch headlines (status: {response.status_code})"
+        url, params = _headlines_request(category, country)
+        status, items = _fetch_rss_items(url, params)
+        return _format_headlines(status, _rank(items, max_results), category, country)
     except Exception as e:
         logger.error(f"Top headlines error: {e}")
         return f"Error fetching headlines: {str(e)}"
 
 
+async def _aget_top_headlines(
+    category: str = "general",
+    country: str = "US",
+    max_results: int = 5
+) -> str:
+    """Async variant of get_top_headlines."""
+    try:
+        url, params = _headlines_request(category, country)
+        status, items = await _afetch_rss_items(url, params)
+        return _format_headlines(status, _rank(items, max_results), category, country)
+    except Exception as e:
+        logger.error(f"Top headlines error: {e}")
+        return f"Error fetching headlines: {str(e)}"
+
+
+def _headlines_request(category: str, country: str) -> tuple:
+    """Build the (url, params) pair for a top-headlines feed."""
+    category_lower = category.lower()
+    
+    # Build URL based on category
+    if category_lower == "general" or category_lower not in TOPIC_CODES:
+        # For general news, use the base RSS feed
+        url = GOOGLE_NEWS_RSS_BASE
+    else:
+        # Use the topic code for specific categories
+        topic_code = TOPIC_CODES[category_lower]
+        url = f"{GOOGLE_NEWS_RSS_BASE}/topics/{topic_code}"
+    
+    # Add language/country parameters
+    params = {"hl": "en", "gl": country.upper(), "ceid": f"{country.upper()}:en"}
+    return url, params
+
+
+def _format_headlines(status: int, items: list, category: str, country: str) -> str:
+    """Format parsed top-headlines feed items for the model."""
+    if status == 200:
+        return json.dumps({
+            "category": category,
+            "country": country.upper(),
+            "source": "Google News RSS (Free, No API Key)",
+            "article_count": len(items),
+            "articles": items
+        }, indent=2)
+    else:
+        return f"Error: Unable to fetch headlines (status: {status})"
+
+
 @tool
 def search_news(
     query: str,
@@ -152,27 +390,45 @@ def search_news(
         News articles matching the search query
     """
     try:
-        url = f"{GOOGLE_NEWS_RSS_BASE}/search"
-        params = {"q": query, "hl": "en", "gl": "US", "ceid": "US:en"}
-        
-        response = httpx.get(url, params=params, headers=HEADERS, timeout=10.0, follow_redirects=True)
-        
-        if response.status_code == 200:
-            items = _parse_rss_items(response.text, min(max_results, 10))
-            
-            return json.dumps({
-                "query": query,
-                "source": "Google News RSS (Free, No API Key)",
-                "article_count": len(items),
-                "articles": items
-            }, indent=2)
-        else:
-            return f"Error: Unable to search news (status: {response.status_code})"
+        url, params = _search_request(query)
+        status, items = _fetch_rss_items(url, params)
+        return _format_search(status, _rank(items, max_results), query)
+    except Exception as e:
+        logger.error(f"News search error: {e}")
+        return f"Error searching news: {str(e)}"
+
+
+async def _asearch_news(query: str, max_results: int = 5) -> str:
+    """Async variant of search_news."""
+    try:
+        url, params = _search_request(query)
+        status, items = await _afetch_rss_items(url, params)
+        return _format_search(status, _rank(items, max_results), query)
     except Exception as e:
         logger.error(f"News search error: {e}")
         return f"Error searching news: {str(e)}"
 
 
+def _search_request(query: str) -> tuple:
+    """Build the (url, params) pair for a news search feed."""
+    url = f"{GOOGLE_NEWS_RSS_BASE}/search"
+    params = {"q": query, "hl": "en", "gl": "US", "ceid": "US:en"}
+    return url, params
+
+
+def _format_search(status: int, items: list, query: str) -> str:
+    """Format parsed news search feed items for the model."""
+    if status == 200:
+        return json.dumps({
+            "query": query,
+            "source": "Google News RSS (Free, No API Key)",
+            "article_count": len(items),
+            "articles": items
+        }, indent=2)
+    else:
+        return f"Error: Unable to search news (status: {status})"
+
+
 @tool
 def get_news_sources(category: str = "general") -> str:
     """
@@ -244,6 +500,16 @@ def get_news_sources(category: str = "general") -> str:
     }, indent=2)
 
 
+async def _aget_news_sources(category: str = "general") -> str:
+    """Async variant of get_news_sources (no I/O, static list)."""
+    return get_news_sources.func(category)
+
+
+# Register async implementations as tool coroutines
+get_top_headlines.coroutine = _aget_top_headlines
+search_news.coroutine = _asearch_news
+get_news_sources.coroutine = _aget_news_sources
+
 # Export all news tools
 NEWS_TOOLS = [
     get_top_headlines,
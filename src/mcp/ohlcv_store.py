@@ -0,0 +1,167 @@
+"""
+OHLCV Store - Local Append-Only Daily Bar Store for Stock History
+
+Keeps daily OHLCV bars per ticker in a SQLite file so repeated history
+requests are answered from disk. Only the missing tail since the last stored
+bar is fetched upstream (or only the older bars, when a longer period is asked
+for than is stored yet).
+
+- `plan(ticker, period)`: chart request params still needed, or None if local data is fresh
+- `save(...)`: append fetched bars (the last, possibly partial, bar is replaced)
+- `read(ticker, period)`: bars for a period as a PriceSeries
+
+When an overlapping completed bar comes back with a different close (prices
+were re-adjusted, e.g. after a split), the ticker's bars are dropped and the
+next plan refetches the full range.
+"""
+
+import time
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .price_analytics import PriceSeries
+
+logger = logging.getLogger(__name__)
+
+# Calendar days per Yahoo range; "1d"/"5d" mean trading days and are read as bar counts
+PERIOD_DAYS = {"1d": 10, "5d": 10, "1mo": 31, "3mo": 92, "6mo": 183, "1y": 366, "2y": 731, "5y": 1827, "10y": 3653}
+PERIOD_BARS = {"1d": 1, "5d": 5}
+SUPPORTED_PERIODS = list(PERIOD_DAYS) + ["ytd", "max"]
+
+# Relative close difference on an overlapping bar that means history was re-adjusted
+ADJUSTMENT_TOLERANCE = 0.005
+
+
+def period_start(period: str, now: Optional[float] = None) -> int:
+    """Earliest timestamp needed to answer `period`."""
+    now = time.time() if now is None else now
+    if period == "max":
+        return 0
+    if period == "ytd":
+        return int(datetime(datetime.fromtimestamp(now).year, 1, 1).timestamp())
+    if period not in PERIOD_DAYS:
+        raise ValueError(f"Unsupported period '{period}'. Use one of: {', '.join(SUPPORTED_PERIODS)}")
+    return int(now - PERIOD_DAYS[period] * 86400)
+
+
+class OHLCVStore:
+    """SQLite-backed daily bar store with incremental tail refresh."""
+
+    def __init__(self, path: str, refresh_interval: float = 3600.0):
+        """
+        Args:
+            path: SQLite file (":memory:" for a process-local store)
+            refresh_interval: Seconds before a ticker's tail is fetched again
+        """
+        self.refresh_interval = refresh_interval
+        if path != ":memory:":
+            Path(path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+            path = str(Path(path).expanduser())
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS bars (
+                    ticker TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    open REAL, high REAL, low REAL, close REAL NOT NULL, volume INTEGER,
+                    PRIMARY KEY (ticker, ts)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS coverage (
+                    ticker TEXT PRIMARY KEY,
+                    first_ts INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL
+                );
+            """)
+
+    def plan(self, ticker: str, period: str, force: bool = False) -> tuple:
+        """
+        Decide what still has to be fetched for `period` (`force` refreshes the tail even if fresh).
+
+        Returns:
+            (params, anchor) - chart request params (None when local data is fresh) and the
+            (ts, close) of a stored completed bar the fetch overlaps, used to detect re-adjustment
+        """
+        now = time.time()
+        start = period_start(period, now)
+        with self._lock:
+            coverage = self._db.execute(
+                "SELECT first_ts, fetched_at FROM coverage WHERE ticker = ?", (ticker,)
+            ).fetchone()
+            if coverage is None:
+                return {"period1": start, "period2": int(now), "interval": "1d"}, None
+            if coverage[0] > start:
+                # Backfill only the older bars that are missing
+                return {"period1": start, "period2": coverage[0], "interval": "1d"}, None
+            if not force and now - coverage[1] < self.refresh_interval:
+                return None, None
+            # Refetch from the last completed bar: the newest bar may still be forming
+            tail = self._db.execute(
+                "SELECT ts, close FROM bars WHERE ticker = ? ORDER BY ts DESC LIMIT 2", (ticker,)
+            ).fetchall()
+        if not tail:
+            return {"period1": start, "period2": int(now), "interval": "1d"}, None
+        anchor = tail[-1]
+        return {"period1": anchor[0], "period2": int(now), "interval": "1d"}, anchor
+
+    def save(self, ticker: str, params: dict, series: PriceSeries, anchor: Optional[tuple] = None) -> bool:
+        """
+        Store fetched bars for the range requested with `params`.
+
+        Returns:
+            False if the overlapping bar no longer matches (history was re-adjusted and
+            the ticker was dropped, so the caller should plan again), True otherwise
+        """
+        rows = list(zip(series.timestamps, series.open, series.high, series.low, series.close, series.volume))
+        with self._lock, self._db:
+            if anchor is not None:
+                fetched = dict(zip(series.timestamps, series.close))
+                close = fetched.get(anchor[0])
+                if close is not None and abs(close - anchor[1]) > ADJUSTMENT_TOLERANCE * abs(anchor[1]):
+                    logger.info(f"OHLCV store: {ticker} history re-adjusted, dropping stored bars")
+                    self._db.execute("DELETE FROM bars WHERE ticker = ?", (ticker,))
+                    self._db.execute("DELETE FROM coverage WHERE ticker = ?", (ticker,))
+                    return False
+            self._db.executemany(
+                "INSERT OR REPLACE INTO bars (ticker, ts, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(ticker, *row) for row in rows]
+            )
+            # A backfill of older bars does not refresh the tail
+            self._db.execute(
+                "INSERT INTO coverage (ticker, first_ts, fetched_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(ticker) DO UPDATE SET first_ts = MIN(first_ts, excluded.first_ts), "
+                "fetched_at = CASE WHEN first_ts = ? THEN fetched_at ELSE excluded.fetched_at END",
+                (ticker, params["period1"], time.time(), params["period2"])
+            )
+        logger.info(f"OHLCV store: saved {len(rows)} bars for {ticker}")
+        return True
+
+    def read(self, ticker: str, period: str) -> PriceSeries:
+        """Get the stored bars covering `period`, oldest first."""
+        start = period_start(period)
+        with self._lock:
+            if period in PERIOD_BARS:
+                rows = self._db.execute(
+                    "SELECT ts, open, high, low, close, volume FROM bars "
+                    "WHERE ticker = ? AND ts >= ? ORDER BY ts DESC LIMIT ?",
+                    (ticker, start, PERIOD_BARS[period])
+                ).fetchall()
+                rows.reverse()
+            else:
+                rows = self._db.execute(
+                    "SELECT ts, open, high, low, close, volume FROM bars "
+                    "WHERE ticker = ? AND ts >= ? ORDER BY ts",
+                    (ticker, start)
+                ).fetchall()
+        return PriceSeries.from_rows(rows)
+
+    def close(self) -> None:
+        """Close the SQLite file."""
+        with self._lock:
+            self._db.close()
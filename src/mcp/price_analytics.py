@@ -0,0 +1,151 @@
+"""
+Price Analytics - Columnar OHLCV Series and Summary Statistics
+
+Holds daily price history as typed columns (stdlib `array`) and computes the
+statistics the stock tools send to the model, over the whole range in a single
+pass instead of formatting and re-parsing every row:
+
+- Period return, first/last close
+- Annualized volatility of daily log returns
+- Max drawdown (peak and trough dates)
+- Period high/low (with dates)
+- Simple moving averages (20/50/200 days, when the range is long enough)
+- A downsampled close series for context
+"""
+
+import math
+from array import array
+from datetime import datetime
+
+TRADING_DAYS_PER_YEAR = 252
+SMA_WINDOWS = (20, 50, 200)
+
+
+class PriceSeries:
+    """Daily OHLCV bars stored column-wise."""
+
+    def __init__(self):
+        self.timestamps = array('q')
+        self.open = array('d')
+        self.high = array('d')
+        self.low = array('d')
+        self.close = array('d')
+        self.volume = array('q')
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def append(self, ts: int, open_: float, high: float, low: float, close: float, volume: int) -> None:
+        """Append one bar (missing OHLV values default to the close / 0)."""
+        self.timestamps.append(int(ts))
+        self.open.append(open_ if open_ is not None else close)
+        self.high.append(high if high is not None else close)
+        self.low.append(low if low is not None else close)
+        self.close.append(close)
+        self.volume.append(int(volume or 0))
+
+    @classmethod
+    def from_chart(cls, result: dict) -> "PriceSeries":
+        """Build a series from a Yahoo chart result, skipping bars without a close."""
+        series = cls()
+        quotes = result['indicators']['quote'][0]
+        columns = zip(
+            result.get('timestamp') or [],
+            quotes.get('open') or [], quotes.get('high') or [], quotes.get('low') or [],
+            quotes.get('close') or [], quotes.get('volume') or []
+        )
+        for ts, open_, high, low, close, volume in columns:
+            if close is not None:
+                series.append(ts, open_, high, low, close, volume)
+        return series
+
+    @classmethod
+    def from_rows(cls, rows) -> "PriceSeries":
+        """Build a series from (ts, open, high, low, close, volume) tuples."""
+        series = cls()
+        for row in rows:
+            series.append(*row)
+        return series
+
+
+def _date(ts: int) -> str:
+    return datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
+
+
+def summarize(series: PriceSeries) -> dict:
+    """Compute return, volatility, drawdown, high/low and SMAs over the full series."""
+    n = len(series)
+    if not n:
+        return {}
+
+    close = series.close
+    high_i = low_i = 0
+    peak_i = dd_peak_i = dd_trough_i = 0
+    max_drawdown = 0.0
+    # Welford running mean/variance of daily log returns
+    count, mean, m2 = 0, 0.0, 0.0
+    volume_sum = 0
+
+    for i in range(n):
+        price = close[i]
+        if series.high[i] > series.high[high_i]:
+            high_i = i
+        if series.low[i] < series.low[low_i]:
+            low_i = i
+        if price > close[peak_i]:
+            peak_i = i
+        drawdown = price / close[peak_i] - 1 if close[peak_i] else 0.0
+        if drawdown < max_drawdown:
+            max_drawdown, dd_peak_i, dd_trough_i = drawdown, peak_i, i
+        if i and close[i - 1] > 0 and price > 0:
+            count += 1
+            r = math.log(price / close[i - 1])
+            delta = r - mean
+            mean += delta / count
+            m2 += delta * (r - mean)
+        volume_sum += series.volume[i]
+
+    volatility = math.sqrt(m2 / (count - 1)) * math.sqrt(TRADING_DAYS_PER_YEAR) if count > 1 else 0.0
+    period_return = (close[-1] / close[0] - 1) * 100 if close[0] else 0.0
+
+    summary = {
+        "start": _date(series.timestamps[0]),
+        "end": _date(series.timestamps[-1]),
+        "first_close": f"${close[0]:.2f}",
+        "last_close": f"${close[-1]:.2f}",
+        "period_return": f"{period_return:+.2f}%",
+        "annualized_volatility": f"{volatility * 100:.2f}%",
+        "max_drawdown": f"{max_drawdown * 100:.2f}%",
+        "max_drawdown_window": f"{_date(series.timestamps[dd_peak_i])} -> {_date(series.timestamps[dd_trough_i])}",
+        "high": f"${series.high[high_i]:.2f} ({_date(series.timestamps[high_i])})",
+        "low": f"${series.low[low_i]:.2f} ({_date(series.timestamps[low_i])})",
+        "avg_volume": f"{volume_sum // n:,}"
+    }
+    for window in SMA_WINDOWS:
+        if n >= window:
+            summary[f"sma_{window}"] = f"${math.fsum(close[n - window:]) / window:.2f}"
+    return summary
+
+
+def downsample(series: PriceSeries, max_points: int = 20) -> list:
+    """Pick up to `max_points` evenly spaced closes (always including the first and last bar)."""
+    n = len(series)
+    max_points = max(max_points, 2)
+    if n <= max_points:
+        indices = range(n)
+    else:
+        step = (n - 1) / (max_points - 1)
+        indices = sorted({round(k * step) for k in range(max_points)})
+    return [f"{_date(series.timestamps[i])}: ${series.close[i]:.2f}" for i in indices]
+
+
+def latest_bar(series: PriceSeries) -> dict:
+    """Full OHLCV for the most recent bar."""
+    return {
+        "date": _date(series.timestamps[-1]),
+        "open": f"${series.open[-1]:.2f}",
+        "high": f"${series.high[-1]:.2f}",
+        "low": f"${series.low[-1]:.2f}",
+        "close": f"${series.close[-1]:.2f}",
+        "volume": f"{series.volume[-1]:,}"
+    }
@@ -6,18 +6,38 @@ Uses public Yahoo Finance endpoints that require NO API key.
 
 Tools:
 - get_stock_quote: Get real-time stock price by ticker symbol
-- get_stock_history: Get historical price data by ticker symbol
+- get_stock_quotes: Get quotes for several tickers in one batched request
+- get_stock_history: Get price history analytics (return, volatility, drawdown, SMAs) by ticker symbol
 - get_company_info: Get company profile and financials by ticker symbol
 
+Every tool also has an async implementation (httpx.AsyncClient) registered as
+its coroutine, so `tool.ainvoke(...)` never blocks the event loop.
+
+Responses are cached with per-endpoint freshness (quotes: seconds while the
+market is open, minutes when closed; daily history: hours; company info: a day)
+and concurrent identical lookups share a single upstream request. Daily bars are
+kept in a local OHLCV store (in memory, or the STOCK_HISTORY_DB file), so
+history requests only fetch the missing tail.
+
 Note: Uses unofficial public endpoints. No API key needed.
 """
 
+import os
 import json
+import time
+import asyncio
 import logging
-import httpx
-from datetime import datetime
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Union
 from langchain_core.tools import tool
 
+from .cache import TTLCache, RequestCoalescer, MISSING, is_refreshing
+from .http_client import http_get, ahttp_get
+from .price_analytics import PriceSeries, summarize, downsample, latest_bar
+from .ohlcv_store import OHLCVStore
+
 logger = logging.getLogger(__name__)
 
 # User-Agent header to avoid blocks
@@ -25,6 +45,147 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 }
 
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart"
+QUOTE_SUMMARY_URL = "https://query1.finance.yahoo.com/v10/finance/quoteSummary"
+SPARK_URL = "https://query1.finance.yahoo.com/v7/finance/spark"
+
+# Batch quotes: symbols per request, and parallel single-quote fallbacks
+MAX_BATCH_TICKERS = 20
+BATCH_FALLBACK_WORKERS = 4
+
+# Closes included in the downsampled history series sent to the model
+HISTORY_MAX_POINTS = int(os.getenv("STOCK_HISTORY_MAX_POINTS", "20"))
+
+# Freshness per endpoint, in seconds
+QUOTE_TTL_OPEN = float(os.getenv("STOCK_QUOTE_TTL_OPEN", "15"))
+QUOTE_TTL_CLOSED = float(os.getenv("STOCK_QUOTE_TTL_CLOSED", "600"))
+HISTORY_TTL = float(os.getenv("STOCK_HISTORY_TTL", str(3600)))
+COMPANY_INFO_TTL = float(os.getenv("STOCK_COMPANY_INFO_TTL", str(24 * 3600)))
+
+# Formatted tool results keyed by endpoint + ticker (+ period)
+_stock_cache = TTLCache("stock", maxsize=int(os.getenv("STOCK_CACHE_SIZE", "512")), refreshable=True)
+_coalescer = RequestCoalescer()
+
+# Local daily bar store (process-local unless STOCK_HISTORY_DB names a file)
+HISTORY_DB_PATH = os.getenv("STOCK_HISTORY_DB", ":memory:")
+_history_store = None
+_history_store_lock = threading.Lock()
+
+
+def _get_history_store() -> OHLCVStore:
+    """Get the shared OHLCV store, opening it on first use."""
+    global _history_store
+    if _history_store is None:
+        with _history_store_lock:
+            if _history_store is None:
+                _history_store = OHLCVStore(HISTORY_DB_PATH, refresh_interval=HISTORY_TTL)
+    return _history_store
+
+
+def close_history_store() -> None:
+    """Close the OHLCV store (reopened on next use)."""
+    global _history_store
+    with _history_store_lock:
+        if _history_store is not None:
+            _history_store.close()
+            _history_store = None
+
+
+def _quote_ttl(response) -> float:
+    """Quote freshness: short during regular trading hours, longer otherwise."""
+    return _market_ttl(response.json()['chart']['result'][0]['meta'])
+
+
+def _market_ttl(meta: dict) -> float:
+    """Quote freshness for chart metadata, based on the market state."""
+    state = meta.get('marketState')
+    if state is None:
+        regular = meta.get('currentTradingPeriod', {}).get('regular', {})
+        state = "REGULAR" if regular.get('start', 0) <= time.time() < regular.get('end', 0) else "CLOSED"
+    return QUOTE_TTL_OPEN if state == "REGULAR" else QUOTE_TTL_CLOSED
+
+
+def _cached_get(
+    key: str,
+    url: str,
+    params: Optional[dict],
+    formatter: Callable,
+    ttl: Union[float, Callable]
+) -> str:
+    """Return a cached tool result, or fetch and format it once for all concurrent callers."""
+    cached = _stock_cache.get(key, MISSING)
+    if cached is not MISSING:
+        return cached
+    
+    def load():
+        response = http_get(url, params=params, headers=HEADERS)
+        return _store(key, response, formatter(response), ttl)
+    
+    return _coalescer.run(key, load)
+
+
+async def _acached_get(
+    key: str,
+    url: str,
+    params: Optional[dict],
+    formatter: Callable,
+    ttl: Union[float, Callable]
+) -> str:
+    """Async variant of _cached_get."""
+    cached = _stock_cache.get(key, MISSING)
+    if cached is not MISSING:
+        return cached
+    
+    async def load():
+        response = await ahttp_get(url, params=params, headers=HEADERS)
+        return _store(key, response, formatter(response), ttl)
+    
+    return await _coalescer.arun(key, load)
+
+
+def _cached_call(key: str, load: Callable, ttl: float) -> str:
+    """Return a cached tool result, or run `load()` once for all concurrent callers."""
+    cached = _stock_cache.get(key, MISSING)
+    if cached is not MISSING:
+        return cached
+    
+    def run():
+        result = load()
+        if not result.startswith("Error"):
+            _stock_cache.set(key, result, ttl=ttl)
+        return result
+    
+    return _coalescer.run(key, run)
+
+
+async def _acached_call(key: str, load: Callable, ttl: float) -> str:
+    """Async variant of _cached_call (`load` returns an awaitable)."""
+    cached = _stock_cache.get(key, MISSING)
+    if cached is not MISSING:
+        return cached
+    
+    async def run():
+        result = await load()
+        if not result.startswith("Error"):
+            _stock_cache.set(key, result, ttl=ttl)
+        return result
+    
+    return await _coalescer.arun(key, run)
+
+
+def _store(key: str, response, result: str, ttl: Union[float, Callable]) -> str:
+    """Cache a successful tool result (errors are never cached)."""
+    if response.status_code == 200 and not result.startswith("Error"):
+        _stock_cache.set(key, result, ttl=ttl(response) if callable(ttl) else ttl)
+    return result
+
+
+def get_stock_cache_stats() -> dict:
+    """Get hit/miss counters for the stock response cache."""
+    stats = _stock_cache.stats()
+    stats["coalesced"] = _coalescer.coalesced
+    return stats
+
 
 @tool
 def get_stock_quote(ticker: str) -> str:
@@ -42,39 +203,199 @@ def get_stock_quote(ticker: str) -> str:
         ticker = ticker.upper().strip()
         
         # Using Yahoo Finance public API
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-        response = httpx.get(url, headers=HEADERS, timeout=10.0)
-        data = response.json()
+        return _cached_get(
+            f"quote:{ticker}", f"{CHART_URL}/{ticker}", None,
+            lambda response: _format_quote(response, ticker), _quote_ttl
+        )
+    except Exception as e:
+        logger.error(f"Stock quote error for {ticker}: {e}")
+        return f"Error fetching stock quote for {ticker}: {str(e)}"
+
+
+async def _aget_stock_quote(ticker: str) -> str:
+    """Async variant of get_stock_quote."""
+    try:
+        # Normalize ticker to uppercase
+        ticker = ticker.upper().strip()
         
-        if response.status_code == 200 and data.get('chart', {}).get('result'):
-            result = data['chart']['result'][0]
-            meta = result['meta']
-            
-            current_price = meta.get('regularMarketPrice', 0)
-            previous_close = meta.get('previousClose', 0)
-            change = current_price - previous_close if previous_close else 0
-            change_percent = (change / previous_close * 100) if previous_close else 0
-            
-            quote = {
-                "ticker": meta['symbol'],
-                "name": meta.get('longName', meta['symbol']),
-                "current_price": f"${current_price:.2f}",
-                "previous_close": f"${previous_close:.2f}",
-                "change": f"${change:+.2f}",
-                "change_percent": f"{change_percent:+.2f}%",
-                "currency": meta.get('currency', 'USD'),
-                "exchange": meta.get('exchangeName', 'Unknown'),
-                "market_state": meta.get('marketState', 'Unknown')
-            }
-            return json.dumps(quote, indent=2)
-        else:
-            error_msg = data.get('chart', {}).get('error', {}).get('description', f'Unable to fetch data for ticker: {ticker}')
-            return f"Error: {error_msg}"
+        # Using Yahoo Finance public API
+        return await _acached_get(
+            f"quote:{ticker}", f"{CHART_URL}/{ticker}", None,
+            lambda response: _format_quote(response, ticker), _quote_ttl
+        )
     except Exception as e:
         logger.error(f"Stock quote error for {ticker}: {e}")
         return f"Error fetching stock quote for {ticker}: {str(e)}"
 
 
+def _format_quote(response, ticker: str) -> str:
+    """Format a chart response as a quote summary for the model."""
+    data = response.json()
+    
+    if response.status_code == 200 and data.get('chart', {}).get('result'):
+        meta = data['chart']['result'][0]['meta']
+        return json.dumps(_quote_fields(meta), indent=2)
+    else:
+        error_msg = data.get('chart', {}).get('error', {}).get('description', f'Unable to fetch data for ticker: {ticker}')
+        return f"Error: {error_msg}"
+
+
+def _quote_fields(meta: dict) -> dict:
+    """Build the quote summary from chart metadata."""
+    current_price = meta.get('regularMarketPrice', 0)
+    previous_close = meta.get('previousClose') or meta.get('chartPreviousClose', 0)
+    change = current_price - previous_close if previous_close else 0
+    change_percent = (change / previous_close * 100) if previous_close else 0
+    
+    return {
+        "ticker": meta['symbol'],
+        "name": meta.get('longName', meta['symbol']),
+        "current_price": f"${current_price:.2f}",
+        "previous_close": f"${previous_close:.2f}",
+        "change": f"${change:+.2f}",
+        "change_percent": f"{change_percent:+.2f}%",
+        "currency": meta.get('currency', 'USD'),
+        "exchange": meta.get('exchangeName', 'Unknown'),
+        "market_state": meta.get('marketState', 'Unknown')
+    }
+
+
+@tool
+def get_stock_quotes(tickers: list[str]) -> str:
+    """
+    Get real-time quotes for several ticker symbols at once (FREE, no API key).
+    Use this instead of repeated get_stock_quote calls when comparing stocks.
+    
+    Args:
+        tickers: Stock ticker symbols (e.g., ["AAPL", "MSFT", "NVDA"]), max 20
+    
+    Returns:
+        One compact table with price and daily change per ticker
+    """
+    try:
+        symbols = _normalize_tickers(tickers)
+        if not symbols:
+            return "Error: No ticker symbols given"
+        
+        quotes, missing = _cached_quotes(symbols)
+        if missing:
+            try:
+                response = http_get(SPARK_URL, params=_spark_params(missing), headers=HEADERS)
+                quotes.update(_parse_spark(response))
+            except Exception as e:
+                logger.warning(f"Batch quote request failed, falling back to single quotes: {e}")
+            missing = [s for s in missing if s not in quotes]
+        
+        if missing:
+            # Symbols the batch endpoint did not return: bounded parallel single quotes,
+            # each run in a copy of this context so force_refresh() reaches the workers
+            with ThreadPoolExecutor(max_workers=min(len(missing), BATCH_FALLBACK_WORKERS)) as pool:
+                futures = [
+                    pool.submit(contextvars.copy_context().run, get_stock_quote.func, symbol)
+                    for symbol in missing
+                ]
+                for symbol, future in zip(missing, futures):
+                    quotes[symbol] = _load_quote(future.result())
+        
+        return _format_quotes_table(symbols, quotes)
+    except Exception as e:
+        logger.error(f"Batch stock quote error for {tickers}: {e}")
+        return f"Error fetching stock quotes for {tickers}: {str(e)}"
+
+
+async def _aget_stock_quotes(tickers: list[str]) -> str:
+    """Async variant of get_stock_quotes."""
+    try:
+        symbols = _normalize_tickers(tickers)
+        if not symbols:
+            return "Error: No ticker symbols given"
+        
+        quotes, missing = _cached_quotes(symbols)
+        if missing:
+            try:
+                response = await ahttp_get(SPARK_URL, params=_spark_params(missing), headers=HEADERS)
+                quotes.update(_parse_spark(response))
+            except Exception as e:
+                logger.warning(f"Batch quote request failed, falling back to single quotes: {e}")
+            missing = [s for s in missing if s not in quotes]
+        
+        if missing:
+            # Concurrency is bounded by the HTTP client's per-host limit
+            results = await asyncio.gather(*(_aget_stock_quote(s) for s in missing))
+            for symbol, result in zip(missing, results):
+                quotes[symbol] = _load_quote(result)
+        
+        return _format_quotes_table(symbols, quotes)
+    except Exception as e:
+        logger.error(f"Batch stock quote error for {tickers}: {e}")
+        return f"Error fetching stock quotes for {tickers}: {str(e)}"
+
+
+def _normalize_tickers(tickers) -> list:
+    """Uppercase and deduplicate tickers (a comma-separated string is also accepted)."""
+    if isinstance(tickers, str):
+        tickers = tickers.split(",")
+    symbols = []
+    for ticker in tickers:
+        symbol = str(ticker).upper().strip()
+        if symbol and symbol not in symbols:
+            symbols.append(symbol)
+    return symbols[:MAX_BATCH_TICKERS]
+
+
+def _cached_quotes(symbols: list) -> tuple:
+    """Split symbols into ({symbol: quote fields} from the cache, [symbols to fetch])."""
+    quotes = {}
+    missing = []
+    for symbol in symbols:
+        cached = _stock_cache.get(f"quote:{symbol}", MISSING)
+        if cached is MISSING:
+            missing.append(symbol)
+        else:
+            quotes[symbol] = json.loads(cached)
+    return quotes, missing
+
+
+def _spark_params(symbols: list) -> dict:
+    return {"symbols": ",".join(symbols), "range": "1d", "interval": "1d"}
+
+
+def _parse_spark(response) -> dict:
+    """Extract {symbol: quote fields} from a batched spark response and cache each quote."""
+    quotes = {}
+    if response.status_code != 200:
+        return quotes
+    for item in response.json().get('spark', {}).get('result') or []:
+        chart = (item.get('response') or [{}])[0]
+        meta = chart.get('meta')
+        if not meta or 'regularMarketPrice' not in meta:
+            continue
+        fields = _quote_fields(meta)
+        quotes[fields['ticker']] = fields
+        _stock_cache.set(f"quote:{fields['ticker']}", json.dumps(fields, indent=2), ttl=_market_ttl(meta))
+    return quotes
+
+
+def _load_quote(result: str):
+    """Parse a get_stock_quote result (error strings are kept as-is)."""
+    return result if result.startswith("Error") else json.loads(result)
+
+
+def _format_quotes_table(symbols: list, quotes: dict) -> str:
+    """Format quotes as one compact pipe-separated table for the model."""
+    lines = ["ticker | name | price | change | change % | currency | market state"]
+    for symbol in symbols:
+        quote = quotes.get(symbol, f"Error: Unable to fetch data for ticker: {symbol}")
+        if isinstance(quote, str):
+            lines.append(f"{symbol} | {quote}")
+        else:
+            lines.append(" | ".join([
+                quote['ticker'], quote['name'], quote['current_price'], quote['change'],
+                quote['change_percent'], quote['currency'], quote['market_state']
+            ]))
+    return "\n".join(lines)
+
+
 @tool
 def get_stock_history(ticker: str, period: str = "1mo") -> str:
     """
@@ -82,65 +403,114 @@ def get_stock_history(ticker: str, period: str = "1mo") -> str:
     
     Args:
         ticker: Stock ticker symbol (e.g., "AAPL", "GOOGL", "MSFT", "TSLA")
-        period: Time period - "1d", "5d", "1mo", "3mo", "6mo", "1y", "5y" (default: "1mo")
+        period: Time period - "1d", "5d", "1mo", "3mo", "6mo", "ytd", "1y", "2y", "5y", "10y", "max" (default: "1mo")
     
     Returns:
-        Historical price data with open, high, low, close, volume
+        Summary over the whole period (return, volatility, max drawdown, high/low,
+        moving averages), the latest bar, and a downsampled close series
     """
     try:
         # Normalize ticker to uppercase
         ticker = ticker.upper().strip()
         
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-        params = {"range": period, "interval": "1d"}
-        response = httpx.get(url, params=params, headers=HEADERS, timeout=10.0)
-        data = response.json()
+        return _cached_call(
+            f"history:{ticker}:{period}", lambda: _load_history(ticker, period), HISTORY_TTL
+        )
+    except Exception as e:
+        logger.error(f"Stock history error for {ticker}: {e}")
+        return f"Error fetching stock history for {ticker}: {str(e)}"
+
+
+async def _aget_stock_history(ticker: str, period: str = "1mo") -> str:
+    """Async variant of get_stock_history."""
+    try:
+        # Normalize ticker to uppercase
+        ticker = ticker.upper().strip()
         
-        if response.status_code == 200 and data.get('chart', {}).get('result'):
-            result = data['chart']['result'][0]
-            timestamps = result.get('timestamp', [])
-            quotes = result['indicators']['quote'][0]
-            
-            # Get last 10 data points
-            history = []
-            start_idx = max(0, len(timestamps) - 10)
-            
-            for i in range(start_idx, len(timestamps)):
-                ts = timestamps[i]
-                close_val = quotes['close'][i] if quotes['close'][i] else None
-                if close_val is not None:
-                    history.append({
-                        "date": datetime.fromtimestamp(ts).strftime('%Y-%m-%d'),
-                        "open": f"${quotes['open'][i]:.2f}" if quotes['open'][i] else "N/A",
-                        "high": f"${quotes['high'][i]:.2f}" if quotes['high'][i] else "N/A",
-                        "low": f"${quotes['low'][i]:.2f}" if quotes['low'][i] else "N/A",
-                        "close": f"${close_val:.2f}",
-                        "volume": f"{quotes['volume'][i]:,}" if quotes['volume'][i] else "N/A"
-                    })
-            
-            # Calculate performance
-            if len(history) >= 2:
-                first_close = float(history[0]['close'].replace('$', ''))
-                last_close = float(history[-1]['close'].replace('$', ''))
-                period_change = ((last_close - first_close) / first_close) * 100
-            else:
-                period_change = 0
-            
-            return json.dumps({
-                "ticker": ticker,
-                "period": period,
-                "period_performance": f"{period_change:+.2f}%",
-                "data_points": len(history),
-                "history": history
-            }, indent=2)
-        else:
-            error_msg = data.get('chart', {}).get('error', {}).get('description', f'Unable to fetch history for ticker: {ticker}')
-            return f"Error: {error_msg}"
+        return await _acached_call(
+            f"history:{ticker}:{period}", lambda: _aload_history(ticker, period), HISTORY_TTL
+        )
     except Exception as e:
         logger.error(f"Stock history error for {ticker}: {e}")
         return f"Error fetching stock history for {ticker}: {str(e)}"
 
 
+def _load_history(ticker: str, period: str) -> str:
+    """Bring the local store up to date for `period` (fetching only what is missing) and format it."""
+    store = _get_history_store()
+    # At most: backfill older bars, refresh the tail, refetch after a re-adjustment
+    for _ in range(3):
+        params, anchor = store.plan(ticker, period, force=is_refreshing())
+        if params is None:
+            break
+        response = http_get(f"{CHART_URL}/{ticker}", params=params, headers=HEADERS)
+        result = _chart_result(response)
+        if result is None:
+            if anchor is None:
+                return _chart_error(response, f'Unable to fetch history for ticker: {ticker}')
+            logger.warning(f"History tail refresh failed for {ticker}, using stored bars")
+            break
+        if store.save(ticker, params, PriceSeries.from_chart(result), anchor):
+            break
+    return _format_history(store.read(ticker, period), ticker, period)
+
+
+async def _aload_history(ticker: str, period: str) -> str:
+    """Async variant of _load_history (store I/O runs in a worker thread)."""
+    store = _get_history_store()
+    # At most: backfill older bars, refresh the tail, refetch after a re-adjustment
+    for _ in range(3):
+        params, anchor = await asyncio.to_thread(store.plan, ticker, period, is_refreshing())
+        if params is None:
+            break
+        response = await ahttp_get(f"{CHART_URL}/{ticker}", params=params, headers=HEADERS)
+        result = _chart_result(response)
+        if result is None:
+            if anchor is None:
+                return _chart_error(response, f'Unable to fetch history for ticker: {ticker}')
+            logger.warning(f"History tail refresh failed for {ticker}, using stored bars")
+            break
+        series = PriceSeries.from_chart(result)
+        if await asyncio.to_thread(store.save, ticker, params, series, anchor):
+            break
+    series = await asyncio.to_thread(store.read, ticker, period)
+    return _format_history(series, ticker, period)
+
+
+def _chart_result(response):
+    """Get the first chart result from a response, or None on error."""
+    if response.status_code != 200:
+        return None
+    results = response.json().get('chart', {}).get('result')
+    return results[0] if results else None
+
+
+def _chart_error(response, default: str) -> str:
+    """Get the error description from a failed chart response."""
+    try:
+        error = response.json().get('chart', {}).get('error') or {}
+    except ValueError:
+        error = {}
+    return f"Error: {error.get('description', default)}"
+
+
+def _format_history(series: PriceSeries, ticker: str, period: str) -> str:
+    """Format daily bars as a range summary plus a downsampled series."""
+    if not len(series):
+        return f"Error: No price data for ticker: {ticker}"
+    summary = summarize(series)
+    
+    return json.dumps({
+        "ticker": ticker,
+        "period": period,
+        "period_performance": summary["period_return"],
+        "data_points": len(series),
+        "summary": summary,
+        "latest": latest_bar(series),
+        "series": downsample(series, HISTORY_MAX_POINTS)
+    }, indent=2)
+
+
 @tool
 def get_company_info(ticker: str) -> str:
     """
@@ -156,64 +526,93 @@ def get_company_info(ticker: str) -> str:
         # Normalize ticker to uppercase
         ticker = ticker.upper().strip()
         
-        url = f"https://query1.finance.yahoo.com/v10/finance/quoteSummary/{ticker}"
         params = {"modules": "summaryProfile,financialData,defaultKeyStatistics,price"}
-        response = httpx.get(url, params=params, headers=HEADERS, timeout=10.0)
-        data = response.json()
+        return _cached_get(
+            f"company:{ticker}", f"{QUOTE_SUMMARY_URL}/{ticker}", params,
+            lambda response: _format_company_info(response, ticker), COMPANY_INFO_TTL
+        )
+    except Exception as e:
+        logger.error(f"Company info error for {ticker}: {e}")
+        return f"Error fetching company info for {ticker}: {str(e)}"
+
+
+async def _aget_company_info(ticker: str) -> str:
+    """Async variant of get_company_info."""
+    try:
+        # Normalize ticker to uppercase
+        ticker = ticker.upper().strip()
         
-        if response.status_code == 200 and data.get('quoteSummary', {}).get('result'):
-            result = data['quoteSummary']['result'][0]
-            profile = result.get('summaryProfile', {})
-            financials = result.get('financialData', {})
-            stats = result.get('defaultKeyStatistics', {})
-            price = result.get('price', {})
-            
-            def get_value(d, key):
-                val = d.get(key, {})
-                if isinstance(val, dict):
-                    return val.get('fmt', val.get('raw', 'N/A'))
-                return val if val else 'N/A'
-            
-            info = {
-                "ticker": ticker,
-                "name": get_value(price, 'longName'),
-                "sector": profile.get('sector', 'N/A'),
-                "industry": profile.get('industry', 'N/A'),
-                "country": profile.get('country', 'N/A'),
-                "employees": profile.get('fullTimeEmployees', 'N/A'),
-                "website": profile.get('website', 'N/A'),
-                "summary": (profile.get('longBusinessSummary', 'N/A')[:500] + "...") if profile.get('longBusinessSummary') else 'N/A',
-                "financials": {
-                    "market_cap": get_value(price, 'marketCap'),
-                    "revenue": get_value(financials, 'totalRevenue'),
-                    "profit_margin": get_value(financials, 'profitMargins'),
-                    "operating_margin": get_value(financials, 'operatingMargins'),
-                    "current_price": get_value(financials, 'currentPrice'),
-                    "target_price": get_value(financials, 'targetMeanPrice'),
-                    "recommendation": get_value(financials, 'recommendationKey')
-                },
-                "key_stats": {
-                    "pe_ratio": get_value(stats, 'trailingPE'),
-                    "forward_pe": get_value(stats, 'forwardPE'),
-                    "peg_ratio": get_value(stats, 'pegRatio'),
-                    "price_to_book": get_value(stats, 'priceToBook'),
-                    "beta": get_value(stats, 'beta'),
-                    "52_week_high": get_value(stats, 'fiftyTwoWeekHigh'),
-                    "52_week_low": get_value(stats, 'fiftyTwoWeekLow')
-                }
-            }
-            return json.dumps(info, indent=2)
-        else:
-            error_msg = data.get('quoteSummary', {}).get('error', {}).get('description', f'Unable to fetch company info for ticker: {ticker}')
-            return f"Error: {error_msg}"
+        params = {"modules": "summaryProfile,financialData,defaultKeyStatistics,price"}
+        return await _acached_get(
+            f"company:{ticker}", f"{QUOTE_SUMMARY_URL}/{ticker}", params,
+            lambda response: _format_company_info(response, ticker), COMPANY_INFO_TTL
+        )
     except Exception as e:
         logger.error(f"Company info error for {ticker}: {e}")
         return f"Error fetching company info for {ticker}: {str(e)}"
 
 
+def _format_company_info(response, ticker: str) -> str:
+    """Format a quoteSummary response as a company profile for the model."""
+    data = response.json()
+    
+    if response.status_code == 200 and data.get('quoteSummary', {}).get('result'):
+        result = data['quoteSummary']['result'][0]
+        profile = result.get('summaryProfile', {})
+        financials = result.get('financialData', {})
+        stats = result.get('defaultKeyStatistics', {})
+        price = result.get('price', {})
+    
+        def get_value(d, key):
+            val = d.get(key, {})
+            if isinstance(val, dict):
+                return val.get('fmt', val.get('raw', 'N/A'))
+            return val if val else 'N/A'
+    
+        info = {
+            "ticker": ticker,
+            "name": get_value(price, 'longName'),
+            "sector": profile.get('sector', 'N/A'),
+            "industry": profile.get('industry', 'N/A'),
+            "country": profile.get('country', 'N/A'),
+            "employees": profile.get('fullTimeEmployees', 'N/A'),
+            "website": profile.get('website', 'N/A'),
+            "summary": (profile.get('longBusinessSummary', 'N/A')[:500] + "...") if profile.get('longBusinessSummary') else 'N/A',
+            "financials": {
+                "market_cap": get_value(price, 'marketCap'),
+                "revenue": get_value(financials, 'totalRevenue'),
+                "profit_margin": get_value(financials, 'profitMargins'),
+                "operating_margin": get_value(financials, 'operatingMargins'),
+                "current_price": get_value(financials, 'currentPrice'),
+                "target_price": get_value(financials, 'targetMeanPrice'),
+                "recommendation": get_value(financials, 'recommendationKey')
+            },
+            "key_stats": {
+                "pe_ratio": get_value(stats, 'trailingPE'),
+                "forward_pe": get_value(stats, 'forwardPE'),
+                "peg_ratio": get_value(stats, 'pegRatio'),
+                "price_to_book": get_value(stats, 'priceToBook'),
+                "beta": get_value(stats, 'beta'),
+                "52_week_high": get_value(stats, 'fiftyTwoWeekHigh'),
+                "52_week_low": get_value(stats, 'fiftyTwoWeekLow')
+            }
+        }
+        return json.dumps(info, indent=2)
+    else:
+        error_msg = data.get('quoteSummary', {}).get('error', {}).get('description', f'Unable to fetch company info for ticker: {ticker}')
+        return f"Error: {error_msg}"
+
+
+# Register async implementations as tool coroutines
+get_stock_quote.coroutine = _aget_stock_quote
+get_stock_quotes.coroutine = _aget_stock_quotes
+get_stock_history.coroutine = _aget_stock_history
+get_company_info.coroutine = _aget_company_info
+
 # Export all stock tools
 STOCK_TOOLS = [
     get_stock_quote,
+    get_stock_quotes,
     get_stock_history,
     get_company_info
 ]
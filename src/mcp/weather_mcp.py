@@ -8,15 +8,30 @@ Tools:
 - get_current_weather: Get current weather conditions
 - get_weather_forecast: Get multi-day weather forecast
 - get_air_quality: Get air quality index and pollutant levels
+- get_weather_report: Current conditions, forecast and air quality in one call
+- get_weather_for_locations: Compare current weather across several locations
+
+Every tool also has an async implementation (httpx.AsyncClient) registered as
+its coroutine, so `tool.ainvoke(...)` never blocks the event loop.
+
+Geocoding results are cached for weeks; weather responses for a few minutes
+(Open-Meteo refreshes current conditions every 15 minutes), with concurrent
+identical lookups sharing one request.
 
 API Documentation: https://open-meteo.com/en/docs
 """
 
+import os
 import json
+import asyncio
 import logging
-import httpx
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
 from langchain_core.tools import tool
 
+from .cache import TTLCache, RequestCoalescer, MISSING
+from .http_client import http_get, ahttp_get
+
 logger = logging.getLogger(__name__)
 
 # Open-Meteo API base URLs (No API key required!)
@@ -24,31 +39,126 @@ WEATHER_API_URL = "https://api.open-meteo.com/v1/forecast"
 GEOCODING_API_URL = "https://geocoding-api.open-meteo.com/v1/search"
 AIR_QUALITY_API_URL = "https://air-quality-api.open-meteo.com/v1/air-quality"
 
+# Geocoding cache - city coordinates almost never change
+# (WEATHER_GEOCODE_CACHE_PATH enables an on-disk SQLite file that survives restarts)
+_geocode_cache = TTLCache(
+    "geocoding",
+    maxsize=int(os.getenv("WEATHER_GEOCODE_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("WEATHER_GEOCODE_CACHE_TTL", str(30 * 24 * 3600))),
+    persist_path=os.getenv("WEATHER_GEOCODE_CACHE_PATH") or None
+)
+
+# Weather response cache, keyed by endpoint + coordinates (+ days)
+_weather_cache = TTLCache(
+    "weather",
+    maxsize=int(os.getenv("WEATHER_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("WEATHER_CACHE_TTL", "600")),
+    refreshable=True
+)
+_coalescer = RequestCoalescer()
+
+# Locations per get_weather_for_locations call (one bulk forecast request)
+MAX_LOCATIONS = 10
+GEOCODE_WORKERS = 4
+
+
+def _normalize_location(location: str) -> str:
+    """Normalize a location string for use as a cache key."""
+    return " ".join(location.lower().split())
+
+
+def _geocoding_params(location: str) -> dict:
+    """Build Open-Meteo Geocoding API query parameters."""
+    return {"name": location, "count": 1, "language": "en", "format": "json"}
+
+
+def _parse_coordinates(data: dict, location: str) -> tuple:
+    """Extract (lat, lon, name, country) from a geocoding response and cache it."""
+    if data.get("results"):
+        result = data["results"][0]
+        coordinates = (
+            result["latitude"],
+            result["longitude"],
+            result.get("name", location),
+            result.get("country", "")
+        )
+        _geocode_cache.set(_normalize_location(location), list(coordinates))
+        return coordinates
+    return None, None, location, ""
+
 
 def _get_coordinates(location: str) -> tuple:
-    """Get latitude and longitude for a location using Open-Meteo Geocoding API."""
+    """Get latitude and longitude for a location using Open-Meteo Geocoding API (cached)."""
+    cached = _geocode_cache.get(_normalize_location(location))
+    if cached is not None:
+        return tuple(cached)
+    
     try:
-        response = httpx.get(
-            GEOCODING_API_URL,
-            params={"name": location, "count": 1, "language": "en", "format": "json"},
-            timeout=10.0
-        )
-        data = response.json()
-        
-        if data.get("results"):
-            result = data["results"][0]
-            return (
-                result["latitude"],
-                result["longitude"],
-                result.get("name", location),
-                result.get("country", "")
-            )
+        response = http_get(GEOCODING_API_URL, params=_geocoding_params(location))
+        return _parse_coordinates(response.json(), location)
+    except Exception as e:
+        logger.error(f"Geocoding error: {e}")
         return None, None, location, ""
+
+
+async def _aget_coordinates(location: str) -> tuple:
+    """Async variant of _get_coordinates."""
+    cached = _geocode_cache.get(_normalize_location(location))
+    if cached is not None:
+        return tuple(cached)
+    
+    try:
+        response = await ahttp_get(GEOCODING_API_URL, params=_geocoding_params(location))
+        return _parse_coordinates(response.json(), location)
     except Exception as e:
         logger.error(f"Geocoding error: {e}")
         return None, None, location, ""
 
 
+def get_geocoding_cache_stats() -> dict:
+    """Get hit/miss counters for the geocoding cache."""
+    return _geocode_cache.stats()
+
+
+def get_weather_cache_stats() -> dict:
+    """Get hit/miss counters for the weather response cache."""
+    stats = _weather_cache.stats()
+    stats["coalesced"] = _coalescer.coalesced
+    return stats
+
+
+def _cached_get(key: str, url: str, params: dict, formatter: Callable) -> str:
+    """Return a cached tool result, or fetch and format it once for all concurrent callers."""
+    cached = _weather_cache.get(key, MISSING)
+    if cached is not MISSING:
+        return cached
+    
+    def load():
+        response = http_get(url, params=params)
+        result = formatter(response)
+        if response.status_code == 200 and not result.startswith("Error"):
+            _weather_cache.set(key, result)
+        return result
+    
+    return _coalescer.run(key, load)
+
+
+async def _acached_get(key: str, url: str, params: dict, formatter: Callable) -> str:
+    """Async variant of _cached_get."""
+    cached = _weather_cache.get(key, MISSING)
+    if cached is not MISSING:
+        return cached
+    
+    async def load():
+        response = await ahttp_get(url, params=params)
+        result = formatter(response)
+        if response.status_code == 200 and not result.startswith("Error"):
+            _weather_cache.set(key, result)
+        return result
+    
+    return await _coalescer.arun(key, load)
+
+
 def _get_weather_description(code: int) -> str:
     """Convert WMO weather code to description."""
     codes = {
@@ -100,36 +210,68 @@ def get_current_weather(location: str) -> str:
             return f"Error: Could not find location '{location}'"
         
         # Get current weather
-        params = {
-            "latitude": lat,
-            "longitude": lon,
-            "current": "temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m,surface_pressure",
-            "timezone": "auto"
-        }
-        
-        response = httpx.get(WEATHER_API_URL, params=params, timeout=10.0)
-        data = response.json()
+        return _cached_get(
+            f"current:{lat},{lon}", WEATHER_API_URL, _current_weather_params(lat, lon),
+            lambda response: _format_current_weather(response, location, lat, lon, name, country)
+        )
+    except Exception as e:
+        logger.error(f"Weather API error: {e}")
+        return f"Error fetching weather: {str(e)}"
+
+
+async def _aget_current_weather(location: str) -> str:
+    """Async variant of get_current_weather."""
+    try:
+        lat, lon, name, country = await _aget_coordinates(location)
+        if lat is None:
+            return f"Error: Could not find location '{location}'"
         
-        if response.status_code == 200 and "current" in data:
-            current = data["current"]
-            weather = {
-                "location": f"{name}, {country}" if country else name,
-                "temperature": f"{current['temperature_2m']}°C",
-                "feels_like": f"{current['apparent_temperature']}°C",
-                "humidity": f"{current['relative_humidity_2m']}%",
-                "conditions": _get_weather_description(current['weather_code']),
-                "wind_speed": f"{current['wind_speed_10m']} km/h",
-                "pressure": f"{current['surface_pressure']} hPa",
-                "coordinates": {"lat": lat, "lon": lon}
-            }
-            return json.dumps(weather, indent=2)
-        else:
-            return f"Error: Unable to fetch weather data for {location}"
+        return await _acached_get(
+            f"current:{lat},{lon}", WEATHER_API_URL, _current_weather_params(lat, lon),
+            lambda response: _format_current_weather(response, location, lat, lon, name, country)
+        )
     except Exception as e:
         logger.error(f"Weather API error: {e}")
         return f"Error fetching weather: {str(e)}"
 
 
+def _current_weather_params(lat: float, lon: float) -> dict:
+    """Build query parameters for current conditions."""
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "current": "temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m,surface_pressure",
+        "timezone": "auto"
+    }
+
+
+def _current_fields(current: dict) -> dict:
+    """Readable current-conditions fields from an Open-Meteo `current` block."""
+    return {
+        "temperature": f"{current['temperature_2m']}°C",
+        "feels_like": f"{current['apparent_temperature']}°C",
+        "humidity": f"{current['relative_humidity_2m']}%",
+        "conditions": _get_weather_description(current['weather_code']),
+        "wind_speed": f"{current['wind_speed_10m']} km/h",
+        "pressure": f"{current['surface_pressure']} hPa"
+    }
+
+
+def _format_current_weather(response, location: str, lat: float, lon: float, name: str, country: str) -> str:
+    """Format a current-conditions response for the model."""
+    data = response.json()
+    
+    if response.status_code == 200 and "current" in data:
+        weather = {
+            "location": f"{name}, {country}" if country else name,
+            **_current_fields(data["current"]),
+            "coordinates": {"lat": lat, "lon": lon}
+        }
+        return json.dumps(weather, indent=2)
+    else:
+        return f"Error: Unable to fetch weather data for {location}"
+
+
 @tool
 def get_weather_forecast(location: str, days: int = 5) -> str:
     """
@@ -149,43 +291,73 @@ def get_weather_forecast(location: str, days: int = 5) -> str:
             return f"Error: Could not find location '{location}'"
         
         # Get forecast
-        params = {
-            "latitude": lat,
-            "longitude": lon,
-            "daily": "temperature_2m_max,temperature_2m_min,weather_code,precipitation_probability_max,wind_speed_10m_max",
-            "timezone": "auto",
-            "forecast_days": min(days, 7)
-        }
-        
-        response = httpx.get(WEATHER_API_URL, params=params, timeout=10.0)
-        data = response.json()
+        return _cached_get(
+            f"forecast:{lat},{lon}:{days}", WEATHER_API_URL, _forecast_params(lat, lon, days),
+            lambda response: _format_forecast(response, location, days, name, country)
+        )
+    except Exception as e:
+        logger.error(f"Forecast API error: {e}")
+        return f"Error fetching forecast: {str(e)}"
+
+
+async def _aget_weather_forecast(location: str, days: int = 5) -> str:
+    """Async variant of get_weather_forecast."""
+    try:
+        lat, lon, name, country = await _aget_coordinates(location)
+        if lat is None:
+            return f"Error: Could not find location '{location}'"
         
-        if response.status_code == 200 and "daily" in data:
-            daily = data["daily"]
-            forecasts = []
-            
-            for i in range(min(days, len(daily["time"]))):
-                forecasts.append({
-                    "date": daily["time"][i],
-                    "temp_high": f"{daily['temperature_2m_max'][i]}°C",
-                    "temp_low": f"{daily['temperature_2m_min'][i]}°C",
-                    "conditions": _get_weather_description(daily['weather_code'][i]),
-                    "precipitation_chance": f"{daily['precipitation_probability_max'][i]}%",
-                    "wind_speed": f"{daily['wind_speed_10m_max'][i]} km/h"
-                })
-            
-            return json.dumps({
-                "location": f"{name}, {country}" if country else name,
-                "forecast_days": len(forecasts),
-                "forecast": forecasts
-            }, indent=2)
-        else:
-            return f"Error: Unable to fetch forecast for {location}"
+        return await _acached_get(
+            f"forecast:{lat},{lon}:{days}", WEATHER_API_URL, _forecast_params(lat, lon, days),
+            lambda response: _format_forecast(response, location, days, name, country)
+        )
     except Exception as e:
         logger.error(f"Forecast API error: {e}")
         return f"Error fetching forecast: {str(e)}"
 
 
+def _forecast_params(lat: float, lon: float, days: int) -> dict:
+    """Build query parameters for a daily forecast."""
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "daily": "temperature_2m_max,temperature_2m_min,weather_code,precipitation_probability_max,wind_speed_10m_max",
+        "timezone": "auto",
+        "forecast_days": min(days, 7)
+    }
+
+
+def _daily_forecasts(daily: dict, days: int) -> list:
+    """Per-day forecast entries from an Open-Meteo `daily` block."""
+    forecasts = []
+    for i in range(min(days, len(daily["time"]))):
+        forecasts.append({
+            "date": daily["time"][i],
+            "temp_high": f"{daily['temperature_2m_max'][i]}°C",
+            "temp_low": f"{daily['temperature_2m_min'][i]}°C",
+            "conditions": _get_weather_description(daily['weather_code'][i]),
+            "precipitation_chance": f"{daily['precipitation_probability_max'][i]}%",
+            "wind_speed": f"{daily['wind_speed_10m_max'][i]} km/h"
+        })
+    return forecasts
+
+
+def _format_forecast(response, location: str, days: int, name: str, country: str) -> str:
+    """Format a daily forecast response for the model."""
+    data = response.json()
+    
+    if response.status_code == 200 and "daily" in data:
+        forecasts = _daily_forecasts(data["daily"], days)
+        
+        return json.dumps({
+            "location": f"{name}, {country}" if country else name,
+            "forecast_days": len(forecasts),
+            "forecast": forecasts
+        }, indent=2)
+    else:
+        return f"Error: Unable to fetch forecast for {location}"
+
+
 @tool
 def get_air_quality(location: str) -> str:
     """
@@ -204,56 +376,358 @@ def get_air_quality(location: str) -> str:
             return f"Error: Could not find location '{location}'"
         
         # Get air quality
-        params = {
-            "latitude": lat,
-            "longitude": lon,
-            "current": "us_aqi,pm10,pm2_5,carbon_monoxide,nitrogen_dioxide,ozone",
-            "timezone": "auto"
+        return _cached_get(
+            f"aqi:{lat},{lon}", AIR_QUALITY_API_URL, _air_quality_params(lat, lon),
+            lambda response: _format_air_quality(response, location, name, country)
+        )
+    except Exception as e:
+        logger.error(f"Air Quality API error: {e}")
+        return f"Error fetching air quality: {str(e)}"
+
+
+async def _aget_air_quality(location: str) -> str:
+    """Async variant of get_air_quality."""
+    try:
+        lat, lon, name, country = await _aget_coordinates(location)
+        if lat is None:
+            return f"Error: Could not find location '{location}'"
+        
+        return await _acached_get(
+            f"aqi:{lat},{lon}", AIR_QUALITY_API_URL, _air_quality_params(lat, lon),
+            lambda response: _format_air_quality(response, location, name, country)
+        )
+    except Exception as e:
+        logger.error(f"Air Quality API error: {e}")
+        return f"Error fetching air quality: {str(e)}"
+
+
+def _air_quality_params(lat: float, lon: float) -> dict:
+    """Build query parameters for current air quality."""
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "current": "us_aqi,pm10,pm2_5,carbon_monoxide,nitrogen_dioxide,ozone",
+        "timezone": "auto"
+    }
+
+
+def _air_quality_fields(current: dict) -> dict:
+    """AQI, AQI level and pollutant levels from an air quality `current` block."""
+    aqi = current.get('us_aqi', 0)
+    
+    # AQI level classification
+    if aqi <= 50:
+        aqi_level = "Good"
+    elif aqi <= 100:
+        aqi_level = "Moderate"
+    elif aqi <= 150:
+        aqi_level = "Unhealthy for Sensitive Groups"
+    elif aqi <= 200:
+        aqi_level = "Unhealthy"
+    elif aqi <= 300:
+        aqi_level = "Very Unhealthy"
+    else:
+        aqi_level = "Hazardous"
+    
+    return {
+        "aqi": aqi,
+        "aqi_level": aqi_level,
+        "pollutants": {
+            "PM2.5": f"{current.get('pm2_5', 'N/A')} μg/m³",
+            "PM10": f"{current.get('pm10', 'N/A')} μg/m³",
+            "Ozone (O3)": f"{current.get('ozone', 'N/A')} μg/m³",
+            "NO2": f"{current.get('nitrogen_dioxide', 'N/A')} μg/m³",
+            "CO": f"{current.get('carbon_monoxide', 'N/A')} μg/m³"
         }
+    }
+
+
+def _format_air_quality(response, location: str, name: str, country: str) -> str:
+    """Format an air quality response for the model."""
+    data = response.json()
+    
+    if response.status_code == 200 and "current" in data:
+        return json.dumps({
+            "location": f"{name}, {country}" if country else name,
+            **_air_quality_fields(data["current"])
+        }, indent=2)
+    else:
+        return f"Error: Unable to fetch air quality for {location}"
+
+
+@tool
+def get_weather_report(location: str, days: int = 3, include_aqi: bool = True) -> str:
+    """
+    Get a full weather briefing for a location: current conditions, daily forecast and
+    air quality in one call (Open-Meteo, FREE, no API key). Prefer this over calling
+    get_current_weather, get_weather_forecast and get_air_quality separately.
+    
+    Args:
+        location: City name or location (e.g., "London", "New York", "Tokyo")
+        days: Number of forecast days (1-7, default 3)
+        include_aqi: Include air quality (default True)
+    
+    Returns:
+        Current weather, forecast and (optionally) air quality for the location
+    """
+    try:
+        lat, lon, name, country = _get_coordinates(location)
+        if lat is None:
+            return f"Error: Could not find location '{location}'"
+        
+        days = max(1, min(days, 7))
+        key = f"report:{lat},{lon}:{days}:{int(include_aqi)}"
+        cached = _weather_cache.get(key, MISSING)
+        if cached is not MISSING:
+            return cached
+        
+        def load():
+            # Current + daily come from one forecast request; air quality runs alongside it
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                aqi_future = (
+                    pool.submit(http_get, AIR_QUALITY_API_URL, params=_air_quality_params(lat, lon))
+                    if include_aqi else None
+                )
+                response = http_get(WEATHER_API_URL, params=_report_params(lat, lon, days))
+                try:
+                    aqi_response = aqi_future.result() if aqi_future else None
+                except Exception as e:
+                    logger.error(f"Air Quality API error: {e}")
+                    aqi_response = e
+            return _store_report(key, response, aqi_response, location, days, lat, lon, name, country)
+        
+        return _coalescer.run(key, load)
+    except Exception as e:
+        logger.error(f"Weather report error: {e}")
+        return f"Error fetching weather report: {str(e)}"
+
+
+async def _aget_weather_report(location: str, days: int = 3, include_aqi: bool = True) -> str:
+    """Async variant of get_weather_report."""
+    try:
+        lat, lon, name, country = await _aget_coordinates(location)
+        if lat is None:
+            return f"Error: Could not find location '{location}'"
+        
+        days = max(1, min(days, 7))
+        key = f"report:{lat},{lon}:{days}:{int(include_aqi)}"
+        cached = _weather_cache.get(key, MISSING)
+        if cached is not MISSING:
+            return cached
         
-        response = httpx.get(AIR_QUALITY_API_URL, params=params, timeout=10.0)
-        data = response.json()
+        async def load():
+            requests = [ahttp_get(WEATHER_API_URL, params=_report_params(lat, lon, days))]
+            if include_aqi:
+                requests.append(ahttp_get(AIR_QUALITY_API_URL, params=_air_quality_params(lat, lon)))
+            responses = await asyncio.gather(*requests, return_exceptions=True)
+            if isinstance(responses[0], BaseException):
+                raise responses[0]
+            aqi_response = responses[1] if include_aqi else None
+            if isinstance(aqi_response, BaseException):
+                logger.error(f"Air Quality API error: {aqi_response}")
+            return _store_report(key, responses[0], aqi_response, location, days, lat, lon, name, country)
         
-        if response.status_code == 200 and "current" in data:
-            current = data["current"]
-            aqi = current.get('us_aqi', 0)
-            
-            # AQI level classification
-            if aqi <= 50:
-                aqi_level = "Good"
-            elif aqi <= 100:
-                aqi_level = "Moderate"
-            elif aqi <= 150:
-                aqi_level = "Unhealthy for Sensitive Groups"
-            elif aqi <= 200:
-                aqi_level = "Unhealthy"
-            elif aqi <= 300:
-                aqi_level = "Very Unhealthy"
-            else:
-                aqi_level = "Hazardous"
-            
-            return json.dumps({
-                "location": f"{name}, {country}" if country else name,
-                "aqi": aqi,
-                "aqi_level": aqi_level,
-                "pollutants": {
-                    "PM2.5": f"{current.get('pm2_5', 'N/A')} μg/m³",
-                    "PM10": f"{current.get('pm10', 'N/A')} μg/m³",
-                    "Ozone (O3)": f"{current.get('ozone', 'N/A')} μg/m³",
-                    "NO2": f"{current.get('nitrogen_dioxide', 'N/A')} μg/m³",
-                    "CO": f"{current.get('carbon_monoxide', 'N/A')} μg/m³"
-                }
-            }, indent=2)
+        return await _coalescer.arun(key, load)
+    except Exception as e:
+        logger.error(f"Weather report error: {e}")
+        return f"Error fetching weather report: {str(e)}"
+
+
+def _report_params(lat: float, lon: float, days: int) -> dict:
+    """Build query parameters for current conditions and a daily forecast in one request."""
+    return {
+        **_forecast_params(lat, lon, days),
+        "current": _current_weather_params(lat, lon)["current"]
+    }
+
+
+def _store_report(key: str, response, aqi_response, location: str, days: int,
+                  lat: float, lon: float, name: str, country: str) -> str:
+    """
+    Format a weather report and cache it when every part was fetched.
+    
+    `aqi_response` is None when air quality was not requested, or the exception
+    raised while fetching it (the report is still returned, without air quality).
+    """
+    data = response.json()
+    if response.status_code != 200 or "current" not in data or "daily" not in data:
+        return f"Error: Unable to fetch weather report for {location}"
+    
+    forecasts = _daily_forecasts(data["daily"], days)
+    report = {
+        "location": f"{name}, {country}" if country else name,
+        "coordinates": {"lat": lat, "lon": lon},
+        "current": _current_fields(data["current"]),
+        "forecast_days": len(forecasts),
+        "forecast": forecasts
+    }
+    complete = True
+    if aqi_response is not None:
+        aqi_data = None if isinstance(aqi_response, BaseException) else aqi_response.json()
+        if aqi_data is not None and aqi_response.status_code == 200 and "current" in aqi_data:
+            report["air_quality"] = _air_quality_fields(aqi_data["current"])
         else:
-            return f"Error: Unable to fetch air quality for {location}"
+            report["air_quality"] = "unavailable"
+            complete = False
+    
+    result = json.dumps(report, indent=2)
+    if complete:
+        _weather_cache.set(key, result)
+    return result
+
+
+@tool
+def get_weather_for_locations(locations: list[str]) -> str:
+    """
+    Compare current weather and today's forecast across several locations at once
+    (Open-Meteo, FREE, no API key). Use this instead of repeated get_current_weather
+    calls when comparing places.
+    
+    Args:
+        locations: City names (e.g., ["London", "Paris", "Berlin"]), max 10
+    
+    Returns:
+        One compact table with conditions per location
+    """
+    try:
+        names = _normalize_locations(locations)
+        if not names:
+            return "Error: No locations given"
+        
+        # Geocode in parallel (cached coordinates return immediately)
+        with ThreadPoolExecutor(max_workers=min(len(names), GEOCODE_WORKERS)) as pool:
+            places = list(pool.map(_get_coordinates, names))
+        
+        rows, missing = _cached_rows(places)
+        if missing:
+            try:
+                response = http_get(WEATHER_API_URL, params=_bulk_params(missing))
+                rows.update(_parse_bulk(response, missing))
+            except Exception as e:
+                logger.error(f"Bulk weather request failed: {e}")
+        
+        return _format_locations_table(names, places, rows)
     except Exception as e:
-        logger.error(f"Air Quality API error: {e}")
-        return f"Error fetching air quality: {str(e)}"
+        logger.error(f"Multi-location weather error for {locations}: {e}")
+        return f"Error fetching weather for {locations}: {str(e)}"
+
+
+async def _aget_weather_for_locations(locations: list[str]) -> str:
+    """Async variant of get_weather_for_locations."""
+    try:
+        names = _normalize_locations(locations)
+        if not names:
+            return "Error: No locations given"
+        
+        places = await asyncio.gather(*(_aget_coordinates(name) for name in names))
+        
+        rows, missing = _cached_rows(places)
+        if missing:
+            try:
+                response = await ahttp_get(WEATHER_API_URL, params=_bulk_params(missing))
+                rows.update(_parse_bulk(response, missing))
+            except Exception as e:
+                logger.error(f"Bulk weather request failed: {e}")
+        
+        return _format_locations_table(names, places, rows)
+    except Exception as e:
+        logger.error(f"Multi-location weather error for {locations}: {e}")
+        return f"Error fetching weather for {locations}: {str(e)}"
+
+
+def _normalize_locations(locations) -> list:
+    """Strip and deduplicate locations (a semicolon-separated string is also accepted)."""
+    if isinstance(locations, str):
+        locations = locations.split(";")
+    names = []
+    seen = set()
+    for location in locations:
+        name = " ".join(str(location).split())
+        if name and _normalize_location(name) not in seen:
+            seen.add(_normalize_location(name))
+            names.append(name)
+    return names[:MAX_LOCATIONS]
+
+
+def _cached_rows(places: list) -> tuple:
+    """Split geocoded places into ({(lat, lon): table row} from the cache, [(lat, lon) to fetch])."""
+    rows = {}
+    missing = []
+    for lat, lon, _, _ in places:
+        if lat is None or (lat, lon) in rows or (lat, lon) in missing:
+            continue
+        cached = _weather_cache.get(f"row:{lat},{lon}", MISSING)
+        if cached is MISSING:
+            missing.append((lat, lon))
+        else:
+            rows[(lat, lon)] = cached
+    return rows, missing
+
+
+def _bulk_params(coordinates: list) -> dict:
+    """Build one forecast request for many coordinates (comma-separated lists)."""
+    return {
+        "latitude": ",".join(str(lat) for lat, _ in coordinates),
+        "longitude": ",".join(str(lon) for _, lon in coordinates),
+        "current": "temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m",
+        "daily": "temperature_2m_max,temperature_2m_min,precipitation_probability_max",
+        "timezone": "auto",
+        "forecast_days": 1
+    }
+
+
+def _parse_bulk(response, coordinates: list) -> dict:
+    """Turn a bulk forecast response into {(lat, lon): table row} and cache each row."""
+    if response.status_code != 200:
+        return {}
+    data = response.json()
+    # A single coordinate comes back as an object, several as a list in request order
+    results = data if isinstance(data, list) else [data]
+    rows = {}
+    for (lat, lon), result in zip(coordinates, results):
+        current, daily = result.get("current"), result.get("daily")
+        if not current or not daily:
+            continue
+        row = " | ".join([
+            f"{current['temperature_2m']}°C",
+            f"{current['apparent_temperature']}°C",
+            _get_weather_description(current['weather_code']),
+            f"{current['relative_humidity_2m']}%",
+            f"{current['wind_speed_10m']} km/h",
+            f"{daily['temperature_2m_max'][0]}°C / {daily['temperature_2m_min'][0]}°C",
+            f"{daily['precipitation_probability_max'][0]}%"
+        ])
+        _weather_cache.set(f"row:{lat},{lon}", row)
+        rows[(lat, lon)] = row
+    return rows
+
+
+def _format_locations_table(names: list, places: list, rows: dict) -> str:
+    """Format one pipe-separated comparison row per requested location."""
+    lines = ["location | temperature | feels like | conditions | humidity | wind | today high / low | rain chance"]
+    for location, (lat, lon, name, country) in zip(names, places):
+        label = f"{name}, {country}" if country else name
+        if lat is None:
+            lines.append(f"{location} | Error: Could not find location")
+        elif (lat, lon) in rows:
+            lines.append(f"{label} | {rows[(lat, lon)]}")
+        else:
+            lines.append(f"{label} | Error: Unable to fetch weather data")
+    return "\n".join(lines)
+
 
+# Register async implementations as tool coroutines
+get_current_weather.coroutine = _aget_current_weather
+get_weather_forecast.coroutine = _aget_weather_forecast
+get_air_quality.coroutine = _aget_air_quality
+get_weather_report.coroutine = _aget_weather_report
+get_weather_for_locations.coroutine = _aget_weather_for_locations
 
 # Export all weather tools
 WEATHER_TOOLS = [
     get_current_weather,
     get_weather_forecast,
-    get_air_quality
+    get_air_quality,
+    get_weather_report,
+    get_weather_for_locations
 ]
@@ -0,0 +1,195 @@
+"""
+Prefetch - Background Warm-Up of Popular MCP Queries
+
+PrefetchScheduler watches the tool calls the agent makes and, on a worker
+thread, periodically re-runs the most requested ones (cities, tickers, news
+categories) so their results are already in the MCP caches when users ask.
+
+Refreshes run inside `force_refresh()`, so the weather and stock caches refetch
+and re-store even entries that are still fresh. News tools are not re-run;
+their feeds are revalidated in the feed cache directly, which keeps background
+traffic out of the news dedup index.
+
+- Popularity is counted over a sliding window of recent tool calls
+- The top N queries per upstream host are refreshed each cycle (a query
+  that calls several hosts counts against each of them)
+- Each upstream host has its own request rate limit, applied to every host
+  a refresh calls
+- A small worker pool caps how many background calls run at once
+
+Configuration (environment variables, all optional):
+- AGENT_PREFETCH: Enable the scheduler (default: "false")
+- AGENT_PREFETCH_INTERVAL: Seconds between refresh cycles (default: 120)
+- AGENT_PREFETCH_TOP_N: Queries refreshed per upstream host per cycle (default: 5)
+- AGENT_PREFETCH_CONCURRENCY: Max background tool calls in flight (default: 2)
+- AGENT_PREFETCH_HOST_RATE: Max background calls per second per host (default: 1)
+- AGENT_PREFETCH_WINDOW: Seconds of tool-call history used for popularity (default: 3600)
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence
+
+from .mcp.cache import force_refresh
+from .mcp.news_mcp import FEED_REFRESHERS
+
+logger = logging.getLogger(__name__)
+
+# Tools worth warming, by the upstream hosts they call
+PREFETCH_HOSTS = {
+    "get_current_weather": ("api.open-meteo.com",),
+    "get_weather_forecast": ("api.open-meteo.com",),
+    "get_air_quality": ("air-quality-api.open-meteo.com",),
+    "get_weather_report": ("api.open-meteo.com", "air-quality-api.open-meteo.com"),
+    "get_weather_for_locations": ("api.open-meteo.com",),
+    "get_stock_quote": ("query1.finance.yahoo.com",),
+    "get_stock_quotes": ("query1.finance.yahoo.com",),
+    "get_stock_history": ("query1.finance.yahoo.com",),
+    "get_company_info": ("query1.finance.yahoo.com",),
+    "get_top_headlines": ("news.google.com",),
+    "search_news": ("news.google.com",),
+}
+
+
+class HostRateLimiter:
+    """Spaces out calls to each host to at most `rate` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str, stop: Optional[threading.Event] = None) -> bool:
+        """Block until the host's next slot; returns False if `stop` was set meanwhile."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            if stop is not None:
+                return not stop.wait(delay)
+            time.sleep(delay)
+        return True
+
+
+class PrefetchScheduler:
+    """Refreshes the most requested MCP queries on a background thread."""
+
+    def __init__(
+        self,
+        tools: Sequence,
+        interval: float = 120.0,
+        top_n: int = 5,
+        max_concurrency: int = 2,
+        host_rate: float = 1.0,
+        window: float = 3600.0,
+        max_history: int = 5000
+    ):
+        self.tools = {t.name: t for t in tools if t.name in PREFETCH_HOSTS}
+        self.interval = interval
+        self.top_n = top_n
+        self.window = window
+        self._history = deque(maxlen=max_history)  # (monotonic time, query key)
+        self._queries = {}  # query key -> (tool name, args)
+        self._lock = threading.Lock()
+        self._limiter = HostRateLimiter(host_rate)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="mcp-prefetch")
+        self._stop = threading.Event()
+        self._thread = None
+        self.refreshed = 0
+
+    @classmethod
+    def from_env(cls, tools: Sequence) -> "PrefetchScheduler":
+        """Create a scheduler configured from AGENT_PREFETCH_* environment variables."""
+        return cls(
+            tools,
+            interval=float(os.getenv("AGENT_PREFETCH_INTERVAL", "120")),
+            top_n=int(os.getenv("AGENT_PREFETCH_TOP_N", "5")),
+            max_concurrency=int(os.getenv("AGENT_PREFETCH_CONCURRENCY", "2")),
+            host_rate=float(os.getenv("AGENT_PREFETCH_HOST_RATE", "1")),
+            window=float(os.getenv("AGENT_PREFETCH_WINDOW", "3600"))
+        )
+
+    def record(self, name: str, args: dict) -> None:
+        """Record an interactive tool call (called by the tool node)."""
+        if name not in self.tools:
+            return
+        key = name + json.dumps(args, sort_keys=True, default=str).lower()
+        with self._lock:
+            self._history.append((time.monotonic(), key))
+            self._queries.setdefault(key, (name, args))
+
+    def popular(self) -> list:
+        """Get the top_n most requested queries per upstream host within the window."""
+        cutoff = time.monotonic() - self.window
+        with self._lock:
+            while self._history and self._history[0][0] < cutoff:
+                self._history.popleft()
+            counts = Counter(key for _, key in self._history)
+            # Forget queries that fell out of the window
+            self._queries = {k: v for k, v in self._queries.items() if k in counts}
+            queries = dict(self._queries)
+
+        per_host = Counter()
+        selected = []
+        for key, _ in counts.most_common():
+            name, args = queries[key]
+            hosts = PREFETCH_HOSTS[name]
+            # A query that calls several hosts needs a slot on each of them
+            if all(per_host[host] < self.top_n for host in hosts):
+                per_host.update(hosts)
+                selected.append((name, args))
+        return selected
+
+    def _refresh(self, name: str, args: dict) -> None:
+        for host in PREFETCH_HOSTS[name]:
+            if not self._limiter.wait(host, self._stop):
+                return
+        try:
+            with force_refresh():
+                if name in FEED_REFRESHERS:
+                    FEED_REFRESHERS[name](args)
+                else:
+                    self.tools[name].func(**args)
+            self.refreshed += 1
+        except Exception as e:
+            logger.warning(f"Prefetch of {name} failed: {e}")
+
+    def run_once(self) -> int:
+        """Refresh the popular queries now; returns how many were scheduled."""
+        selected = self.popular()
+        futures = [self._executor.submit(self._refresh, name, args) for name, args in selected]
+        for future in futures:
+            future.result()
+        if selected:
+            logger.info(f"Prefetched {len(selected)} popular queries")
+        return len(selected)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Prefetch cycle failed: {e}")
+
+    def start(self) -> None:
+        """Start the background thread (no-op if already running)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="mcp-prefetch-scheduler", daemon=True)
+            self._thread.start()
+            logger.info(f"Prefetch scheduler started (every {self.interval:g}s)")
+
+    def stop(self) -> None:
+        """Stop the background thread and worker pool."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
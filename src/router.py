@@ -0,0 +1,89 @@
+"""
+Router - Lightweight Local Skill Routing
+
+Picks the skill(s) relevant to a request before the LLM is called, so only those
+skills' SKILL.md content goes into the system prompt and only their tools are
+bound to the model. Routing uses keyword indexes built from each skill's
+frontmatter:
+
+    ---
+    name: Weather Forecaster
+    tools: get_current_weather, get_weather_forecast, get_air_quality
+    keywords: weather, forecast, temperature, rain
+    ---
+
+Keywords match case-insensitively as whole words, plus a plural "s"/"es"
+("stock" matches "stocks" but "dow" does not match "download"). List other
+inflections ("hiring", "cloudy") as keywords of their own.
+"""
+
+import re
+import logging
+from functools import lru_cache
+
+from .skill_registry import split_list
+
+logger = logging.getLogger(__name__)
+
+# A keyword-less message reuses the previous routing only if it reads like a follow-up
+FOLLOW_UP_MAX_WORDS = 8
+FOLLOW_UP_PATTERN = re.compile(
+    r"^\W*(?:and|also|what about|how about|what of|same|then|now|ok|okay|and for|and in)\b",
+    re.IGNORECASE
+)
+
+
+class SkillRouter:
+    """Keyword router mapping a user message to the relevant skills."""
+
+    def __init__(self, skills: dict):
+        """
+        Args:
+            skills: Mapping of skill name -> frontmatter dict (needs `keywords`, `tools`)
+        """
+        self.skill_names = list(skills.keys())
+        self.skill_tools = {}
+        self._patterns = {}
+        for name, meta in skills.items():
+            self.skill_tools[name] = split_list(meta.get("tools"))
+            keywords = split_list(meta.get("keywords"))
+            if keywords:
+                alternatives = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+                self._patterns[name] = re.compile(rf"(?<!\w)(?:{alternatives})(?:e?s)?(?!\w)", re.IGNORECASE)
+        self.route = lru_cache(maxsize=1024)(self._route)
+
+    def _route(self, text: str) -> tuple:
+        """Get the skills whose keywords appear in `text` (empty tuple if none)."""
+        return tuple(
+            name for name in self.skill_names
+            if name in self._patterns and self._patterns[name].search(text)
+        )
+
+    @staticmethod
+    def is_follow_up(text: str) -> bool:
+        """Check whether `text` is a short follow-up ("what about Paris?") to the previous request."""
+        return len(text.split()) <= FOLLOW_UP_MAX_WORDS and bool(FOLLOW_UP_PATTERN.match(text))
+
+    def route_messages(self, messages: list) -> tuple:
+        """
+        Route on the latest user message. A keyword-less follow-up ("what about
+        Paris?") inherits the routing of the message it follows up on; anything
+        else unmatched gets all skills.
+        """
+        human = [m.content for m in messages if m.type == "human" and isinstance(m.content, str)]
+        for text in reversed(human):
+            skills = self.route(text)
+            if skills:
+                return skills
+            if not self.is_follow_up(text):
+                break
+        return tuple(self.skill_names)
+
+    def tools_for(self, skill_names: tuple) -> list:
+        """Get the tool names bound for a set of skills (in skill order, deduplicated)."""
+        names = []
+        for skill in skill_names:
+            for tool_name in self.skill_tools.get(skill, []):
+                if tool_name not in names:
+                    names.append(tool_name)
+        return names
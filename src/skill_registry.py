@@ -0,0 +1,156 @@
+"""
+Skill Registry - Lazy, Cached Skill Discovery with Hot Reload
+
+Discovers `<skills_dir>/<skill>/SKILL.md` files. At startup only the YAML-style
+frontmatter block of each file is read (name, description, mcp_server, tools,
+keywords, ...); the full body is loaded the first time a prompt needs it.
+
+Parsed results are cached keyed on file (mtime, size). `refresh()` re-stats the files
+(at most once per `reload_interval` seconds) and reloads only skills that were
+added, changed or removed, bumping `version` so callers can rebuild derived
+state without restarting the process.
+"""
+
+import re
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_FRONTMATTER_RE = re.compile(r"\A---\s*\n(.*?)\n---\s*(?:\n|\Z)", re.DOTALL)
+
+
+def parse_frontmatter(text: str) -> dict:
+    """Parse the simple `key: value` frontmatter block at the top of a SKILL.md file."""
+    match = _FRONTMATTER_RE.match(text)
+    if not match:
+        return {}
+    meta = {}
+    for line in match.group(1).splitlines():
+        if ":" in line and not line.startswith((" ", "\t", "#")):
+            key, value = line.split(":", 1)
+            meta[key.strip()] = value.strip()
+    return meta
+
+
+def split_list(value: Optional[str]) -> list:
+    """Split a comma-separated (optionally [bracketed]) frontmatter value."""
+    if not value:
+        return []
+    return [item.strip().strip("'\"") for item in value.strip("[]").split(",") if item.strip()]
+
+
+def _read_frontmatter(path: Path) -> dict:
+    """Read only the frontmatter lines of a SKILL.md file."""
+    lines = []
+    with path.open(encoding="utf-8") as f:
+        first = f.readline()
+        if first.strip() != "---":
+            return {}
+        lines.append(first)
+        for line in f:
+            lines.append(line)
+            if line.strip() == "---":
+                break
+    return parse_frontmatter("".join(lines))
+
+
+class SkillEntry:
+    """One discovered skill: frontmatter is loaded eagerly, the body lazily."""
+
+    def __init__(self, name: str, path: Path, mtime: tuple, meta: dict):
+        self.name = name
+        self.path = path
+        self.mtime = mtime
+        self.meta = meta
+        self._body = None
+
+    @property
+    def body(self) -> str:
+        """Full SKILL.md content (read on first access)."""
+        if self._body is None:
+            self._body = self.path.read_text(encoding="utf-8")
+        return self._body
+
+
+class SkillRegistry:
+    """Registry of skills in a directory with mtime-keyed caching and hot reload."""
+
+    def __init__(self, skills_dir: Path, reload_interval: float = 2.0):
+        """
+        Args:
+            skills_dir: Directory containing one folder per skill
+            reload_interval: Min seconds between change checks (0 disables hot reload)
+        """
+        self.skills_dir = Path(skills_dir)
+        self.reload_interval = reload_interval
+        self.version = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._scan()
+
+    @staticmethod
+    def _display_name(folder: str) -> str:
+        return folder.replace('_', ' ').title()
+
+    def _scan(self) -> bool:
+        """Re-stat skill files and reload changed frontmatter; returns True if anything changed."""
+        found = {}
+        if self.skills_dir.exists():
+            for skill_path in sorted(self.skills_dir.iterdir()):
+                skill_file = skill_path / "SKILL.md"
+                if skill_path.is_dir() and not skill_path.name.startswith('_') and skill_file.exists():
+                    found[self._display_name(skill_path.name)] = skill_file
+
+        changed = False
+        entries = {}
+        for name, skill_file in found.items():
+            try:
+                stat = skill_file.stat()
+                mtime = (stat.st_mtime_ns, stat.st_size)
+                entry = self._entries.get(name)
+                if entry is None or entry.mtime != mtime or entry.path != skill_file:
+                    entry = SkillEntry(name, skill_file, mtime, _read_frontmatter(skill_file))
+                    changed = True
+                    logger.info(f"Loaded skill frontmatter: {name}")
+                entries[name] = entry
+            except Exception as e:
+                logger.error(f"Failed to load skill {skill_file.parent.name}: {e}")
+        if set(entries) != set(self._entries):
+            changed = True
+
+        self._entries = entries
+        self._last_check = time.monotonic()
+        if changed:
+            self.version += 1
+        return changed
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload changed skills if the reload interval has elapsed; returns True on change."""
+        if not force and (not self.reload_interval or time.monotonic() - self._last_check < self.reload_interval):
+            return False
+        with self._lock:
+            return self._scan()
+
+    def names(self) -> list:
+        """Get skill names in discovery order."""
+        return list(self._entries.keys())
+
+    def meta(self, name: str) -> dict:
+        """Get a skill's frontmatter."""
+        return self._entries[name].meta
+
+    def body(self, name: str) -> str:
+        """Get a skill's full SKILL.md content (loaded lazily, cached until the file changes)."""
+        return self._entries[name].body
+
+    def all_meta(self) -> dict:
+        """Get {name: frontmatter} for all skills."""
+        return {name: entry.meta for name, entry in self._entries.items()}
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,134 @@
+"""
+Tool Node - Concurrent MCP Tool Execution
+
+Builds the LangGraph tool node used by MultiSkillsAgent. When the model emits
+several tool calls in one turn (e.g. quotes for AAPL, MSFT and NVDA), the calls
+run concurrently on a bounded worker pool instead of one after another.
+
+Guarantees:
+- Results are returned in the original tool-call order
+- Each call has its own timeout; a slow upstream only fails its own call
+- Errors are isolated per call and reported back to the model as ToolMessages
+- An optional `on_call(name, args)` hook sees every call (used by the prefetcher)
+
+A sync call that times out cannot be interrupted: its worker keeps running until
+the tool returns. Keep `max_workers` above the number of calls you expect to be
+stuck on a slow upstream at once, or later calls will queue behind them.
+"""
+
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional, Sequence
+
+from langchain_core.messages import ToolMessage
+from langgraph.errors import GraphBubbleUp
+from langgraph.prebuilt import ToolNode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TOOL_TIMEOUT = 15.0
+
+
+class ParallelToolRunner:
+    """Runs individual tool calls on a bounded thread pool with a per-call timeout."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: float = DEFAULT_TOOL_TIMEOUT,
+        on_call: Optional[Callable[[str, dict], None]] = None
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.on_call = on_call
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-tool")
+
+    def _error_message(self, request, error: str) -> ToolMessage:
+        """Build the error ToolMessage returned in place of a failed tool call."""
+        name = request.tool_call["name"]
+        return ToolMessage(
+            content=f"Error: {name} {error}",
+            name=name,
+            tool_call_id=request.tool_call["id"],
+            status="error"
+        )
+
+    def _timeout_message(self, request) -> ToolMessage:
+        """Build the error message returned when a tool call exceeds its budget."""
+        logger.warning(f"Tool call {request.tool_call['name']} timed out after {self.timeout}s")
+        return self._error_message(request, f"timed out after {self.timeout:g}s")
+
+    def _failure_message(self, request, exc: Exception) -> ToolMessage:
+        """Build the error message returned when a tool call raises."""
+        logger.error(f"Tool call {request.tool_call['name']} failed: {exc}")
+        return self._error_message(request, f"failed: {exc}")
+
+    def _notify(self, request) -> None:
+        """Report the call to the `on_call` hook; hook failures never affect the call."""
+        if self.on_call is None:
+            return
+        try:
+            self.on_call(request.tool_call["name"], request.tool_call.get("args") or {})
+        except Exception as e:
+            logger.warning(f"Tool call hook failed: {e}")
+
+    def wrap(self, request, execute):
+        """Sync wrapper: run one tool call on the pool and wait up to `timeout`."""
+        self._notify(request)
+        ctx = contextvars.copy_context()
+        future = self._executor.submit(ctx.run, execute, request)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Only drops the call if it is still queued; a running call holds its worker
+            future.cancel()
+            return self._timeout_message(request)
+        except GraphBubbleUp:
+            # Interrupts are control flow for the graph, not tool failures
+            raise
+        except Exception as e:
+            return self._failure_message(request, e)
+
+    async def awrap(self, request, execute):
+        """Async wrapper: await one tool call for up to `timeout`."""
+        self._notify(request)
+        try:
+            return await asyncio.wait_for(execute(request), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return self._timeout_message(request)
+        except GraphBubbleUp:
+            # Interrupts are control flow for the graph, not tool failures
+            raise
+        except Exception as e:
+            return self._failure_message(request, e)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool without waiting for in-flight calls."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def build_tool_node(
+    tools: Sequence,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout: float = DEFAULT_TOOL_TIMEOUT,
+    on_call: Optional[Callable[[str, dict], None]] = None
+) -> tuple:
+    """
+    Build a ToolNode that executes independent tool calls concurrently.
+
+    Args:
+        on_call: Optional hook called with (tool name, args) for every tool call
+
+    Returns:
+        (tool_node, runner) - the runner owns the worker pool and must be shut down
+    """
+    runner = ParallelToolRunner(max_workers=max_workers, timeout=timeout, on_call=on_call)
+    node = ToolNode(
+        tools,
+        wrap_tool_call=runner.wrap,
+        awrap_tool_call=runner.awrap
+    )
+    return node, runner
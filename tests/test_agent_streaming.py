@@ -0,0 +1,71 @@
+"""Tests for the token/tool event stream of src.agent.MultiSkillsAgent."""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+
+from src.agent import MultiSkillsAgent
+
+CALL = {"name": "get_stock_quote", "args": {"ticker": "AAPL"}, "id": "call-1"}
+
+STREAM = [
+    ("messages", (AIMessageChunk(content=""), {"langgraph_node": "agent"})),
+    ("updates", {"agent": {"messages": [AIMessage(content="", tool_calls=[CALL])]}}),
+    ("messages", (ToolMessage(content="quote", tool_call_id="call-1"), {"langgraph_node": "tools"})),
+    ("updates", {"tools": {"messages": [ToolMessage(content="quote", name="get_stock_quote", tool_call_id="call-1")]}}),
+    ("messages", (AIMessageChunk(content=[{"type": "text", "text": "AAPL is "}]), {"langgraph_node": "agent"})),
+    ("messages", (AIMessageChunk(content="$105"), {"langgraph_node": "agent"})),
+    ("updates", {"agent": {"messages": [AIMessage(content="AAPL is $105")]}}),
+]
+
+
+class FakeExecutor:
+    """Replays a fixed LangGraph stream, then optionally fails."""
+
+    def __init__(self, items, error=None):
+        self.items = items
+        self.error = error
+
+    def stream(self, inputs, config=None, stream_mode=None):
+        assert stream_mode == ["messages", "updates"]
+        yield from self.items
+        if self.error:
+            raise self.error
+
+    async def astream(self, inputs, config=None, stream_mode=None):
+        for item in self.stream(inputs, config, stream_mode):
+            yield item
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.delenv("AGENT_PREFETCH", raising=False)
+    agent = MultiSkillsAgent()
+    yield agent
+    agent.close()
+
+
+def test_stream_yields_tokens_and_tool_events(agent):
+    agent.agent_executor = FakeExecutor(STREAM)
+    assert list(agent.stream_request("price of apple?")) == [
+        {"type": "tool_start", "name": "get_stock_quote", "args": {"ticker": "AAPL"}},
+        {"type": "tool_end", "name": "get_stock_quote", "content": "quote"},
+        {"type": "token", "content": "AAPL is "},
+        {"type": "token", "content": "$105"},
+    ]
+
+
+def test_stream_reports_failures_as_error_event(agent):
+    agent.agent_executor = FakeExecutor(STREAM[:1], error=RuntimeError("boom"))
+    assert list(agent.stream_request("hi")) == [{"type": "error", "content": "Error: boom"}]
+
+
+def test_async_stream_matches_sync(agent):
+    agent.agent_executor = FakeExecutor(STREAM)
+
+    async def collect():
+        return [event async for event in agent.astream_request("price of apple?")]
+
+    assert asyncio.run(collect()) == list(agent.stream_request("price of apple?"))
@@ -0,0 +1,36 @@
+"""Tests for per-thread bookkeeping in src.agent.MultiSkillsAgent."""
+
+import pytest
+
+from src.agent import MultiSkillsAgent
+from src.checkpoint import SqliteCheckpointSaver
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.delenv("AGENT_THREAD_IDLE_TTL", raising=False)
+    monkeypatch.delenv("AGENT_PREFETCH", raising=False)
+
+
+def test_no_idle_tracking_without_ttl(tmp_path):
+    agent = MultiSkillsAgent(checkpointer=SqliteCheckpointSaver(str(tmp_path / "ck.sqlite3")))
+    try:
+        assert agent.thread_idle_ttl == 0
+        for i in range(100):
+            agent._thread_config(f"thread-{i}")
+        assert agent._thread_last_seen == {}
+    finally:
+        agent.close()
+
+
+def test_idle_threads_are_tracked_and_evicted():
+    agent = MultiSkillsAgent(thread_idle_ttl=30)
+    try:
+        agent._thread_config("old")
+        agent._thread_last_seen["old"] -= 60
+        agent._last_eviction -= 60
+        agent._thread_config("new")
+        assert list(agent._thread_last_seen) == ["new"]
+    finally:
+        agent.close()
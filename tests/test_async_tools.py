@@ -0,0 +1,66 @@
+"""Tests for the async-native MCP tool variants (tool.ainvoke) against fake upstreams."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.mcp import ALL_MCP_TOOLS, http_client, stock_mcp
+from src.mcp.cache import TTLCache
+from src.mcp.database_mcp import get_employee_by_id, search_employees
+
+
+def _chart(request: httpx.Request) -> httpx.Response:
+    symbol = request.url.path.rsplit("/", 1)[-1]
+    return httpx.Response(200, json={"chart": {"result": [{"meta": {
+        "symbol": symbol, "regularMarketPrice": 105.0, "previousClose": 100.0, "marketState": "CLOSED"
+    }}]}})
+
+
+async def _with_async_upstream(handler, coro_factory):
+    """Run a coroutine with the shared async client replaced by a MockTransport client."""
+    http_client._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    http_client._async_client_loop = asyncio.get_running_loop()
+    http_client._async_host_semaphores = {}
+    try:
+        return await coro_factory()
+    finally:
+        await http_client.aclose_http_client()
+
+
+@pytest.fixture
+def stock_cache(monkeypatch):
+    monkeypatch.setattr(stock_mcp, "_stock_cache", TTLCache("test_stock", refreshable=True))
+
+
+def test_every_tool_has_a_coroutine():
+    assert [t.name for t in ALL_MCP_TOOLS if t.coroutine is None] == []
+
+
+def test_async_quote_matches_sync(stock_cache, monkeypatch):
+    monkeypatch.setattr(http_client, "_http_client", httpx.Client(transport=httpx.MockTransport(_chart)))
+    sync_result = stock_mcp.get_stock_quote.invoke({"ticker": "aapl"})
+    stock_mcp._stock_cache.clear()
+    async_result = asyncio.run(_with_async_upstream(
+        _chart, lambda: stock_mcp.get_stock_quote.ainvoke({"ticker": "aapl"})
+    ))
+    assert async_result == sync_result
+    assert '"change_percent": "+5.00%"' in async_result
+
+
+def test_async_client_is_recreated_for_a_new_event_loop():
+    async def client():
+        return http_client.get_async_http_client()
+
+    first = asyncio.run(client())
+    second = asyncio.run(client())
+    try:
+        assert first is not second
+    finally:
+        asyncio.run(http_client.aclose_http_client())
+
+
+def test_async_database_tools_match_sync():
+    assert asyncio.run(get_employee_by_id.ainvoke({"employee_id": 3})) == get_employee_by_id.invoke({"employee_id": 3})
+    args = {"query": "Engineering", "search_by": "department"}
+    assert asyncio.run(search_employees.ainvoke(args)) == search_employees.invoke(args)
@@ -0,0 +1,100 @@
+"""Tests for the TTL/LRU cache and request coalescing in src.mcp.cache."""
+
+import asyncio
+import threading
+import time
+
+from src.mcp import cache
+from src.mcp.cache import RequestCoalescer, TTLCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    entries = TTLCache("test_lru", maxsize=2)
+    entries.set("a", 1)
+    entries.set("b", 2)
+    assert entries.get("a") == 1
+    entries.set("c", 3)
+    assert entries.get("b") is None
+    assert entries.get("a") == 1 and entries.get("c") == 3
+    assert entries.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    entries = TTLCache("test_ttl", ttl=10)
+    entries.set("a", 1)
+    entries.set("b", 2, ttl=60)
+    now[0] += 11
+    assert entries.get("a") is None
+    assert entries.get("b") == 2
+    stats = entries.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["size"] == 1
+
+
+def test_persisted_entries_survive_reopen(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    entries = TTLCache("test_persist", persist_path=path)
+    entries.set("paris", [48.85, 2.35, "Paris", "France"])
+    entries.set("gone", 1, ttl=-1)
+    entries.close()
+
+    reopened = TTLCache("test_persist", persist_path=path)
+    try:
+        assert reopened.get("paris") == [48.85, 2.35, "Paris", "France"]
+        assert len(reopened) == 1
+        assert reopened.stats()["persistent"] is True
+    finally:
+        reopened.close()
+
+
+def test_concurrent_calls_share_one_load():
+    coalescer = RequestCoalescer()
+    started = threading.Event()
+    release = threading.Event()
+    loads = []
+
+    def load():
+        loads.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(coalescer.run("k", load)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(coalescer.run("k", load))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    while coalescer.coalesced < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+    assert results == ["value"] * 4
+    assert len(loads) == 1
+
+
+def test_async_calls_share_one_load_and_errors():
+    coalescer = RequestCoalescer()
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def main():
+        values = await asyncio.gather(*(coalescer.arun("k", load) for _ in range(4)))
+        errors = await asyncio.gather(*(coalescer.arun("e", fail) for _ in range(2)), return_exceptions=True)
+        return values, errors
+
+    values, errors = asyncio.run(main())
+    assert values == ["value"] * 4 and len(loads) == 1
+    assert [str(e) for e in errors] == ["upstream down"] * 2
+    assert coalescer.coalesced == 4
@@ -0,0 +1,123 @@
+"""Tests for the conversation checkpointers in src.checkpoint."""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from src.checkpoint import SqliteCheckpointSaver, ThreadIndexedMemorySaver
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "checkpoints.sqlite3")
+
+
+@pytest.fixture
+def saver(db_path):
+    saver = SqliteCheckpointSaver(db_path)
+    yield saver
+    saver.close()
+
+
+def _config(thread_id: str, checkpoint_id: str = None) -> dict:
+    configurable = {"thread_id": thread_id, "checkpoint_ns": ""}
+    if checkpoint_id:
+        configurable["checkpoint_id"] = checkpoint_id
+    return {"configurable": configurable}
+
+
+def _put(saver, thread_id: str, parent: dict = None, step: int = 0) -> dict:
+    checkpoint = empty_checkpoint()
+    return saver.put(parent or _config(thread_id), checkpoint, {"source": "loop", "step": step}, {})
+
+
+def _echo_graph(checkpointer):
+    builder = StateGraph(MessagesState)
+    builder.add_node("echo", lambda state: {"messages": [AIMessage(f"echo: {state['messages'][-1].content}")]})
+    builder.add_edge(START, "echo")
+    builder.add_edge("echo", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def test_get_latest_and_specific_checkpoint(saver):
+    first = _put(saver, "t1")
+    second = _put(saver, "t1", parent=first, step=1)
+
+    latest = saver.get_tuple(_config("t1"))
+    assert latest.config["configurable"]["checkpoint_id"] == second["configurable"]["checkpoint_id"]
+    assert latest.parent_config["configurable"]["checkpoint_id"] == first["configurable"]["checkpoint_id"]
+    assert latest.metadata["step"] == 1
+
+    older = saver.get_tuple(first)
+    assert older.metadata["step"] == 0
+    assert saver.get_tuple(_config("missing")) is None
+
+
+def test_list_filters_and_limits(saver):
+    config = _put(saver, "t1")
+    for step in range(1, 4):
+        config = _put(saver, "t1", parent=config, step=step)
+    _put(saver, "t2")
+
+    steps = [item.metadata["step"] for item in saver.list(_config("t1"))]
+    assert steps == [3, 2, 1, 0]
+    assert [item.metadata["step"] for item in saver.list(_config("t1"), limit=2)] == [3, 2]
+    assert [item.metadata["step"] for item in saver.list(_config("t1"), filter={"step": 2})] == [2]
+    assert len(list(saver.list(None))) == 5
+
+
+def test_delete_thread_only_removes_that_thread(saver):
+    _put(saver, "t1")
+    _put(saver, "t2")
+    saver.delete_thread("t1")
+    assert saver.get_tuple(_config("t1")) is None
+    assert saver.get_tuple(_config("t2")) is not None
+    assert saver.thread_ids() == ["t2"]
+
+
+def test_pending_writes_are_visible_to_other_connections(saver, db_path):
+    config = _put(saver, "t1")
+    saver.put_writes(config, [("messages", "partial result")], task_id="task-1")
+
+    other = SqliteCheckpointSaver(db_path)
+    try:
+        writes = other.get_tuple(config).pending_writes
+    finally:
+        other.close()
+    assert writes == [("task-1", "messages", "partial result")]
+
+
+def test_conversation_survives_reopen(db_path):
+    saver = SqliteCheckpointSaver(db_path)
+    config = {"configurable": {"thread_id": "chat"}}
+    _echo_graph(saver).invoke({"messages": [HumanMessage("hi")]}, config)
+    saver.close()
+
+    reopened = SqliteCheckpointSaver(db_path)
+    try:
+        result = _echo_graph(reopened).invoke({"messages": [HumanMessage("again")]}, config)
+    finally:
+        reopened.close()
+    assert [m.content for m in result["messages"]] == ["hi", "echo: hi", "again", "echo: again"]
+
+
+def test_memory_saver_deletes_one_thread():
+    saver = ThreadIndexedMemorySaver()
+    graph = _echo_graph(saver)
+    for thread_id in ("a", "b"):
+        graph.invoke({"messages": [HumanMessage(thread_id)]}, {"configurable": {"thread_id": thread_id}})
+    saver.delete_thread("a")
+    assert saver.thread_ids() == ["b"]
+    assert saver.get_tuple({"configurable": {"thread_id": "a"}}) is None
+
+
+def test_memory_saver_reads_do_not_resurrect_threads():
+    saver = ThreadIndexedMemorySaver()
+    graph = _echo_graph(saver)
+    graph.invoke({"messages": [HumanMessage("a")]}, {"configurable": {"thread_id": "a"}})
+    saver.delete_thread("a")
+    assert saver.get_tuple(_config("a")) is None
+    assert list(saver.list(_config("a"))) == []
+    assert saver.get_tuple(_config("never")) is None
+    assert saver.thread_ids() == []
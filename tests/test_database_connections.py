@@ -0,0 +1,77 @@
+"""Tests for the per-thread reader / single writer ConnectionManager in src.mcp.database_mcp."""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.mcp.database_mcp import ConnectionManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ConnectionManager(str(tmp_path / "employees.sqlite3"))
+    yield manager
+    manager.close()
+
+
+def _count(conn) -> int:
+    return conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+
+
+def test_each_thread_gets_its_own_reader(manager):
+    main_reader = manager.reader()
+    assert manager.reader() is main_reader
+    other = []
+    thread = threading.Thread(target=lambda: other.append(manager.reader()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main_reader
+
+
+def test_readers_cannot_write(manager):
+    with pytest.raises(sqlite3.OperationalError):
+        manager.reader().execute("DELETE FROM employees")
+
+
+def test_readers_see_committed_writes(manager):
+    reader = manager.reader()
+    before = _count(reader)
+    with manager.writer() as conn, conn:
+        conn.execute("DELETE FROM employees WHERE id = 1")
+    assert _count(reader) == before - 1
+
+
+def test_readers_of_exited_threads_are_closed(manager):
+    readers = []
+    thread = threading.Thread(target=lambda: readers.append(manager.reader()))
+    thread.start()
+    thread.join()
+    manager.reader()
+    with pytest.raises(sqlite3.ProgrammingError):
+        readers[0].execute("SELECT 1")
+
+
+def test_close_rejects_further_use(manager):
+    reader = manager.reader()
+    manager.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        reader.execute("SELECT 1")
+    with pytest.raises(RuntimeError, match="closed"):
+        manager.reader()
+    with pytest.raises(RuntimeError, match="closed"):
+        with manager.writer():
+            pass
+
+
+def test_memory_database_uses_a_temporary_file():
+    manager = ConnectionManager(":memory:")
+    path = Path(manager._reader_uri.split("file://", 1)[1].split("?", 1)[0])
+    try:
+        assert path.exists()
+        assert _count(manager.reader()) == 15
+        assert manager.reader().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        manager.close()
+    assert not path.exists()
@@ -0,0 +1,82 @@
+"""Tests for keyset pagination and page tokens in src.mcp.database_mcp."""
+
+import json
+
+import pytest
+
+from src.mcp import database_mcp
+from src.mcp.database_mcp import get_all_employees, search_employees
+
+
+def _pages(tool, **args) -> list:
+    """Follow next_page_token until the last page; returns every page."""
+    pages = [json.loads(tool.invoke(args))]
+    while pages[-1]["next_page_token"]:
+        pages.append(json.loads(tool.invoke({**args, "page_token": pages[-1]["next_page_token"]})))
+    return pages
+
+
+def test_token_round_trip():
+    token = database_mcp._encode_page_token("abc", {"id": 7, "total": 15})
+    assert database_mcp._decode_page_token(token, "abc") == {"id": 7, "total": 15}
+    assert database_mcp._decode_page_token("", "abc") == {}
+
+
+def test_malformed_token_is_rejected():
+    with pytest.raises(ValueError, match="Invalid page_token"):
+        database_mcp._decode_page_token("not a token!", "abc")
+
+
+def test_token_from_another_query_is_rejected():
+    token = database_mcp._encode_page_token("abc", {"id": 7})
+    with pytest.raises(ValueError, match="does not belong"):
+        database_mcp._decode_page_token(token, "xyz")
+
+
+def test_list_pages_cover_every_employee_once():
+    pages = _pages(get_all_employees, page_size=4)
+    ids = [e["id"] for page in pages for e in page["employees"]]
+    assert ids == list(range(1, 16))
+    assert [page["results_count"] for page in pages] == [4, 4, 4, 3]
+    assert all(page["total_estimate"] == 15 for page in pages)
+
+
+def test_search_token_cannot_be_replayed_on_another_query():
+    first = json.loads(search_employees.invoke({"query": "Engineering", "search_by": "department", "page_size": 2}))
+    result = search_employees.invoke({
+        "query": "Sales", "search_by": "department", "page_size": 2, "page_token": first["next_page_token"]
+    })
+    assert result.startswith("Error:")
+
+
+@pytest.mark.parametrize("query,field,expected", [
+    ("Engineering", "department", 6),
+    ("san", "city", 4),
+    ("Francisco", "city", 4),
+    ("York", "city", 2),
+    ("Engineer", "title", 3),
+])
+def test_search_pages_are_complete_and_ordered(query, field, expected):
+    pages = _pages(search_employees, query=query, search_by=field, page_size=2)
+    employees = [e for page in pages for e in page["employees"]]
+    assert len(employees) == expected
+    assert len({e["id"] for e in employees}) == expected
+    if field in ("department", "city"):
+        keys = [(e[field].lower(), e["id"]) for e in employees]
+        assert keys == sorted(keys)
+
+
+def test_page_size_is_clamped():
+    page = json.loads(get_all_employees.invoke({"page_size": 0}))
+    assert page["results_count"] == 1
+
+
+@pytest.mark.parametrize("query", ["John Engineer", "Sarah Lead"])
+def test_multi_word_name_search_ignores_job_title(query):
+    result = json.loads(search_employees.invoke({"query": query, "search_by": "name"}))
+    assert result["employees"] == []
+
+
+def test_multi_word_name_search_matches_both_names():
+    result = json.loads(search_employees.invoke({"query": "sar john", "search_by": "name"}))
+    assert [(e["first_name"], e["last_name"]) for e in result["employees"]] == [("Sarah", "Johnson")]
@@ -0,0 +1,50 @@
+"""Tests for the trigger-maintained department statistics in src.mcp.database_mcp."""
+
+import json
+import statistics
+
+from src.mcp import database_mcp
+from src.mcp.database_mcp import _get_db, get_department_stats
+
+
+def test_stats_match_brute_force():
+    stats = json.loads(get_department_stats.invoke({}))
+    conn = _get_db()
+    assert stats["total_employees"] == conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+    for department in stats["departments"]:
+        salaries = [row[0] for row in conn.execute(
+            "SELECT salary FROM employees WHERE department = ?", (department["department"],)
+        )]
+        assert department["employee_count"] == len(salaries)
+        assert department["avg_salary"] == round(statistics.fmean(salaries), 2)
+        assert department["median_salary"] == round(statistics.median(salaries), 2)
+        if len(salaries) > 1:
+            cuts = statistics.quantiles(salaries, n=100, method="inclusive")
+            assert department["p25_salary"] == round(cuts[24], 2)
+            assert department["p75_salary"] == round(cuts[74], 2)
+            assert department["p90_salary"] == round(cuts[89], 2)
+
+
+def test_write_recomputes_only_the_changed_department(monkeypatch):
+    get_department_stats.invoke({})
+    calls = []
+    original = database_mcp._department_percentiles
+
+    def counting(conn, department, count):
+        calls.append(department)
+        return original(conn, department, count)
+
+    monkeypatch.setattr(database_mcp, "_department_percentiles", counting)
+    employee_id, salary = _get_db().execute(
+        "SELECT id, salary FROM employees WHERE department = 'Sales' ORDER BY id LIMIT 1"
+    ).fetchone()
+    with database_mcp._get_manager().writer() as conn, conn:
+        conn.execute("UPDATE employees SET salary = salary + 1000 WHERE id = ?", (employee_id,))
+    try:
+        get_department_stats.invoke({})
+        assert calls == ["Sales"]
+        get_department_stats.invoke({})
+        assert calls == ["Sales"]
+    finally:
+        with database_mcp._get_manager().writer() as conn, conn:
+            conn.execute("UPDATE employees SET salary = ? WHERE id = ?", (salary, employee_id))
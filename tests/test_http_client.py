@@ -0,0 +1,64 @@
+"""Tests for the shared pooled HTTP client in src.mcp.http_client."""
+
+import threading
+import time
+
+import httpx
+import pytest
+
+from src.mcp import http_client
+
+
+@pytest.fixture
+def fresh_client(monkeypatch):
+    monkeypatch.setattr(http_client, "_http_client", None)
+    monkeypatch.setattr(http_client, "_host_semaphores", {})
+    yield
+    http_client.close_http_client()
+
+
+def test_client_is_shared_until_closed(fresh_client):
+    client = http_client.get_http_client()
+    assert http_client.get_http_client() is client
+    http_client.close_http_client()
+    assert client.is_closed
+    assert http_client.get_http_client() is not client
+
+
+def test_limits_and_timeouts_come_from_environment(monkeypatch):
+    monkeypatch.setenv("MCP_HTTP_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("MCP_HTTP_KEEPALIVE_EXPIRY", "12.5")
+    monkeypatch.setenv("MCP_HTTP_TIMEOUT", "not a number")
+    limits = http_client.get_limits()
+    assert limits.max_connections == 7
+    assert limits.keepalive_expiry == 12.5
+    assert http_client.get_timeout().read == 10.0
+
+
+def test_http2_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("MCP_HTTP2", "false")
+    assert http_client._http2_available() is False
+
+
+def test_per_host_concurrency_is_bounded(fresh_client, monkeypatch):
+    monkeypatch.setenv("MCP_HTTP_MAX_PER_HOST", "2")
+    lock = threading.Lock()
+    active = [0, 0]  # current, peak
+
+    def upstream(request):
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return httpx.Response(200)
+
+    monkeypatch.setattr(http_client, "_http_client", httpx.Client(transport=httpx.MockTransport(upstream)))
+    threads = [threading.Thread(target=http_client.http_get, args=("https://api.example/x",)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert active[1] == 2
+    assert list(http_client._host_semaphores) == ["api.example"]
@@ -0,0 +1,115 @@
+"""Tests for the conditional-GET news feed cache in src.mcp.news_mcp."""
+
+import httpx
+import pytest
+
+from src.mcp import http_client, news_mcp
+from src.mcp.cache import TTLCache
+
+URL = "https://news.example/rss"
+
+FEED = (
+    b"<?xml version='1.0'?><rss><channel>"
+    b"<item><title>First story</title><link>https://a.example/1</link><source>A</source></item>"
+    b"<item><title>Second story</title><link>https://b.example/2</link><source>B</source></item>"
+    b"</channel></rss>"
+)
+
+
+class Upstream:
+    """Fake feed server that answers 304 when the client's ETag matches."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=self.body, headers={"ETag": '"v1"'})
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    def install(body: bytes) -> Upstream:
+        server = Upstream(body)
+        monkeypatch.setattr(http_client, "_http_client", httpx.Client(transport=httpx.MockTransport(server)))
+        return server
+
+    monkeypatch.setattr(news_mcp, "_feed_cache", TTLCache("test_feeds", maxsize=8, ttl=3600))
+    monkeypatch.setattr(news_mcp, "_fresh_hits", 0)
+    monkeypatch.setattr(news_mcp, "_feed_misses", 0)
+    monkeypatch.setattr(news_mcp, "_not_modified", 0)
+    return install
+
+
+def test_fresh_hit_then_revalidation(upstream):
+    server = upstream(FEED)
+    status, items = news_mcp._fetch_rss_items(URL, {})
+    assert status == 200 and [i["title"] for i in items] == ["First story", "Second story"]
+
+    news_mcp._fetch_rss_items(URL, {})
+    assert server.requests == 1
+
+    news_mcp._feed_cache.peek(news_mcp._feed_key(URL, {}))["fresh_until"] = 0
+    status, items = news_mcp._fetch_rss_items(URL, {})
+    assert status == 200 and len(items) == 2
+    assert server.requests == 2
+
+    stats = news_mcp.get_news_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["not_modified"] == 1
+
+
+def test_empty_feed_is_not_cached(upstream):
+    server = upstream(b"<?xml version='1.0'?><rss><channel></channel></rss>")
+    assert news_mcp._fetch_rss_items(URL, {}) == (200, [])
+    assert news_mcp._feed_cache.peek(news_mcp._feed_key(URL, {})) is None
+    news_mcp._fetch_rss_items(URL, {})
+    assert server.requests == 2
+
+
+def test_truncated_feed_is_not_cached(upstream):
+    server = upstream(FEED[:FEED.index(b"</item>") + 7] + b"<item><title>Broken</tit></item>")
+    status, items = news_mcp._fetch_rss_items(URL, {})
+    assert [i["title"] for i in items] == ["First story"]
+    assert news_mcp._feed_cache.peek(news_mcp._feed_key(URL, {})) is None
+    news_mcp._fetch_rss_items(URL, {})
+    assert server.requests == 2
+
+
+def test_feed_cut_off_between_elements_is_not_cached(upstream):
+    server = upstream(FEED[:FEED.index(b"</item>") + 7])
+    status, items = news_mcp._fetch_rss_items(URL, {})
+    assert [i["title"] for i in items] == ["First story"]
+    assert news_mcp._feed_cache.peek(news_mcp._feed_key(URL, {})) is None
+    news_mcp._fetch_rss_items(URL, {})
+    assert server.requests == 2
+
+
+def test_entities_are_decoded():
+    items = news_mcp._parse_rss_items(
+        b"<rss><channel><item><title>Rates &#8212; up &lt;1%&gt; &amp; more</title></item></channel></rss>"
+    )
+    assert items[0]["title"] == "Rates — up <1%> & more"
+
+
+def test_stream_stops_after_max_items(monkeypatch):
+    chunks = []
+
+    def body():
+        yield b"<?xml version='1.0'?><rss><channel>"
+        for n in range(news_mcp.FEED_MAX_ITEMS + 10):
+            chunks.append(n)
+            yield f"<item><title>Story {n}</title></item>".encode()
+        yield b"</channel></rss>"
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+    monkeypatch.setattr(http_client, "_http_client", httpx.Client(transport=transport))
+    monkeypatch.setattr(news_mcp, "_feed_cache", TTLCache("test_feeds", maxsize=8, ttl=3600))
+    status, items = news_mcp._fetch_rss_items(URL, {})
+    assert len(items) == news_mcp.FEED_MAX_ITEMS
+    assert len(chunks) == news_mcp.FEED_MAX_ITEMS
+    assert news_mcp._feed_cache.peek(news_mcp._feed_key(URL, {})) is not None
@@ -0,0 +1,96 @@
+"""Tests for near-duplicate collapsing and ranking in src.mcp.news_index."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.mcp import news_index
+from src.mcp.news_index import NewsIndex, normalize_title, similarity
+
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def _item(title: str, source: str, hours_ago: float = 1.0) -> dict:
+    published = (NOW - timedelta(hours=hours_ago)).strftime("%Y-%m-%d %H:%M")
+    return {"title": title, "source": source, "published": published, "url": f"https://{source}.example/"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [NOW.timestamp()]
+    monkeypatch.setattr(news_index.time, "time", lambda: now[0])
+    return now
+
+
+def test_normalize_strips_source_suffix_and_stopwords():
+    assert normalize_title("The Fed Raises Rates - Reuters", "Reuters") == {"fed", "raises", "rates"}
+
+
+def test_similarity_threshold_boundary():
+    at = similarity(normalize_title("alpha beta gamma delta"), normalize_title("alpha beta gamma omega"))
+    below = similarity(normalize_title("north south east west river"), normalize_title("north south east hill lake"))
+    assert at == pytest.approx(0.6)
+    assert below < 0.6
+
+
+def test_near_duplicates_collapse_at_threshold(clock):
+    index = NewsIndex()
+    ranked = index.rank([
+        _item("alpha beta gamma delta", "A"),
+        _item("alpha beta gamma omega - B", "B"),
+        _item("north south east west river", "C"),
+        _item("north south east hill lake", "D"),
+    ], 10)
+    assert len(index) == 3
+    assert index.stats()["collapsed"] == 1
+    assert ranked[0]["also_reported_by"] == ["B"]
+
+
+def test_sources_accumulate_across_calls(clock):
+    index = NewsIndex()
+    index.rank([_item("Fed raises interest rates quarter point", "Reuters")], 5)
+    index.rank([_item("Fed lifts interest rates quarter point", "AP")], 5)
+    ranked = index.rank([_item("Fed raises interest rates a quarter point - CNBC", "CNBC")], 5)
+    assert ranked[0]["source"] == "CNBC"
+    assert ranked[0]["also_reported_by"] == ["Reuters", "AP"]
+    assert len(index) == 1
+
+
+def test_stories_expire_after_ttl(clock):
+    index = NewsIndex(ttl=3600)
+    index.rank([_item("Fed raises interest rates quarter point", "Reuters")], 5)
+    clock[0] += 3601
+    ranked = index.rank([_item("Fed raises interest rates quarter point", "AP")], 5)
+    assert "also_reported_by" not in ranked[0]
+    assert len(index) == 1
+
+
+def test_least_recently_seen_story_is_evicted(clock):
+    index = NewsIndex(maxsize=2)
+    index.rank([_item("Storm hits coastal towns overnight", "A")], 5)
+    index.rank([_item("Chipmaker shares surge record quarter", "A")], 5)
+    index.rank([_item("Storm hits coastal towns overnight", "B")], 5)
+    index.rank([_item("Museum reopens after long renovation", "A")], 5)
+    assert len(index) == 2
+    ranked = index.rank([_item("Storm hits coastal towns overnight", "C")], 5)
+    assert ranked[0]["also_reported_by"] == ["A", "B"]
+    ranked = index.rank([_item("Chipmaker shares surge record quarter", "B")], 5)
+    assert "also_reported_by" not in ranked[0]
+
+
+def test_newer_stories_rank_first(clock):
+    ranked = NewsIndex().rank([
+        _item("Old budget vote delayed again", "A", hours_ago=20),
+        _item("Fresh earnings beat expectations", "B", hours_ago=1),
+    ], 2)
+    assert [item["source"] for item in ranked] == ["B", "A"]
+
+
+def test_repeat_sources_are_penalized(clock):
+    ranked = NewsIndex().rank([
+        _item("Storm hits coastal towns overnight", "A", hours_ago=1),
+        _item("Chipmaker shares surge record quarter", "A", hours_ago=1),
+        _item("Museum reopens after long renovation", "A", hours_ago=1),
+        _item("Budget vote delayed again", "B", hours_ago=4),
+    ], 2)
+    assert [item["source"] for item in ranked] == ["A", "B"]
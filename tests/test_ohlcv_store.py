@@ -0,0 +1,110 @@
+"""Tests for the local daily bar store in src.mcp.ohlcv_store."""
+
+import time
+
+import pytest
+
+from src.mcp.ohlcv_store import OHLCVStore, period_start
+from src.mcp.price_analytics import PriceSeries
+
+DAY = 86400
+
+
+def _series(start: int, days: int, close: float = 100.0) -> PriceSeries:
+    return PriceSeries.from_rows(
+        (start + i * DAY, close + i, close + i + 1, close + i - 1, close + i, 1000 + i) for i in range(days)
+    )
+
+
+def _fill(store: OHLCVStore, ticker: str, period: str):
+    """Fetch `period` the way get_stock_history does, serving bars from a fake upstream."""
+    params, anchor = store.plan(ticker, period)
+    first = params["period1"] - params["period1"] % DAY
+    days = (params["period2"] - first) // DAY
+    assert store.save(ticker, params, _series(first, days), anchor)
+    return params
+
+
+@pytest.fixture
+def store():
+    store = OHLCVStore(":memory:", refresh_interval=3600)
+    yield store
+    store.close()
+
+
+def test_empty_store_plans_full_range(store):
+    params, anchor = store.plan("AAPL", "1mo")
+    assert anchor is None
+    assert params["interval"] == "1d"
+    assert abs(params["period1"] - period_start("1mo")) <= 1
+    assert abs(params["period2"] - time.time()) <= 1
+
+
+def test_fresh_data_needs_no_fetch(store):
+    _fill(store, "AAPL", "1mo")
+    assert store.plan("AAPL", "1mo") == (None, None)
+    assert store.plan("AAPL", "5d") == (None, None)
+    assert len(store.read("AAPL", "1mo")) >= 28
+
+
+def test_longer_period_backfills_only_older_bars(store):
+    first = _fill(store, "AAPL", "1mo")
+    params, anchor = store.plan("AAPL", "1y")
+    assert anchor is None
+    assert params["period2"] == first["period1"]
+    assert abs(params["period1"] - period_start("1y")) <= 1
+
+
+def test_stale_data_refreshes_tail_from_last_completed_bar(store):
+    _fill(store, "AAPL", "1mo")
+    store.refresh_interval = 0
+    stored = store.read("AAPL", "1mo")
+    params, anchor = store.plan("AAPL", "1mo")
+    assert anchor == (stored.timestamps[-2], stored.close[-2])
+    assert params["period1"] == stored.timestamps[-2]
+
+
+def test_tail_refresh_appends_and_replaces_last_bar(store):
+    _fill(store, "AAPL", "1mo")
+    store.refresh_interval = 0
+    before = store.read("AAPL", "1mo")
+    params, anchor = store.plan("AAPL", "1mo")
+    tail = PriceSeries.from_rows([
+        (before.timestamps[-2], 1, 1, 1, before.close[-2], 1),
+        (before.timestamps[-1], 1, 1, 1, 555.0, 1),
+    ])
+    assert store.save("AAPL", params, tail, anchor)
+    after = store.read("AAPL", "1mo")
+    assert len(after) == len(before)
+    assert after.close[-1] == 555.0
+
+
+def test_readjusted_history_drops_ticker(store):
+    _fill(store, "AAPL", "1mo")
+    store.refresh_interval = 0
+    params, anchor = store.plan("AAPL", "1mo")
+    tail = PriceSeries.from_rows([(anchor[0], 1, 1, 1, anchor[1] / 2, 1)])
+    assert not store.save("AAPL", params, tail, anchor)
+    assert len(store.read("AAPL", "max")) == 0
+    params, anchor = store.plan("AAPL", "1mo")
+    assert anchor is None
+
+
+def test_trading_day_periods_read_bar_counts(store):
+    _fill(store, "MSFT", "1mo")
+    assert len(store.read("MSFT", "5d")) == 5
+    assert len(store.read("MSFT", "1d")) == 1
+
+
+def test_unsupported_period_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.plan("AAPL", "3w")
+
+
+def test_shared_store_is_closed_and_reopened():
+    from src.mcp import stock_mcp
+    first = stock_mcp._get_history_store()
+    stock_mcp.close_history_store()
+    assert stock_mcp._history_store is None
+    assert stock_mcp._get_history_store() is not first
+    stock_mcp.close_history_store()
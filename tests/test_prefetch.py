@@ -0,0 +1,130 @@
+"""Tests for the background prefetch scheduler in src.prefetch."""
+
+import time
+
+import httpx
+from langchain_core.tools import tool
+
+from src.mcp import http_client, news_mcp
+from src.mcp.cache import TTLCache, MISSING
+from src.prefetch import PREFETCH_HOSTS, PrefetchScheduler
+
+_calls = []
+_cache = TTLCache("test_prefetch", ttl=60, refreshable=True)
+
+
+@tool
+def get_current_weather(location: str) -> str:
+    """Cached stand-in for the weather tool."""
+    cached = _cache.get(location, MISSING)
+    if cached is not MISSING:
+        return cached
+    _calls.append(location)
+    result = f"{location}: {len(_calls)}"
+    _cache.set(location, result)
+    return result
+
+
+def _scheduler(*tools) -> PrefetchScheduler:
+    return PrefetchScheduler(tools, interval=3600, top_n=2, host_rate=0)
+
+
+def test_popular_keeps_top_n_per_host():
+    scheduler = _scheduler(get_current_weather)
+    try:
+        for city in ["Paris", "Paris", "Paris", "Tokyo", "Tokyo", "Oslo"]:
+            scheduler.record("get_current_weather", {"location": city})
+        scheduler.record("not_a_prefetch_tool", {"x": 1})
+        assert scheduler.popular() == [
+            ("get_current_weather", {"location": "Paris"}),
+            ("get_current_weather", {"location": "Tokyo"}),
+        ]
+    finally:
+        scheduler.stop()
+
+
+def test_refresh_bypasses_fresh_cache_entries():
+    _calls.clear()
+    _cache.clear()
+    scheduler = _scheduler(get_current_weather)
+    try:
+        assert get_current_weather.invoke({"location": "Paris"}) == "Paris: 1"
+        scheduler.record("get_current_weather", {"location": "Paris"})
+        assert scheduler.run_once() == 1
+        assert _calls == ["Paris", "Paris"]
+        # The refreshed value replaced the cached one
+        assert get_current_weather.invoke({"location": "Paris"}) == "Paris: 2"
+        assert scheduler.refreshed == 1
+    finally:
+        scheduler.stop()
+
+
+def test_news_refresh_revalidates_feed_without_indexing(monkeypatch):
+    requests = []
+
+    def upstream(request):
+        requests.append(request)
+        return httpx.Response(
+            200,
+            content=b"<rss><channel><item><title>Story</title><link>https://a.example</link></item></channel></rss>"
+        )
+
+    monkeypatch.setattr(http_client, "_http_client", httpx.Client(transport=httpx.MockTransport(upstream)))
+    monkeypatch.setattr(news_mcp, "_feed_cache", TTLCache("test_feeds", ttl=3600))
+    monkeypatch.setattr(news_mcp, "_news_index", news_mcp.NewsIndex(maxsize=100))
+
+    scheduler = _scheduler(news_mcp.search_news)
+    try:
+        scheduler.record("search_news", {"query": "solar", "max_results": 3})
+        scheduler.run_once()
+    finally:
+        scheduler.stop()
+
+    assert len(requests) == 1
+    assert news_mcp._news_index.stats()["stories"] == 0
+    key = news_mcp._feed_key(*news_mcp._search_request("solar"))
+    assert news_mcp._feed_cache.peek(key)["fresh_until"] > time.time()
+
+
+def test_every_prefetch_host_tool_is_known():
+    assert set(news_mcp.FEED_REFRESHERS) <= set(PREFETCH_HOSTS)
+
+
+@tool
+def get_air_quality(location: str) -> str:
+    """Stand-in for the air quality tool."""
+    return location
+
+
+@tool
+def get_weather_report(location: str) -> str:
+    """Stand-in for the weather report tool (forecast and air quality hosts)."""
+    return location
+
+
+def test_multi_host_query_counts_against_every_host():
+    scheduler = _scheduler(get_current_weather, get_air_quality, get_weather_report)
+    try:
+        for city in ["Paris", "Paris", "Tokyo", "Tokyo"]:
+            scheduler.record("get_air_quality", {"location": city})
+        scheduler.record("get_weather_report", {"location": "Oslo"})
+        scheduler.record("get_current_weather", {"location": "Rome"})
+        assert scheduler.popular() == [
+            ("get_air_quality", {"location": "Paris"}),
+            ("get_air_quality", {"location": "Tokyo"}),
+            ("get_current_weather", {"location": "Rome"}),
+        ]
+    finally:
+        scheduler.stop()
+
+
+def test_refresh_waits_for_every_host(monkeypatch):
+    scheduler = _scheduler(get_weather_report)
+    hosts = []
+    monkeypatch.setattr(scheduler._limiter, "wait", lambda host, stop=None: hosts.append(host) or True)
+    try:
+        scheduler.record("get_weather_report", {"location": "Oslo"})
+        scheduler.run_once()
+    finally:
+        scheduler.stop()
+    assert hosts == ["api.open-meteo.com", "air-quality-api.open-meteo.com"]
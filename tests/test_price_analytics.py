@@ -0,0 +1,69 @@
+"""Tests for the columnar price history statistics in src.mcp.price_analytics."""
+
+import math
+
+from src.mcp.price_analytics import PriceSeries, downsample, latest_bar, summarize
+
+DAY = 86400
+START = 1_700_000_000
+
+
+def _series(closes: list) -> PriceSeries:
+    return PriceSeries.from_rows(
+        (START + i * DAY, c, c + 1, c - 1, c, 100 * (i + 1)) for i, c in enumerate(closes)
+    )
+
+
+def test_from_chart_skips_bars_without_close():
+    series = PriceSeries.from_chart({
+        "timestamp": [START, START + DAY, START + 2 * DAY],
+        "indicators": {"quote": [{
+            "open": [1.0, None, 3.0], "high": [None, 2.5, 3.5], "low": [0.5, 1.5, 2.5],
+            "close": [1.0, None, 3.0], "volume": [10, 20, None]
+        }]}
+    })
+    assert list(series.close) == [1.0, 3.0]
+    assert series.high[0] == 1.0
+    assert list(series.volume) == [10, 0]
+
+
+def test_summary_return_drawdown_and_extremes():
+    summary = summarize(_series([100, 120, 90, 110]))
+    assert summary["period_return"] == "+10.00%"
+    assert summary["max_drawdown"] == "-25.00%"
+    assert summary["high"].startswith("$121.00")
+    assert summary["low"].startswith("$89.00")
+    assert summary["avg_volume"] == "250"
+
+
+def test_volatility_matches_sample_stddev_of_log_returns():
+    closes = [100, 102, 101, 105, 103, 108]
+    returns = [math.log(b / a) for a, b in zip(closes, closes[1:])]
+    mean = sum(returns) / len(returns)
+    stdev = math.sqrt(sum((r - mean) ** 2 for r in returns) / (len(returns) - 1))
+    expected = f"{stdev * math.sqrt(252) * 100:.2f}%"
+    assert summarize(_series(closes))["annualized_volatility"] == expected
+
+
+def test_moving_averages_only_when_long_enough():
+    short = summarize(_series(list(range(1, 20))))
+    assert "sma_20" not in short
+    long = summarize(_series(list(range(1, 61))))
+    assert long["sma_20"] == f"${sum(range(41, 61)) / 20:.2f}"
+    assert long["sma_50"] == f"${sum(range(11, 61)) / 50:.2f}"
+    assert "sma_200" not in long
+
+
+def test_downsample_keeps_first_and_last():
+    series = _series([float(i) for i in range(1, 101)])
+    points = downsample(series, max_points=5)
+    assert len(points) == 5
+    assert points[0].endswith("$1.00") and points[-1].endswith("$100.00")
+
+
+def test_empty_series():
+    assert summarize(PriceSeries()) == {}
+
+
+def test_latest_bar():
+    assert latest_bar(_series([10, 11]))["close"] == "$11.00"
@@ -0,0 +1,98 @@
+"""Tests for the query_employees whitelist and statement compiler in src.mcp.database_mcp."""
+
+import json
+
+import pytest
+
+from src.mcp import database_mcp
+from src.mcp.database_mcp import query_employees
+
+
+def _compile(fields=None, filters=None, group_by=None, order_by=None) -> tuple:
+    shape, params = database_mcp._query_shape(fields, filters, group_by, order_by)
+    sql, columns = database_mcp._compile_query(shape)
+    return sql, columns, params
+
+
+def _run(**spec) -> dict:
+    result = query_employees.invoke(spec)
+    assert not result.startswith("Error"), result
+    return json.loads(result)
+
+
+def test_compiles_filters_to_placeholders():
+    sql, columns, params = _compile(
+        fields=["first_name", "salary"],
+        filters=[{"field": "city", "op": "=", "value": "Seattle"}, {"field": "salary", "op": ">=", "value": 80000}],
+        order_by=["salary desc"]
+    )
+    assert sql == (
+        "SELECT first_name AS first_name, salary AS salary FROM employees "
+        "WHERE city = ? COLLATE NOCASE AND salary >= ? ORDER BY salary DESC LIMIT ?"
+    )
+    assert columns == ("first_name", "salary")
+    assert params == ["Seattle", 80000]
+
+
+def test_in_lists_are_padded_to_a_power_of_two():
+    sql, _, params = _compile(fields=["id"], filters=[{"field": "city", "op": "in", "value": ["A", "B", "C"]}])
+    assert "IN (?, ?, ?, ?)" in sql
+    assert params == ["A", "B", "C", "C"]
+
+
+def test_same_shape_reuses_compiled_statement():
+    database_mcp._compile_query.cache_clear()
+    _compile(fields=["id"], filters=[{"field": "city", "op": "=", "value": "Austin"}])
+    _compile(fields=["id"], filters=[{"field": "city", "op": "=", "value": "Boston"}])
+    stats = database_mcp.get_query_cache_stats()
+    assert stats["misses"] == 1 and stats["hits"] == 1
+
+
+def test_like_wildcards_are_escaped():
+    _, _, params = _compile(fields=["id"], filters=[{"field": "email", "op": "contains", "value": "100%_"}])
+    assert params == ["%100\\%\\_%"]
+
+
+@pytest.mark.parametrize("spec,message", [
+    ({"fields": ["password"]}, "Unknown field"),
+    ({"fields": ["sum(password)"]}, "Unknown column"),
+    ({"fields": ["avg(*)"]}, "not supported"),
+    ({"fields": ["id; DROP TABLE employees"]}, "Unknown field"),
+    ({"filters": [{"field": "city", "op": "like", "value": "x"}]}, "Unsupported op"),
+    ({"filters": [{"field": "city", "op": "in", "value": []}]}, "non-empty list"),
+    ({"filters": [{"field": "salary", "op": "between", "value": [1]}]}, "[low, high]"),
+    ({"filters": [{"op": "="}]}, "needs 'field'"),
+    ({"fields": ["department", "count(*)"]}, "must be aggregated or listed in group_by"),
+    ({"filters": [{"field": "count(*)", "op": ">", "value": 1}]}, "needs an aggregate query"),
+    ({"order_by": ["avg(salary)"]}, "needs an aggregate query"),
+    ({"fields": ["department", "count(*)"], "group_by": ["department"], "order_by": ["city"]},
+     "must be aggregated or listed in group_by"),
+    ({"fields": ["count(*)"], "order_by": ["salary desc"]}, "must be aggregated or listed in group_by"),
+])
+def test_invalid_specs_are_rejected(spec, message):
+    result = query_employees.invoke(spec)
+    assert result.startswith("Error:")
+    assert message in result
+
+
+def test_values_are_never_interpolated():
+    result = _run(fields=["id"], filters=[{"field": "last_name", "op": "=", "value": "x' OR '1'='1"}])
+    assert result["row_count"] == 0
+
+
+def test_group_by_with_having_and_aggregate_order():
+    result = _run(
+        fields=["department", "count(*)", "avg(salary)"],
+        filters=[{"field": "count(*)", "op": ">=", "value": 3}],
+        group_by=["department"],
+        order_by=["count(*) desc", "department"]
+    )
+    assert result["columns"] == ["department", "count", "avg_salary"]
+    assert [row["department"] for row in result["rows"]] == ["Engineering", "Sales"]
+    assert result["rows"][0]["count"] == 6
+
+
+def test_limit_truncates():
+    result = _run(fields=["id"], order_by=["id"], limit=3)
+    assert [row["id"] for row in result["rows"]] == [1, 2, 3]
+    assert result["truncated"] is True
@@ -0,0 +1,78 @@
+"""Tests for keyword skill routing in src.router."""
+
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.router import SkillRouter
+from src.skill_registry import SkillRegistry
+
+SKILLS_DIR = Path(__file__).parent.parent / "src" / "skills"
+
+
+@pytest.fixture(scope="module")
+def router():
+    return SkillRouter(SkillRegistry(SKILLS_DIR).all_meta())
+
+
+def _name(router, fragment):
+    return next(name for name in router.skill_names if fragment in name.lower())
+
+
+@pytest.mark.parametrize("text,fragment", [
+    ("What's the weather in Tokyo?", "weather"),
+    ("Compare AAPL and MSFT stocks", "stock"),
+    ("Latest headlines about politics", "news"),
+    ("Show salaries in Engineering", "database"),
+])
+def test_routes_by_keyword(router, text, fragment):
+    assert router.route(text) == (_name(router, fragment),)
+
+
+@pytest.mark.parametrize("text", [
+    "How do I download a file?",
+    "Find me a hotel downtown",
+    "Explain image metadata",
+    "Where is the shared folder?",
+])
+def test_keywords_match_whole_words(router, text):
+    assert router.route(text) == ()
+
+
+def test_weather_report_is_not_news(router):
+    assert router.route("Give me a weather report for Oslo") == (_name(router, "weather"),)
+
+
+def test_short_follow_up_reuses_previous_routing(router):
+    messages = [
+        HumanMessage("Weather in Paris?"),
+        AIMessage("Sunny, 21C."),
+        HumanMessage("What about London?"),
+    ]
+    assert router.route_messages(messages) == (_name(router, "weather"),)
+
+
+def test_unrelated_request_gets_all_skills(router):
+    messages = [
+        HumanMessage("Weather in Paris?"),
+        AIMessage("Sunny, 21C."),
+        HumanMessage("list people in Sales"),
+    ]
+    assert router.route_messages(messages) == tuple(router.skill_names)
+
+
+def test_follow_up_to_unmatched_request_gets_all_skills(router):
+    messages = [
+        HumanMessage("Weather in Paris?"),
+        HumanMessage("list people in Sales"),
+        HumanMessage("and in Marketing?"),
+    ]
+    assert router.route_messages(messages) == tuple(router.skill_names)
+
+
+def test_tools_for_deduplicates_in_skill_order(router):
+    weather = _name(router, "weather")
+    tools = router.tools_for((weather, weather))
+    assert tools == router.skill_tools[weather]
+    assert len(tools) == len(set(tools))
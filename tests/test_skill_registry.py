@@ -0,0 +1,78 @@
+"""Tests for lazy skill discovery and hot reload in src.skill_registry."""
+
+import os
+
+import pytest
+
+from src.skill_registry import SkillRegistry, parse_frontmatter, split_list
+
+SKILL = """---
+name: {name}
+description: {description}
+keywords: [weather, forecast]
+---
+# {name}
+
+Body text.
+"""
+
+
+def _write(skills_dir, folder: str, description: str = "Forecasts", mtime: int = None):
+    skill_dir = skills_dir / folder
+    skill_dir.mkdir(exist_ok=True)
+    path = skill_dir / "SKILL.md"
+    path.write_text(SKILL.format(name=folder, description=description), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def skills_dir(tmp_path):
+    _write(tmp_path, "weather_forecaster")
+    _write(tmp_path, "_disabled")
+    (tmp_path / "no_skill_file").mkdir()
+    return tmp_path
+
+
+def test_frontmatter_parsing():
+    meta = parse_frontmatter("---\nname: x\ntools: [a, 'b']\n  nested: no\n---\nbody")
+    assert meta == {"name": "x", "tools": "[a, 'b']"}
+    assert split_list(meta["tools"]) == ["a", "b"]
+    assert parse_frontmatter("no frontmatter") == {}
+
+
+def test_discovery_reads_frontmatter_and_loads_body_lazily(skills_dir):
+    registry = SkillRegistry(skills_dir, reload_interval=0)
+    assert registry.names() == ["Weather Forecaster"]
+    assert registry.meta("Weather Forecaster")["description"] == "Forecasts"
+    entry = registry._entries["Weather Forecaster"]
+    assert entry._body is None
+    assert "Body text." in registry.body("Weather Forecaster")
+
+
+def test_refresh_reloads_only_changed_skills(skills_dir):
+    registry = SkillRegistry(skills_dir, reload_interval=0)
+    unchanged = registry._entries["Weather Forecaster"]
+    assert registry.refresh(force=True) is False
+    assert registry._entries["Weather Forecaster"] is unchanged and registry.version == 1
+
+    _write(skills_dir, "weather_forecaster", description="Updated forecasts", mtime=1)
+    _write(skills_dir, "stock_analyst")
+    assert registry.refresh(force=True) is True
+    assert registry.version == 2
+    assert registry.meta("Weather Forecaster")["description"] == "Updated forecasts"
+    assert registry.names() == ["Stock Analyst", "Weather Forecaster"]
+
+    (skills_dir / "stock_analyst" / "SKILL.md").unlink()
+    assert registry.refresh(force=True) is True
+    assert registry.names() == ["Weather Forecaster"]
+
+
+def test_refresh_is_rate_limited(skills_dir):
+    registry = SkillRegistry(skills_dir, reload_interval=3600)
+    _write(skills_dir, "stock_analyst")
+    assert registry.refresh() is False
+    assert len(registry) == 1
+    assert registry.refresh(force=True) is True
+    assert len(registry) == 2
@@ -0,0 +1,76 @@
+"""Tests for get_stock_history backfill and tail refresh against a fake chart endpoint."""
+
+import json
+
+import httpx
+import pytest
+
+from src.mcp import http_client, stock_mcp
+from src.mcp.cache import TTLCache
+from src.mcp.ohlcv_store import OHLCVStore
+
+DAY = 86400
+
+
+class ChartServer:
+    """Serves daily bars for any requested [period1, period2) range and records the ranges."""
+
+    def __init__(self):
+        self.ranges = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        start, end = int(request.url.params["period1"]), int(request.url.params["period2"])
+        self.ranges.append((start, end))
+        first = start - start % DAY + DAY
+        timestamps = list(range(first, end, DAY))
+        closes = [100.0 + (ts // DAY) % 50 for ts in timestamps]
+        return httpx.Response(200, json={"chart": {"result": [{
+            "meta": {"symbol": "TEST"},
+            "timestamp": timestamps,
+            "indicators": {"quote": [{
+                "open": closes, "high": closes, "low": closes, "close": closes, "volume": [1] * len(closes)
+            }]}
+        }]}})
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = ChartServer()
+    store = OHLCVStore(":memory:", refresh_interval=3600)
+    monkeypatch.setattr(http_client, "_http_client", httpx.Client(transport=httpx.MockTransport(server)))
+    monkeypatch.setattr(stock_mcp, "_stock_cache", TTLCache("test_stock", refreshable=True))
+    monkeypatch.setattr(stock_mcp, "_history_store", store)
+    yield server
+    store.close()
+
+
+def _history(period: str) -> dict:
+    result = stock_mcp.get_stock_history.invoke({"ticker": "test", "period": period})
+    assert not result.startswith("Error"), result
+    return json.loads(result)
+
+
+def test_repeat_requests_are_served_locally(server):
+    first = _history("1mo")
+    stock_mcp._stock_cache.clear()
+    assert _history("1mo") == first
+    assert len(server.ranges) == 1
+
+
+def test_longer_period_only_fetches_older_bars(server):
+    _history("1mo")
+    stock_mcp._stock_cache.clear()
+    result = _history("3mo")
+    (first_start, _), (second_start, second_end) = server.ranges
+    assert second_start < first_start
+    assert second_end <= first_start + DAY
+    assert result["data_points"] > 80
+
+
+def test_stale_store_fetches_only_the_tail(server):
+    _history("1y")
+    stock_mcp._stock_cache.clear()
+    stock_mcp._history_store.refresh_interval = 0
+    _history("1y")
+    tail_start, tail_end = server.ranges[-1]
+    assert tail_end - tail_start <= 3 * DAY
@@ -0,0 +1,85 @@
+"""Tests for batched stock quotes and their single-quote fallback in src.mcp.stock_mcp."""
+
+import json
+import time
+
+import httpx
+import pytest
+
+from src.mcp import http_client, stock_mcp
+from src.mcp.cache import TTLCache, force_refresh
+
+
+def _chart(symbol: str, price: float) -> dict:
+    return {"chart": {"result": [{"meta": {
+        "symbol": symbol, "regularMarketPrice": price, "previousClose": 100.0, "marketState": "CLOSED"
+    }}]}}
+
+
+class QuoteServer:
+    """Spark endpoint that returns nothing, so every symbol falls back to the chart endpoint."""
+
+    def __init__(self, price: float):
+        self.price = price
+        self.charts = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/spark"):
+            return httpx.Response(200, json={"spark": {"result": []}})
+        symbol = request.url.path.rsplit("/", 1)[-1]
+        self.charts.append(symbol)
+        return httpx.Response(200, json=_chart(symbol, self.price))
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = QuoteServer(110.0)
+    monkeypatch.setattr(http_client, "_http_client", httpx.Client(transport=httpx.MockTransport(server)))
+    monkeypatch.setattr(stock_mcp, "_stock_cache", TTLCache("test_stock", refreshable=True))
+    return server
+
+
+def _quotes(tickers: list) -> list:
+    result = stock_mcp.get_stock_quotes.invoke({"tickers": tickers})
+    return result.splitlines()[1:]
+
+
+def test_fallback_fetches_single_quotes(server):
+    rows = _quotes(["aaa", "bbb"])
+    assert [row.split(" | ")[2] for row in rows] == ["$110.00", "$110.00"]
+    assert sorted(server.charts) == ["AAA", "BBB"]
+    _quotes(["aaa", "bbb"])
+    assert len(server.charts) == 2
+
+
+def test_force_refresh_reaches_fallback_workers(server):
+    stale = stock_mcp._quote_fields(_chart("AAA", 90.0)["chart"]["result"][0]["meta"])
+    stock_mcp._stock_cache.set("quote:AAA", json.dumps(stale))
+    assert _quotes(["AAA"])[0].split(" | ")[2] == "$90.00"
+    with force_refresh():
+        assert _quotes(["AAA"])[0].split(" | ")[2] == "$110.00"
+    assert server.charts == ["AAA"]
+
+
+def test_quote_freshness_follows_market_state():
+    assert stock_mcp._market_ttl({"marketState": "REGULAR"}) == stock_mcp.QUOTE_TTL_OPEN
+    assert stock_mcp._market_ttl({"marketState": "POST"}) == stock_mcp.QUOTE_TTL_CLOSED
+    now = time.time()
+    trading = {"currentTradingPeriod": {"regular": {"start": now - 60, "end": now + 60}}}
+    assert stock_mcp._market_ttl(trading) == stock_mcp.QUOTE_TTL_OPEN
+
+
+def test_single_quotes_are_cached_but_errors_are_not(server, monkeypatch):
+    stock_mcp.get_stock_quote.invoke({"ticker": "AAA"})
+    stock_mcp.get_stock_quote.invoke({"ticker": "aaa"})
+    assert server.charts == ["AAA"]
+
+    def missing(request):
+        server.charts.append("missing")
+        return httpx.Response(404, json={"chart": {"result": None, "error": {"description": "No data found"}}})
+
+    monkeypatch.setattr(http_client, "_http_client", httpx.Client(transport=httpx.MockTransport(missing)))
+    for _ in range(2):
+        assert stock_mcp.get_stock_quote.invoke({"ticker": "ZZZ"}) == "Error: No data found"
+    assert server.charts == ["AAA", "missing", "missing"]
+    assert stock_mcp.get_stock_cache_stats()["size"] == 1
@@ -0,0 +1,109 @@
+"""Tests for concurrent tool execution in src.tool_node."""
+
+import asyncio
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from src.tool_node import build_tool_node
+
+
+@tool
+def echo(text: str) -> str:
+    """Echo the text back."""
+    return f"echo: {text}"
+
+
+@tool
+def explode(text: str) -> str:
+    """Always fail."""
+    raise RuntimeError("kaboom")
+
+
+@tool
+def sleepy(text: str) -> str:
+    """Sleep longer than the tool timeout."""
+    time.sleep(1)
+    return "late"
+
+
+def _graph(timeout: float = 5.0):
+    node, runner = build_tool_node([echo, explode, sleepy], max_workers=4, timeout=timeout)
+    builder = StateGraph(MessagesState)
+    builder.add_node("tools", node)
+    builder.add_edge(START, "tools")
+    builder.add_edge("tools", END)
+    return builder.compile(), runner
+
+
+def _calls(*names):
+    return AIMessage(
+        content="",
+        tool_calls=[{"name": name, "args": {"text": str(i)}, "id": f"call_{i}"} for i, name in enumerate(names)]
+    )
+
+
+def _tool_messages(result):
+    return [m for m in result["messages"] if m.type == "tool"]
+
+
+def test_results_keep_tool_call_order():
+    graph, runner = _graph()
+    try:
+        messages = _tool_messages(graph.invoke({"messages": [_calls("echo", "echo", "echo")]}))
+    finally:
+        runner.shutdown()
+    assert [m.tool_call_id for m in messages] == ["call_0", "call_1", "call_2"]
+    assert [m.content for m in messages] == ["echo: 0", "echo: 1", "echo: 2"]
+
+
+def test_raising_tool_does_not_abort_siblings():
+    graph, runner = _graph()
+    try:
+        messages = _tool_messages(graph.invoke({"messages": [_calls("echo", "explode", "echo")]}))
+    finally:
+        runner.shutdown()
+    assert [m.tool_call_id for m in messages] == ["call_0", "call_1", "call_2"]
+    assert messages[0].content == "echo: 0"
+    assert messages[1].status == "error"
+    assert "kaboom" in messages[1].content
+    assert messages[2].content == "echo: 2"
+
+
+def test_raising_tool_does_not_abort_siblings_async():
+    graph, runner = _graph()
+    try:
+        result = asyncio.run(graph.ainvoke({"messages": [_calls("explode", "echo")]}))
+    finally:
+        runner.shutdown()
+    messages = _tool_messages(result)
+    assert messages[0].status == "error"
+    assert "kaboom" in messages[0].content
+    assert messages[1].content == "echo: 1"
+
+
+def test_timeout_fails_only_its_own_call():
+    graph, runner = _graph(timeout=0.2)
+    try:
+        messages = _tool_messages(graph.invoke({"messages": [_calls("sleepy", "echo")]}))
+    finally:
+        runner.shutdown()
+    assert messages[0].status == "error"
+    assert "timed out" in messages[0].content
+    assert messages[1].content == "echo: 1"
+
+
+def test_on_call_hook_sees_every_call():
+    seen = []
+    node, runner = build_tool_node([echo], on_call=lambda name, args: seen.append((name, args)))
+    builder = StateGraph(MessagesState)
+    builder.add_node("tools", node)
+    builder.add_edge(START, "tools")
+    builder.add_edge("tools", END)
+    try:
+        builder.compile().invoke({"messages": [_calls("echo", "echo")]})
+    finally:
+        runner.shutdown()
+    assert sorted(seen, key=lambda c: c[1]["text"]) == [("echo", {"text": "0"}), ("echo", {"text": "1"})]
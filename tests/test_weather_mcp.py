@@ -0,0 +1,151 @@
+"""Tests for the Open-Meteo weather tools in src.mcp.weather_mcp against a fake upstream."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.mcp import http_client, weather_mcp
+from src.mcp.cache import TTLCache
+
+CITIES = {"Paris": (48.85, 2.35), "London": (51.51, -0.13), "Tokyo": (35.68, 139.69)}
+
+
+def _forecast(lat: str, days: int) -> dict:
+    temperature = float(lat)
+    return {
+        "current": {
+            "temperature_2m": temperature, "apparent_temperature": temperature - 1, "relative_humidity_2m": 60,
+            "weather_code": 0, "wind_speed_10m": 10, "surface_pressure": 1013
+        },
+        "daily": {
+            "time": [f"2026-03-0{i + 1}" for i in range(days)],
+            "temperature_2m_max": [temperature + 5] * days, "temperature_2m_min": [temperature - 5] * days,
+            "weather_code": [3] * days, "precipitation_probability_max": [20] * days, "wind_speed_10m_max": [15] * days
+        }
+    }
+
+
+class OpenMeteo:
+    """Fake Open-Meteo hosts; records the (host, params) of every request."""
+
+    def __init__(self):
+        self.requests = []
+        self.air_quality_status = 200
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        self.requests.append((request.url.host, params))
+        if request.url.host == "geocoding-api.open-meteo.com":
+            name = params["name"].strip().title()
+            if name not in CITIES:
+                return httpx.Response(200, json={})
+            lat, lon = CITIES[name]
+            return httpx.Response(200, json={"results": [
+                {"latitude": lat, "longitude": lon, "name": name, "country": "XX"}
+            ]})
+        if request.url.host == "air-quality-api.open-meteo.com":
+            return httpx.Response(self.air_quality_status, json={"current": {"us_aqi": 42, "pm2_5": 8.1}})
+        days = int(params.get("forecast_days", 1))
+        results = [_forecast(lat, days) for lat in params["latitude"].split(",")]
+        return httpx.Response(200, json=results[0] if len(results) == 1 else results)
+
+    def hosts(self) -> list:
+        return [host for host, _ in self.requests]
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    server = OpenMeteo()
+    monkeypatch.setattr(http_client, "_http_client", httpx.Client(transport=httpx.MockTransport(server)))
+    monkeypatch.setattr(weather_mcp, "_geocode_cache", TTLCache("test_geocoding", maxsize=16, ttl=3600))
+    monkeypatch.setattr(weather_mcp, "_weather_cache", TTLCache("test_weather", maxsize=64, ttl=600))
+    return server
+
+
+def test_geocoding_is_cached_by_normalized_location(upstream):
+    assert weather_mcp._get_coordinates("Paris") == (48.85, 2.35, "Paris", "XX")
+    assert weather_mcp._get_coordinates("  PARIS ") == (48.85, 2.35, "Paris", "XX")
+    assert upstream.hosts() == ["geocoding-api.open-meteo.com"]
+    assert weather_mcp.get_geocoding_cache_stats()["hits"] == 1
+
+
+def test_unknown_location_is_not_cached(upstream):
+    assert weather_mcp._get_coordinates("Atlantis") == (None, None, "Atlantis", "")
+    weather_mcp._get_coordinates("Atlantis")
+    assert len(upstream.requests) == 2
+
+
+def _report(**args) -> dict:
+    result = weather_mcp.get_weather_report.invoke({"location": "Paris", **args})
+    assert not result.startswith("Error"), result
+    return json.loads(result)
+
+
+def test_report_combines_forecast_and_air_quality(upstream):
+    report = _report(days=2)
+    assert report["current"]["temperature"] == "48.85°C"
+    assert report["forecast_days"] == 2
+    assert report["air_quality"]["aqi_level"] == "Good"
+    forecast_params = [params for host, params in upstream.requests if host == "api.open-meteo.com"]
+    assert len(forecast_params) == 1
+    assert "current" in forecast_params[0] and "daily" in forecast_params[0]
+    assert upstream.hosts().count("air-quality-api.open-meteo.com") == 1
+
+    assert _report(days=2) == report
+    assert len(upstream.requests) == 3
+
+
+def test_report_without_air_quality(upstream):
+    report = _report(include_aqi=False)
+    assert "air_quality" not in report
+    assert "air-quality-api.open-meteo.com" not in upstream.hosts()
+
+
+def test_report_with_failed_air_quality_is_returned_but_not_cached(upstream):
+    upstream.air_quality_status = 500
+    assert _report()["air_quality"] == "unavailable"
+    upstream.air_quality_status = 200
+    assert _report()["air_quality"]["aqi"] == 42
+    assert upstream.hosts().count("api.open-meteo.com") == 2
+
+
+def test_async_report_matches_sync(upstream):
+    expected = weather_mcp.get_weather_report.invoke({"location": "Paris"})
+    weather_mcp._weather_cache.clear()
+
+    async def run():
+        http_client._async_client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        http_client._async_client_loop = asyncio.get_running_loop()
+        http_client._async_host_semaphores = {}
+        try:
+            return await weather_mcp.get_weather_report.ainvoke({"location": "Paris"})
+        finally:
+            await http_client._async_client.aclose()
+            http_client._async_client = None
+
+    assert asyncio.run(run()) == expected
+
+
+def _table(locations) -> list:
+    result = weather_mcp.get_weather_for_locations.invoke({"locations": locations})
+    return result.splitlines()[1:]
+
+
+def test_locations_share_one_bulk_forecast_request(upstream):
+    rows = _table(["Paris", "london", "Atlantis", " paris ", "Tokyo"])
+    assert [row.split(" | ")[0] for row in rows] == ["Paris, XX", "London, XX", "Atlantis", "Tokyo, XX"]
+    assert rows[1].split(" | ")[1] == "51.51°C"
+    assert rows[2] == "Atlantis | Error: Could not find location"
+    forecasts = [params for host, params in upstream.requests if host == "api.open-meteo.com"]
+    assert len(forecasts) == 1
+    assert forecasts[0]["latitude"] == "48.85,51.51,35.68"
+
+
+def test_cached_rows_are_not_refetched(upstream):
+    _table(["Paris"])
+    rows = _table(["Paris", "London"])
+    forecasts = [params for host, params in upstream.requests if host == "api.open-meteo.com"]
+    assert [params["latitude"] for params in forecasts] == ["48.85", "51.51"]
+    assert rows[0].split(" | ")[1] == "48.85°C"